@@ -0,0 +1,716 @@
+"""
+Local stand-in for the parts of Planview that prm.py drives
+
+Serves the log-in form, the two New Work pages, the Work and Assignments
+SlickGrid, the resource search popup and the Describe & Categorize BI editor
+with the same element attributes the step functions look for, so whole runs
+can execute offline:
+
+    python planview_stub.py --port 8765 --latency 0.2
+    python prm.py --base-url http://127.0.0.1:8765
+
+It also answers the REST API prm.py's REST backend calls (under /api/v1,
+bearer token from POST /api/v1/token), over kept-alive HTTP/1.1 connections:
+
+    python prm.py --base-url http://127.0.0.1:8765 --backend rest
+
+Work items are kept in memory; GET /stub/work returns them as JSON.
+"""
+
+import argparse
+import html
+import itertools
+import json
+import logging
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, sleep
+from urllib.parse import parse_qs, quote, urlsplit
+
+
+NEW_WORK_PATH = "/planview/ConfiguredScreens/ConfiguredScreen.aspx"
+
+# options offered by the pickers and grid editors; override with --picklists
+PICKLISTS = {
+    "bi_service_name": ["Analysis and Solution Development", "Data Engineering", "Reporting"],
+    "bi_assignment_owner": ["1001", "1002", "1003"],
+    "bi_team": ["Analytics", "Data Engineering", "Reporting"],
+    "bi_swim_lane": ["1", "2", "3"],
+    "bi_liaison": ["1", "2", "3"],
+}
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+class StubState:
+    """
+    Everything the stand-in remembers between requests
+
+    Parameters
+    ----------
+    latency: float
+        Seconds every request is held before it is answered
+
+    session_ttl: float or None
+        Seconds a log-in stays valid; None never expires
+
+    picklists: dict
+        Options for each picker, see `PICKLISTS`
+    """
+
+    def __init__(self, latency=0.0, session_ttl=None, picklists=None):
+        self.latency = latency
+        self.session_ttl = session_ttl
+        self.picklists = picklists or PICKLISTS
+
+        # (status, body, content type, headers) every /api/v1 request is
+        # answered with while set, to exercise the client's error handling
+        self.api_fault = None
+
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.work = {}
+        self._ids = itertools.count(1)
+
+    def new_session(self):
+        """Start a session and return its token"""
+
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = monotonic()
+
+        return token
+
+    def session_is_valid(self, token):
+        """True if `token` belongs to a session that has not expired"""
+
+        with self.lock:
+            started = self.sessions.get(token)
+
+        if started is None:
+            return False
+
+        return self.session_ttl is None or monotonic() - started < self.session_ttl
+
+    def new_work(self, fields):
+        """Create a work item and return its id"""
+
+        with self.lock:
+            work_id = next(self._ids)
+            self.work[work_id] = {"id": work_id, "allocations": [], **fields}
+
+        return work_id
+
+    def update_work(self, work_id, fields):
+        """Merge `fields` into a work item; False if there is no such item"""
+
+        with self.lock:
+            if work_id not in self.work:
+                return False
+            self.work[work_id].update(fields)
+
+        return True
+
+
+def _options(values, selected=None):
+    """
+    Render <option> tags for `values`
+
+    Returns
+    -------
+    options: str
+    """
+
+    return "".join(
+        f'<option value="{html.escape(value)}"{" selected" if value == selected else ""}>{html.escape(value)}</option>'
+        for value in values
+    )
+
+
+def login_page(next_url):
+    """The two-stage e-mail / password form"""
+
+    body = f"""
+<form method="post" action="/login">
+  <input type="hidden" name="next" value="{html.escape(next_url)}">
+  <input type="email" name="email">
+  <button type="button" id="next">Next</button>
+  <div id="password"></div>
+</form>
+<script>
+document.getElementById("next").addEventListener("click", function () {{
+  document.getElementById("password").innerHTML =
+    '<input type="password" name="password"><button type="submit">Sign in</button>';
+}});
+</script>"""
+
+    return PAGE.format(title="Sign in", body=body)
+
+
+def new_work_page1():
+    """First New Work page"""
+
+    body = """
+<form method="post" action="/planview/work">
+  <div class="data-picker-form-field-container attribute-part" title="Description of the project parent in Work stucture"><span><input type="text" name="workstream"></span></div>
+  <input type="text" name="description" title="The description of the project, or the work entity.">
+  <select name="work_type"><option value=""></option><option value="3036594">BI Work</option></select>
+  <input type="text" name="requested_start" title="The date the project has to be started. This date is used by the CPM forward pass for early date calculations. ">
+  <input type="text" name="requested_finish" title="The date the project has to be completed by. This date is used by the CPM backward pass for late date calculations. ">
+  <button type="submit">Save</button>
+</form>"""
+
+    return PAGE.format(title="New Work", body=body)
+
+
+def new_work_page2(state, work_id, completed):
+    """Second New Work page; the Actions menu appears once it is completed"""
+
+    if completed:
+        body = f"""
+<div class="banner">
+  <button class="banner-title-bar-button" id="actions"><span title="Actions">&#9776;</span></button>
+  <ul id="menu"></ul>
+</div>
+<script>
+document.getElementById("actions").addEventListener("click", function () {{
+  document.getElementById("menu").innerHTML = '<li title="Work and Assignments">Work and Assignments</li>';
+  document.querySelector("li[title='Work and Assignments']").addEventListener("click", function () {{
+    window.location = "/planview/work/{work_id}/assignments";
+  }});
+}});
+</script>"""
+    else:
+        body = f"""
+<form method="post" action="/planview/work/{work_id}/page2">
+  <select name="bi_service_name" size="4">{_options(state.picklists["bi_service_name"])}</select>
+  <div class="attribute-field" id="bi_scoped_date"><div><input type="text" name="bi_scoped_date"></div></div>
+  <div class="attribute-field" id="bi_date_created"><div><input type="text" name="bi_date_created"></div></div>
+  <button type="submit">Save and Complete</button>
+</form>"""
+
+    return PAGE.format(title="New Work", body=body)
+
+
+def work_and_assignments_page(state, work_id):
+    """SlickGrid-like Work and Assignments page"""
+
+    editors = json.dumps(
+        {
+            "status_flag": [["N", "No"], ["Y", "Yes"]],
+            "bi_team": [[team, team] for team in state.picklists["bi_team"]],
+            "bi_assignment_owner": [[owner, owner] for owner in state.picklists["bi_assignment_owner"]],
+        }
+    )
+
+    body = f"""
+<div class="banner">
+  <span class="pv12MenuAffordanceIcon" title="Actions" id="banner-actions">&#9776;</span>
+  <ul id="banner-menu"></ul>
+</div>
+<div class="grid-canvas grid-canvas-top grid-canvas-left">
+  <div class="slick-row"><div class="slick-cell l0 r0">Work {work_id}</div></div>
+  <div class="slick-row"><div class="slick-cell l0 r0"><div class="ActionLinkButton" title="Actions">&#9660;</div></div></div>
+</div>
+<ul id="row-menu"></ul>
+<div class="grid-canvas grid-canvas-top grid-canvas-right">
+  <div class="slick-row">
+    <div class="slick-cell l0 r0 hasEditor" data-field="status_flag">No</div>
+    <div class="slick-cell l1 r1 hasEditor" data-field="bi_team"></div>
+    <div class="slick-cell l2 r2"></div>
+    <div class="slick-cell l3 r3"></div>
+    <div class="slick-cell l4 r4 hasEditor" data-field="bi_assignment_owner"></div>
+  </div>
+  <div class="slick-row">
+    <div class="slick-cell l0 r0"></div>
+    <div class="slick-cell l1 r1"></div>
+    <div class="slick-cell l2 r2"></div>
+    <div class="slick-cell l3 r3"></div>
+    <div class="slick-cell l4 r4 hasEditor" data-field="bi_assignment_owner"></div>
+  </div>
+</div>
+<script>
+var EDITORS = {editors};
+var active = null, editing = null;
+
+function save(field, value) {{
+  var body = {{}};
+  body[field] = value;
+  fetch("/planview/work/{work_id}/grid", {{method: "POST", body: JSON.stringify(body)}});
+}}
+
+// like SlickGrid, an open editor is committed when another cell is activated
+function commit() {{
+  if (!editing) return;
+  var select = editing.querySelector("select");
+  var option = select.options[select.selectedIndex];
+  editing.textContent = option ? option.text : "";
+  save(editing.dataset.field, option ? option.value : "");
+  editing = null;
+}}
+
+document.querySelectorAll(".grid-canvas-right .slick-cell").forEach(function (cell) {{
+  cell.addEventListener("click", function (event) {{
+    if (cell === editing) return;
+    commit();
+    if (active) active.classList.remove("active");
+    active = cell;
+    cell.classList.add("active");
+  }});
+}});
+
+document.addEventListener("keydown", function (event) {{
+  if (event.key !== "Enter" || !active || editing || !EDITORS[active.dataset.field]) return;
+  editing = active;
+  var options = EDITORS[active.dataset.field].map(function (pair) {{
+    return '<option value="' + pair[0] + '">' + pair[1] + '</option>';
+  }}).join("");
+  active.innerHTML = '<select size="' + EDITORS[active.dataset.field].length + '">' + options + '</select>';
+  active.querySelector("select").selectedIndex = -1;
+}});
+
+document.querySelector(".ActionLinkButton").addEventListener("click", function () {{
+  commit();
+  var menu = document.getElementById("row-menu");
+  menu.innerHTML = '<li id="assignments">Assignments</li>';
+  document.getElementById("assignments").addEventListener("mouseover", function () {{
+    if (document.getElementById("new-allocation")) return;
+    menu.insertAdjacentHTML("beforeend", '<li id="new-allocation">New Allocation</li>');
+    document.getElementById("new-allocation").addEventListener("click", function () {{
+      window.open("/planview/work/{work_id}/resource_search", "resourceSearch", "width=800,height=600");
+    }});
+  }});
+}});
+
+document.getElementById("banner-actions").addEventListener("click", function () {{
+  commit();
+  document.getElementById("banner-menu").innerHTML =
+    '<li title="Work View"><span class="bannerMenuItemText">Work View</span></li>';
+  document.querySelector("li[title='Work View']").addEventListener("click", function () {{
+    window.location = "/planview/work/{work_id}/view";
+  }});
+}});
+</script>"""
+
+    return PAGE.format(title="Work and Assignments", body=body)
+
+
+def resource_search_page(work_id):
+    """Resource search popup; OK allocates whatever is ticked and closes it"""
+
+    body = f"""
+<iframe name="iframeSearchView" src="/planview/resource_search/view" width="100%" height="400"></iframe>
+<input type="button" value="OK" id="ok">
+<script>
+document.getElementById("ok").addEventListener("click", function () {{
+  var list = frames["iframeSearchView"].frames["frameSearchList"].document;
+  var ids = Array.prototype.map.call(
+    list.querySelectorAll("input[name='sel_list']:checked"),
+    function (checkbox) {{ return checkbox.value; }}
+  );
+  fetch("/planview/work/{work_id}/allocations", {{method: "POST", body: JSON.stringify(ids)}})
+    .then(function () {{ window.close(); }});
+}});
+</script>"""
+
+    return PAGE.format(title="Resource Search", body=body)
+
+
+def resource_search_view():
+    """Frameset holding the search attributes and the search results"""
+
+    return """<!DOCTYPE html>
+<html>
+<frameset rows="40%,60%">
+  <frame id="frameAttributes" name="frameAttributes" src="/planview/resource_search/attributes">
+  <frame id="frameSearchList" name="frameSearchList" src="/planview/resource_search/list">
+</frameset>
+</html>
+"""
+
+
+def resource_search_attributes():
+    """Search form, results go to the list frame"""
+
+    body = """
+<form method="get" action="/planview/resource_search/list" target="frameSearchList">
+  <input type="text" id="attribute_description" name="description">
+  <input type="submit" name="_search" value="Search">
+</form>"""
+
+    return PAGE.format(title="Search", body=body)
+
+
+def resource_id(description):
+    """Stable made-up resource id for a resource description"""
+
+    return str(10000 + sum(ord(c) * (i + 1) for i, c in enumerate(description.strip().lower())) % 90000)
+
+
+def resource_search_list(description):
+    """Search results; any non-empty search finds exactly one resource"""
+
+    if not description:
+        return PAGE.format(title="Results", body="")
+
+    body = f"""
+<table>
+  <tr>
+    <td><input type="checkbox" name="sel_list" value="{resource_id(description)}"></td>
+    <td>{html.escape(description)}</td>
+  </tr>
+</table>"""
+
+    return PAGE.format(title="Results", body=body)
+
+
+def work_view_page(work_id):
+    """Work View with the Describe & Categorize BI tab"""
+
+    body = """
+<ul class="tabs"><li id="describe">Describe &amp; Categorize BI</li></ul>
+<div id="tab-body"></div>
+<script>
+document.getElementById("describe").addEventListener("click", function () {
+  document.getElementById("tab-body").innerHTML =
+    '<iframe name="pv-iframeSets-ConfiguredScreens59" src="/planview/work/%s/describe" width="100%%" height="600"></iframe>';
+});
+</script>""" % work_id
+
+    return PAGE.format(title="Work View", body=body)
+
+
+def describe_page(state, work_id):
+    """Describe & Categorize BI; Edit swaps in the editor, Save posts it"""
+
+    def codemirror():
+        return (
+            '<div class="CodeMirror cm-s-paper CodeMirror-wrap">'
+            '<div class="CodeMirror-lines" contenteditable="true"></div>'
+            '</div>'
+        )
+
+    def picker(name):
+        return f'<input type="text" name="{name}">'
+
+    editor = f"""
+<div><label>BI Swim Lanes</label><select name="bi_swim_lane">{_options([""] + state.picklists["bi_swim_lane"])}</select></div>
+<div><label>BI Work Type</label><div><select name="bi_work_type"><option value=""></option><option value="3036593">BI Work</option></select></div></div>
+<div><label>Executive Sponsor</label>
+  <div class="attribute-field"><div class="editor-container datapicker-container required"><div class="data-picker-form-field-container attribute-part">
+    <span class="pickerplusmain pickerplusmaingrid">{picker("executive_sponsor")}</span>
+  </div></div></div>
+</div>
+<div><label>BI Business Owner</label><div>{picker("bi_business_owner")}</div></div>
+<div><label>BI Domain</label><div>{picker("bi_domain")}</div></div>
+<div><label>Requestor</label><div>{picker("requestor")}</div></div>
+<div><label>BI Liason</label><div><select name="bi_liaison">{_options([""] + state.picklists["bi_liaison"])}</select></div></div>
+<div title="Detailed Work Description.">{codemirror().replace('class="CodeMirror-lines"', 'class="CodeMirror-lines" data-name="work_description"')}</div>
+<div><label>Business Need</label><div class="attribute-field">{codemirror().replace('class="CodeMirror-lines"', 'class="CodeMirror-lines" data-name="business_need"')}</div></div>
+<button id="save"><span><span class="button-text">Save</span></span></button>"""
+
+    body = f"""
+<button id="edit">Edit</button>
+<div id="editor"></div>
+<script>
+var EDITOR = {json.dumps(editor)};
+document.getElementById("edit").addEventListener("click", function () {{
+  var container = document.getElementById("editor");
+  container.innerHTML = EDITOR;
+  document.getElementById("save").addEventListener("click", function () {{
+    var fields = {{}};
+    container.querySelectorAll("input, select").forEach(function (input) {{ fields[input.name] = input.value; }});
+    container.querySelectorAll("[data-name]").forEach(function (area) {{ fields[area.dataset.name] = area.textContent; }});
+    fetch("/planview/work/{work_id}/attributes", {{method: "POST", body: JSON.stringify(fields)}})
+      .then(function () {{ container.innerHTML = "<p>Saved</p>"; }});
+  }});
+}});
+</script>"""
+
+    return PAGE.format(title="Describe & Categorize BI", body=body)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes requests to the page functions above"""
+
+    # set by `make_server`
+    state = None
+
+    server_version = "PlanviewStub/1.0"
+
+    # keep-alive, so the REST client's pooled connections are actually reused
+    protocol_version = "HTTP/1.1"
+
+    # request body, once read
+    _body = None
+
+    def log_message(self, format, *args):
+        logging.getLogger("planview_stub").debug(format % args)
+
+    def _send(self, status, body="", content_type="text/html; charset=utf-8", headers=None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location, headers=None):
+        self._send(302, headers={"Location": location, **(headers or {})})
+
+    def _json(self, data, status=200):
+        self._send(status, json.dumps(data), content_type="application/json")
+
+    def _read_body(self):
+        # read at most once; whatever a route did not read is drained after it
+        if self._body is None:
+            length = int(self.headers.get("Content-Length") or 0)
+            self._body = self.rfile.read(length).decode("utf-8")
+        return self._body
+
+    def _form(self):
+        return {key: values[-1] for key, values in parse_qs(self._read_body(), keep_blank_values=True).items()}
+
+    def _logged_in(self):
+        for cookie in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == "pvsession":
+                return self.state.session_is_valid(value)
+        return False
+
+    def _route(self, method):
+        sleep(self.state.latency)
+
+        url = urlsplit(self.path)
+        path = url.path
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if path == "/login":
+            return self._login(method, query)
+
+        if path == "/stub/work":
+            with self.state.lock:
+                return self._json(list(self.state.work.values()))
+
+        if path.startswith("/api/v1/"):
+            if self.state.api_fault is not None:
+                return self._send(*self.state.api_fault)
+            return self._api(method, path[len("/api/v1"):], query)
+
+        if not self._logged_in():
+            if method == "GET":
+                return self._redirect(f"/login?next={quote(self.path, safe='')}")
+            return self._send(401, "not logged in")
+
+        if path == NEW_WORK_PATH and method == "GET":
+            return self._send(200, new_work_page1())
+
+        if path == "/planview/work" and method == "POST":
+            work_id = self.state.new_work(self._form())
+            return self._redirect(f"/planview/work/{work_id}/page2")
+
+        if path.startswith("/planview/resource_search/"):
+            page = path.rsplit("/", 1)[-1]
+            if page == "view":
+                return self._send(200, resource_search_view())
+            if page == "attributes":
+                return self._send(200, resource_search_attributes())
+            if page == "list":
+                return self._send(200, resource_search_list(query.get("description", "")))
+
+        match = re.fullmatch(r"/planview/work/(\d+)/(\w+)", path)
+        if match and int(match.group(1)) in self.state.work:
+            return self._work(method, int(match.group(1)), match.group(2), query)
+
+        return self._send(404, "not found")
+
+    def _login(self, method, query):
+        if method == "GET":
+            return self._send(200, login_page(query.get("next", NEW_WORK_PATH)))
+
+        form = self._form()
+        token = self.state.new_session()
+        return self._redirect(form.get("next") or NEW_WORK_PATH, {"Set-Cookie": f"pvsession={token}; Path=/"})
+
+    def _work(self, method, work_id, page, query):
+        if page == "page2":
+            if method == "POST":
+                self.state.update_work(work_id, self._form())
+                return self._redirect(f"/planview/work/{work_id}/page2?completed=1")
+            return self._send(200, new_work_page2(self.state, work_id, query.get("completed") == "1"))
+
+        if page == "assignments" and method == "GET":
+            return self._send(200, work_and_assignments_page(self.state, work_id))
+
+        if page == "resource_search" and method == "GET":
+            return self._send(200, resource_search_page(work_id))
+
+        if page == "view" and method == "GET":
+            return self._send(200, work_view_page(work_id))
+
+        if page == "describe" and method == "GET":
+            return self._send(200, describe_page(self.state, work_id))
+
+        if page in ("grid", "attributes") and method == "POST":
+            self.state.update_work(work_id, json.loads(self._read_body() or "{}"))
+            return self._json({"ok": True})
+
+        if page == "allocations" and method == "POST":
+            with self.state.lock:
+                self.state.work[work_id]["allocations"].extend(json.loads(self._read_body() or "[]"))
+            return self._json({"ok": True})
+
+        return self._send(404, "not found")
+
+    def _api_token(self):
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        return token if scheme == "Bearer" else None
+
+    def _api(self, method, path, query):
+        if path == "/token" and method == "POST":
+            token = self.state.new_session()
+            return self._json({"access_token": token, "token_type": "Bearer", "expires_in": self.state.session_ttl})
+
+        if not self.state.session_is_valid(self._api_token()):
+            return self._json({"error": "invalid or expired token"}, 401)
+
+        if path == "/work" and method == "POST":
+            work_id = self.state.new_work(json.loads(self._read_body() or "{}"))
+            with self.state.lock:
+                return self._json(self.state.work[work_id], 201)
+
+        if path == "/work" and method == "GET":
+            prefix = query.get("description_startswith", "")
+            with self.state.lock:
+                matches = [
+                    work for _, work in sorted(self.state.work.items())
+                    if str(work.get("description", "")).startswith(prefix)
+                    and work.get("workstream") == query.get("workstream", work.get("workstream"))
+                ]
+            offset = int(query.get("offset", 0))
+            limit = int(query.get("limit", 100))
+            return self._json(matches[offset:offset + limit])
+
+        if path == "/resources" and method == "GET":
+            description = query.get("description", "").strip()
+            if not description:
+                return self._json([])
+            return self._json([{"id": resource_id(description), "description": description}])
+
+        if path.startswith("/picklists/") and method == "GET":
+            options = self.state.picklists.get(path[len("/picklists/"):])
+            if options is None:
+                return self._json({"error": "not found"}, 404)
+            return self._json(options)
+
+        match = re.fullmatch(r"/work/(\d+)(/allocations)?", path)
+        if not match or int(match.group(1)) not in self.state.work:
+            return self._json({"error": "not found"}, 404)
+        work_id = int(match.group(1))
+
+        if match.group(2) and method == "POST":
+            allocation = json.loads(self._read_body() or "{}")
+            with self.state.lock:
+                self.state.work[work_id]["allocations"].append(str(allocation["resource_id"]))
+            return self._json(allocation, 201)
+
+        if not match.group(2) and method == "PATCH":
+            self.state.update_work(work_id, json.loads(self._read_body() or "{}"))
+
+        if not match.group(2) and method in ("GET", "PATCH"):
+            with self.state.lock:
+                return self._json(self.state.work[work_id])
+
+        return self._json({"error": "method not allowed"}, 405)
+
+    def _handle(self, method):
+        self._body = None
+        self._route(method)
+        self._read_body()
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+def make_server(host="127.0.0.1", port=8765, latency=0.0, session_ttl=None, picklists=None):
+    """
+    Build a stand-in server; call `serve_forever()` on it to start it
+
+    Parameters
+    ----------
+    host: str
+        Interface to listen on
+
+    port: int
+        Port to listen on, 0 picks a free one
+
+    latency: float
+        Seconds every request is held before it is answered
+
+    session_ttl: float, optional
+        Seconds a log-in stays valid, to exercise re-authentication
+
+    picklists: dict, optional
+        Options for each picker, see `PICKLISTS`
+
+    Returns
+    -------
+    server: http.server.ThreadingHTTPServer
+    """
+
+    state = StubState(latency=latency, session_ttl=session_ttl, picklists=picklists)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Planview pages prm.py drives")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds a log-in stays valid")
+    parser.add_argument("--picklists", help="JSON file overriding the picker options")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    picklists = None
+    if args.picklists:
+        with open(args.picklists) as f:
+            picklists = {**PICKLISTS, **json.load(f)}
+
+    server = make_server(args.host, args.port, args.latency, args.session_ttl, picklists)
+    logging.getLogger("planview_stub").info(f"serving on http://{args.host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
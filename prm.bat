@@ -1,4 +1,4 @@
 echo off
 call conda activate prm
-call python prm.py
+call python prm.py %*
 call conda deactivate
\ No newline at end of file
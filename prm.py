@@ -1,16 +1,150 @@
-from selenium import webdriver
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 import os
-from datetime import date
-from time import sleep
+import sys
+import json
+import math
+import functools
+import contextvars
+import threading
+import glob
+import hashlib
+import base64
+import traceback
+import importlib
+import difflib
+import re
+from typing import NamedTuple
+from collections import deque
+import queue
+import argparse
+import http.client
+from urllib.parse import urlencode, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from time import perf_counter, sleep
 import logging
-import pandas as pd
-from calendar import monthrange
+import logging.handlers
+import atexit
+from calendar import month_name, monthrange
+
+
+class _LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access
+
+    `selenium.webdriver` and `pandas` took about 80% of `import prm`, and
+    many runs (the REST backend, the daemon client, `from prm import *` in
+    a notebook) need neither or only one of them.
+
+    Parameters
+    ----------
+    name: str
+        Dotted module name
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}{'' if self._module is None else ' (loaded)'}>"
+
+
+class _LazyAttribute(_LazyModule):
+    """
+    Stands in for a class or function of a module, imported on first use
+
+    Parameters
+    ----------
+    name: str
+        Dotted module name
+
+    attribute: str
+        Name within the module
+    """
+
+    def __init__(self, name, attribute):
+        super().__init__(name)
+        self._attribute = attribute
+
+    def _load(self):
+        return getattr(super()._load(), self._attribute)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self._name}.{self._attribute}>"
+
+
+webdriver = _LazyModule("selenium.webdriver")
+ActionChains = _LazyAttribute("selenium.webdriver.common.action_chains", "ActionChains")
+Keys = _LazyAttribute("selenium.webdriver.common.keys", "Keys")
+_SeleniumWait = _LazyAttribute("selenium.webdriver.support.ui", "WebDriverWait")
+EC = _LazyModule("selenium.webdriver.support.expected_conditions")
+Options = _LazyAttribute("selenium.webdriver.chrome.options", "Options")
+EdgeOptions = _LazyAttribute("selenium.webdriver.edge.options", "Options")
+pd = _LazyModule("pandas")
+asyncio = _LazyModule("asyncio")
+
+
+class WebDriverWait:
+    """
+    Selenium's `WebDriverWait` with its driver and timeout public, so the
+    helpers that are only handed a wait (`_wait_until`, `_locate`) can reach
+    the browser without reading Selenium's private attributes
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.remote.webdriver.WebDriver
+        The driver used to control the browser
+
+    timeout: float
+        Seconds `until` waits
+
+    poll_frequency: float
+        Seconds between checks
+
+    ignored_exceptions: tuple, optional
+        Exceptions that count as "not yet"
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=0.5, ignored_exceptions=None):
+        self.driver = driver
+        self.timeout = timeout
+        self._wait = _SeleniumWait(driver, timeout, poll_frequency, ignored_exceptions)
+
+    def until(self, method, message=""):
+        return self._wait.until(method, message)
+
+    def until_not(self, method, message=""):
+        return self._wait.until_not(method, message)
+
+
+class By:
+    """
+    The locator strategies `LOCATORS` uses, with the same values as
+    `selenium.webdriver.common.by.By`, whose import would load all of
+    `selenium.webdriver`
+    """
+
+    CSS_SELECTOR = "css selector"
+    XPATH = "xpath"
 
 
 def _get_date():
@@ -54,7 +188,7 @@ def _get_end_of_month(today_str):
 
     logger.debug("convert today_str to datetime")
     # convert today_str to datetime
-    today = pd.to_datetime(today_str, format="%m/%d/%Y")
+    today = datetime.strptime(today_str, "%m/%d/%Y")
 
     logger.debug("get end of month")
     # get end of month
@@ -68,1377 +202,6323 @@ def _get_end_of_month(today_str):
     return end_of_month_str
 
 
-def check_url(driver):
-    """"""
-    new_work_url = "https://ukhs.pvcloud.com/planview/ConfiguredScreens/ConfiguredScreen.aspx?sid=CfgDef$WDT&mode=RW&popup=1&back=close"
-
-    return driver.current_url == new_work_url
-
-
-def login(driver, wait):
+def _get_month_and_year(today_str):
     """
-    Log-in to PRM
+    Get the month name and year that work item descriptions start with
 
     Parameters
     ----------
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
-
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    today_str: str
+        Today's date string
 
     Returns
     -------
-    None
+    month: str
+        e.g. "October"
+
+    year: int
     """
 
-    logger = logging.getLogger("login")
+    logger = logging.getLogger("_get_month_and_year")
+
+    logger.debug("convert today_str to datetime")
+    # convert today_str to datetime
+    today = datetime.strptime(today_str, "%m/%d/%Y")
 
-    logger.debug("define new work url")
-    # define new work url
-    new_work_url = "https://ukhs.pvcloud.com/planview/ConfiguredScreens/ConfiguredScreen.aspx?sid=CfgDef$WDT&mode=RW&popup=1&back=close"
+    logger.debug("return month, year")
+    return month_name[today.month], today.year
 
-    logger.debug("navigate to new work page")
-    # navigate to new work page
-    driver.get(new_work_url)
 
-    sleep(2)
+# Upper bounds, in seconds, for each kind of wait. A wait returns as soon as
+# its condition holds, so these only decide how long a step may take before
+# it gives up. Change them with `configure_waits`.
+WAIT_CEILINGS = {
+    "default": 30,
+    # navigation, login redirects
+    "page": 30,
+    # an input becoming enabled
+    "input": 10,
+    # a grid editor or picker resolving
+    "picker": 10,
+    # a save or popup finishing
+    "save": 30,
+}
 
-    if not check_url(driver):
-        logger.debug("locate user name input")
-        # locate user name input
-        user_name_input = wait.until(
-            EC.presence_of_element_located(
-                # (By.CSS_SELECTOR, "input[name='UserName']")
-                (By.CSS_SELECTOR, "input[type='email']")
-            )
-        )
+# how often a condition is re-checked, in seconds
+POLL_FREQUENCY = 0.1
 
-        logger.debug("type user name")
-        # type user name
-        # user_name_input.send_keys(os.getenv("user"))
-        user_name_input.send_keys(os.getenv("email"))
 
-        logger.debug("click 'Next'")
-        # click "Next"
-        next_button = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, "//*[text()='Next']")
-            )
-        )
-        next_button.click()
-
-        logger.debug("locate password input")
-        # locate password input
-        password_input = wait.until(
-            EC.presence_of_element_located(
-                # (By.CSS_SELECTOR, "input[name='Password']")
-                (By.CSS_SELECTOR, "input[type='password']")
-            )
-        )
+def configure_waits(poll_frequency=None, **ceilings):
+    """
+    Change the wait ceilings and/or the poll frequency
+
+    Parameters
+    ----------
+    poll_frequency: float, optional
+        Seconds between condition checks
 
-        logger.debug("type password")
-        # type password
-        password_input.send_keys(os.getenv("pass"))
+    **ceilings: float
+        New ceiling for any key of `WAIT_CEILINGS`, e.g. `save=60`
 
-        logger.debug("locate submit button")
-        # locate submit button
-        submit_button = wait.until(
-            EC.presence_of_element_located(
-                # (By.CSS_SELECTOR, "span[class='submit'][role='button']")
-                (By.CSS_SELECTOR, "button[type='submit']")
-            )
-        )
+    Returns
+    -------
+    None
+    """
 
-        logger.debug("click button")
-        # click button
-        submit_button.click()
+    global POLL_FREQUENCY
+
+    unknown = set(ceilings) - set(WAIT_CEILINGS)
+    if unknown:
+        raise ValueError(f"unknown wait ceiling(s): {', '.join(sorted(unknown))}")
+
+    WAIT_CEILINGS.update(ceilings)
+
+    if poll_frequency is not None:
+        POLL_FREQUENCY = poll_frequency
 
-    logger.debug("return None")
     return None
 
 
-def new_work_page1(wait, today_str, description):
+def _wait_until(wait, condition, ceiling="default", required=True):
     """
-    Fill in fields on first "New Work" page
+    Wait for `condition` with the ceiling for this kind of step
 
     Parameters
     ----------
     wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+        The caller's wait; only its driver is reused
 
-    today_str: str
-        Today's date formatted as mm/dd/yyyy
+    condition: callable
+        Takes the driver and returns something truthy once it holds
 
-    description: str
-        Description/Name of project
+    ceiling: str
+        Key of `WAIT_CEILINGS`
+
+    required: bool
+        If False, running out of time is logged and None is returned instead
+        of raising, for waits that only replace a "let it settle" sleep
 
     Returns
     -------
-    None
+    result: object
+        Whatever `condition` returned
     """
 
-    logger = logging.getLogger("new_work_page1")
+    logger = logging.getLogger("_wait_until")
 
-    logger.debug("locate workstream input")
-    # locate workstream input
-    workstream_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "div[class='data-picker-form-field-container attribute-part'][title='Description of the project parent in Work stucture']"
-             "> span"
-             "> input")
-        )
+    step_wait = _SeleniumWait(
+        driver=wait.driver,
+        timeout=WAIT_CEILINGS[ceiling],
+        poll_frequency=POLL_FREQUENCY,
+        ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
     )
 
-    logger.debug("type Business Intelligence")
-    # type "Business Intelligence"
-    workstream_input.send_keys("Business Intelligence")
+    try:
+        return step_wait.until(condition)
+    except TimeoutException:
+        if required:
+            raise
+        logger.warning("gave up after %ss (%s), carrying on", WAIT_CEILINGS[ceiling], ceiling)
+        return None
 
-    logger.debug("locate description input")
-    # locate description input
-    description_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[title='The description of the project, or the work entity.']")
-        )
-    )
 
-    logger.debug(f"type {description}")
-    # type <name of project>
-    description_input.send_keys(f"{description}")
+def _any_of(*conditions):
+    """
+    Condition that holds as soon as one of `conditions` does
 
-    logger.debug("locate work type selector")
-    # locate work type selector
-    work_type_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "option[value='3036594']")
-        )
-    )
+    Returns
+    -------
+    condition: callable
+    """
 
-    logger.debug("click <option>")
-    # click <option>
-    work_type_selector.click()
-
-    logger.debug("locate requested start input")
-    # locate requested start input
-    requested_start_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "input[title='The date the project has to be started. This date is used by the CPM forward pass for early date calculations. ']")
-        )
-    )
+    def _predicate(driver):
+        for condition in conditions:
+            try:
+                result = condition(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if result:
+                return result
+        return False
 
-    sleep(1)
+    return _predicate
 
-    logger.debug(f"type {today_str}")
-    # type <date>
-    requested_start_input.send_keys(today_str)
 
-    sleep(1)
+def _url_is(url):
+    """
+    Condition that holds once the driver is on `url`
 
-    logger.debug("locate requested finish input")
-    # locate requested finish input
-    requested_finish_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "input[title='The date the project has to be completed by. This date is used by the CPM backward pass for late date calculations. ']")
-        )
-    )
+    Returns
+    -------
+    condition: callable
+    """
 
-    logger.debug("get end_of_month_str")
-    # get end_of_month_str
-    end_of_month_str = _get_end_of_month(today_str)
+    def _predicate(driver):
+        return driver.current_url == url
 
-    sleep(2)
+    return _predicate
 
-    logger.debug(f"type {end_of_month_str}")
-    # type <date>
-    requested_finish_input.send_keys(end_of_month_str)
 
-    sleep(1)
+def _document_is_complete():
+    """
+    Condition that holds once the document has finished loading
 
-    logger.debug("locate save button")
-    # locate save button
-    save_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='Save']")
-        )
-    )
+    Returns
+    -------
+    condition: callable
+    """
 
-    logger.debug("click button")
-    # click button
-    save_button.click()
+    def _predicate(driver):
+        return driver.execute_script("return document.readyState === 'complete';")
 
-    logger.debug("return None")
-    return None
+    return _predicate
 
 
-def new_work_page2(wait, today_str, bi_service_name):
+def _page_is_ready():
     """
-    Fill in fields on second "New Work" page
-
-    Parameters
-    ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
-
-    today_str: str
-        Today's date formatted as mm/dd/yyyy
+    Condition that holds once the document has loaded and no jQuery requests
+    are in flight
 
-    bi_service_name: str
-        Name of BI Service
+    jQuery only counts open requests, so a long poll or keep-alive request
+    would keep the page busy for good; once requests have been open without
+    a break for `NETWORK_IDLE["ignore_after"]` seconds they are not waited
+    for any longer. Only meant for the waits after a save or navigation.
 
     Returns
     -------
-    None
+    condition: callable
     """
 
-    logger = logging.getLogger("new_work_page2")
+    busy_since = None
 
-    logger.debug("locate bi service name selector")
-    # locate bi service name selector
-    bi_service_name_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, f"//*[text()='{bi_service_name}']")
-        )
-    )
+    def _predicate(driver):
+        nonlocal busy_since
 
-    logger.debug(f"click {bi_service_name}")
-    # click <option>
-    bi_service_name_selector.click()
-
-    logger.debug("locate bi scoped date input")
-    # locate bi scoped date input
-    bi_scoped_date_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "div[class='attribute-field'][id='bi_scoped_date']"
-             "> div"
-             "> input")
+        complete, active = driver.execute_script(
+            "return [document.readyState === 'complete',"
+            " typeof window.jQuery === 'undefined' ? 0 : window.jQuery.active];"
         )
-    )
+        if not complete:
+            return False
+        if not active:
+            return True
 
-    logger.debug(f"type {today_str}")
-    # type <date>
-    bi_scoped_date_input.send_keys(today_str)
-
-    logger.debug("locate bi date approved input")
-    # locate bi date approved input
-    bi_date_approved_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "div[class='attribute-field'][id='bi_date_created']"
-             "> div"
-             "> input")
-        )
-    )
+        busy_since = busy_since if busy_since is not None else perf_counter()
+        return perf_counter() - busy_since >= NETWORK_IDLE["ignore_after"]
 
-    logger.debug(f"type {today_str}")
-    # type <date>
-    bi_date_approved_input.send_keys(today_str)
+    return _predicate
 
-    logger.debug("locate save and complete button")
-    # locate save and complete button
-    save_and_complete_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='Save and Complete']")
-        )
-    )
 
-    logger.debug("click button")
-    # click button
-    save_and_complete_button.click()
+def _located_and_enabled(locator):
+    """
+    Condition that holds once the element at `locator` exists, is enabled
+    and the document has loaded; the element is returned
 
-    logger.debug("locate action menu button")
-    # locate action menu button
-    action_menu_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR,
-             "button[class='banner-title-bar-button']"
-             "> span[title='Actions']")
-        )
-    )
+    Unlike `EC.element_to_be_clickable` this does not require the element to
+    be displayed, as the picker inputs are driven through ActionChains.
+    Background requests are not waited for here, a page that keeps one open
+    would otherwise hold every picker up until its ceiling.
 
-    logger.debug("click button")
-    # click button
-    action_menu_button.click()
+    Returns
+    -------
+    condition: callable
+    """
 
-    logger.debug("locate work and assignments button")
-    # locate work and assignments button
-    work_and_assignments_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "li[title='Work and Assignments']")
-        )
-    )
+    document_is_complete = _document_is_complete()
 
-    logger.debug("click button")
-    # click button
-    work_and_assignments_button.click()
+    def _predicate(driver):
+        element = driver.find_element(*locator)
+        if element.is_enabled() and document_is_complete(driver):
+            return element
+        return False
 
-    logger.debug("return None")
-    return None
+    return _predicate
 
 
-def _locate_grid_canvas_right(wait):
+def _element_has_class(element, class_name):
     """
-    Locates the grid canvas right and returns it
+    Condition that holds once `element` has `class_name` in its class list
 
-    Parameters
-    ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    Returns
+    -------
+    condition: callable
+    """
+
+    def _predicate(driver):
+        return class_name in (element.get_attribute("class") or "").split()
+
+    return _predicate
+
+
+def _element_has_value(element, value):
+    """
+    Condition that holds once the value of input `element` is `value`
 
     Returns
     -------
-    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
+    condition: callable
     """
 
-    logger = logging.getLogger("_locate_grid_canvas_right")
+    def _predicate(driver):
+        return element.get_attribute("value") == value
 
-    logger.debug("locate grid canvas right")
-    # locate grid canvas right
-    grid_canvas_right = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "div[class='grid-canvas grid-canvas-top grid-canvas-right']")
-        )
-    )
+    return _predicate
 
-    logger.debug("return grid_canvas_right")
-    return grid_canvas_right
 
+def _window_is_closed(handle):
+    """
+    Condition that holds once the window `handle` no longer exists
 
-def _click_enter(driver):
+    Returns
+    -------
+    condition: callable
     """
-    Tells driver to click ENTER key
+
+    def _predicate(driver):
+        return handle not in driver.window_handles
+
+    return _predicate
+
+
+# When `_network_is_idle` considers the page's network idle. Change with
+# `configure_network_idle`.
+NETWORK_IDLE = {
+    # seconds without a tracked request starting or finishing
+    "quiet": 0.5,
+    # requests open longer than this (long polls, streams) are not waited for
+    "ignore_after": 10.0,
+}
+
+# resource types that count as the page still working; documents cover
+# frames such as the Describe & Categorize iframe loading
+_TRACKED_RESOURCE_TYPES = {"XHR", "Fetch", "Document"}
+
+# per driver session: requests in flight and when each window last saw
+# network activity, built from the performance log; None where the driver
+# has no performance log
+_NETWORK_ACTIVITY = {}
+
+
+def configure_network_idle(**settings):
+    """
+    Change what `_network_is_idle` waits for
 
     Parameters
     ----------
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    **settings: float
+        New value for any key of `NETWORK_IDLE`, e.g. `quiet=1.0`
 
     Returns
     -------
     None
     """
 
-    logger = logging.getLogger("_click_enter")
-
-    logger.debug("define action chain")
-    # define action chain
-    actions = ActionChains(driver=driver)
+    unknown = set(settings) - set(NETWORK_IDLE)
+    if unknown:
+        raise ValueError(f"unknown network idle setting(s): {', '.join(sorted(unknown))}")
 
-    logger.debug("click ENTER")
-    # click ENTER
-    actions.send_keys(Keys.ENTER)
-    actions.perform()
+    NETWORK_IDLE.update(settings)
 
-    logger.debug("return None")
     return None
 
 
-def enter_status_flag(wait, driver, grid_canvas_right):
+def _target_id(handle):
+    """DevTools target id of a Chromium window handle"""
+
+    return handle[len("CDwindow-"):] if handle.startswith("CDwindow-") else handle
+
+
+def _network_activity(driver):
     """
-    Locates "Enter Status Flag" and changes it from "No" to "Yes"
+    Read the DevTools network events logged since the last call
+
+    The performance log (enabled in `create_driver`) is drained on every
+    call, so the state is kept here per session.
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
-
     driver: selenium.webdriver.chrome.webdriver.WebDriver
         The driver used to control the browser
 
-    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
-        Location of grid on work and assignments page
-
     Returns
     -------
-    None
+    activity: dict or None
+        "requests" maps each request in flight to (target, start), "last"
+        maps each target to its latest network event; None if the driver
+        keeps no performance log
     """
 
-    logger = logging.getLogger("enter_status_flag")
+    session_id = driver.session_id
+    if session_id not in _NETWORK_ACTIVITY:
+        _NETWORK_ACTIVITY[session_id] = {"requests": {}, "last": {}}
 
-    # logger.debug("_locate_grid_canvas_right")
-    # grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+    activity = _NETWORK_ACTIVITY[session_id]
+    if activity is None:
+        return None
 
-    logger.debug("locate enter status flag")
-    # locate enter status flag
-    enter_status_flag_ = grid_canvas_right.find_element_by_css_selector("div")
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException as e:
+        logging.getLogger("_network_activity").warning(
+            "no performance log (%s), network idle waits fall back to the page's own state", e.msg
+        )
+        _NETWORK_ACTIVITY[session_id] = None
+        return None
+
+    now = perf_counter()
+    for entry in entries:
+        logged = json.loads(entry["message"])
+        event = logged["message"]
+        method = event.get("method", "")
+        if not method.startswith("Network."):
+            continue
+
+        params = event.get("params", {})
+        target = logged.get("webview")
+        if method == "Network.requestWillBeSent":
+            if params.get("type") not in _TRACKED_RESOURCE_TYPES:
+                continue
+            activity["requests"][params["requestId"]] = (target, now)
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            if activity["requests"].pop(params.get("requestId"), None) is None:
+                continue
+        else:
+            continue
+        activity["last"][target] = now
+
+    return activity
+
+
+def _network_is_idle(quiet=None):
+    """
+    Condition that holds once the current window has had no XHR, fetch or
+    document request in flight for `quiet` seconds
 
-    logger.debug("find tag with text = No")
-    # find tag with text = "No"
-    enter_status_flag_ = enter_status_flag_.find_element_by_xpath(
-        "//*[text()='No']"
-    )
+    Requests are followed through the DevTools protocol's network events,
+    which Edge and Chrome both write to the performance log. The quiet
+    window starts no earlier than the condition is made, so a request the
+    last click has yet to send is still waited for. Drivers without a
+    performance log fall back to `_page_is_ready`.
 
-    logger.debug("click it")
-    # click it
-    enter_status_flag_.click()
+    Parameters
+    ----------
+    quiet: float, optional
+        Seconds of silence needed, defaults to `NETWORK_IDLE["quiet"]`
 
-    logger.debug("_click_enter")
-    _click_enter(driver)
+    Returns
+    -------
+    condition: callable
+    """
 
-    logger.debug("locate the enter status flag selector")
-    # locate the enter status flag selector
-    enter_status_flag_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "option[value='Y']")
-        )
-    )
+    quiet = NETWORK_IDLE["quiet"] if quiet is None else quiet
+    since = perf_counter()
+    page_is_ready = _page_is_ready()
+
+    def _predicate(driver):
+        activity = _network_activity(driver)
+        if activity is None:
+            return page_is_ready(driver)
+
+        now = perf_counter()
+        target = _target_id(driver.current_window_handle)
+        # events carry the target of their top-level window; if this one has
+        # none yet, count every window's
+        if target not in activity["last"]:
+            target = None
+
+        for request_target, started in activity["requests"].values():
+            if (target is None or request_target == target) and now - started < NETWORK_IDLE["ignore_after"]:
+                return False
+
+        if target is None:
+            last = max(activity["last"].values(), default=since)
+        else:
+            last = activity["last"][target]
+
+        return now - max(last, since) >= quiet
+
+    return _predicate
+
+
+# Every element the step functions use, by logical name. Each name has an
+# ordered fallback chain; the first locator that matches wins, so a markup
+# change in Planview only needs a new entry at the front of a chain.
+# "{placeholders}" are filled in from keyword arguments at lookup time.
+LOCATORS = {
+    # log-in form
+    "login.email": (
+        (By.CSS_SELECTOR, "input[type='email']"),
+        (By.CSS_SELECTOR, "input[name='UserName']"),
+    ),
+    "login.next": (
+        (By.XPATH, "//*[text()='Next']"),
+        (By.CSS_SELECTOR, "input[type='submit'][value='Next']"),
+    ),
+    "login.password": (
+        (By.CSS_SELECTOR, "input[type='password']"),
+        (By.CSS_SELECTOR, "input[name='Password']"),
+    ),
+    "login.submit": (
+        (By.CSS_SELECTOR, "button[type='submit']"),
+        (By.CSS_SELECTOR, "input[type='submit']"),
+        (By.CSS_SELECTOR, "span[class='submit'][role='button']"),
+    ),
+
+    # first New Work page
+    "page1.workstream": (
+        (By.CSS_SELECTOR,
+         "div[class='data-picker-form-field-container attribute-part'][title='Description of the project parent in Work stucture']"
+         "> span"
+         "> input"),
+        (By.CSS_SELECTOR,
+         "div.data-picker-form-field-container[title='Description of the project parent in Work stucture'] input"),
+    ),
+    "page1.description": (
+        (By.CSS_SELECTOR, "input[title='The description of the project, or the work entity.']"),
+        (By.CSS_SELECTOR, "input[title^='The description of the project']"),
+    ),
+    "page1.work_type": (
+        (By.CSS_SELECTOR, "option[value='3036594']"),
+    ),
+    "page1.requested_start": (
+        (By.CSS_SELECTOR,
+         "input[title='The date the project has to be started. This date is used by the CPM forward pass for early date calculations. ']"),
+        (By.CSS_SELECTOR, "input[title^='The date the project has to be started.']"),
+    ),
+    "page1.requested_finish": (
+        (By.CSS_SELECTOR,
+         "input[title='The date the project has to be completed by. This date is used by the CPM backward pass for late date calculations. ']"),
+        (By.CSS_SELECTOR, "input[title^='The date the project has to be completed by.']"),
+    ),
+    "page1.save": (
+        (By.XPATH, "//*[text()='Save']"),
+        (By.XPATH, "//*[normalize-space(text())='Save']"),
+    ),
+
+    # second New Work page
+    "page2.bi_service_name": (
+        (By.XPATH, "//*[text()='{bi_service_name}']"),
+        (By.XPATH, "//*[normalize-space(text())='{bi_service_name}']"),
+    ),
+    "page2.bi_scoped_date": (
+        (By.CSS_SELECTOR,
+         "div[class='attribute-field'][id='bi_scoped_date']"
+         "> div"
+         "> input"),
+        (By.CSS_SELECTOR, "#bi_scoped_date input"),
+    ),
+    "page2.bi_date_created": (
+        (By.CSS_SELECTOR,
+         "div[class='attribute-field'][id='bi_date_created']"
+         "> div"
+         "> input"),
+        (By.CSS_SELECTOR, "#bi_date_created input"),
+    ),
+    "page2.save_and_complete": (
+        (By.XPATH, "//*[text()='Save and Complete']"),
+        (By.XPATH, "//*[normalize-space(text())='Save and Complete']"),
+    ),
+    "page2.actions": (
+        (By.CSS_SELECTOR,
+         "button[class='banner-title-bar-button']"
+         "> span[title='Actions']"),
+        (By.CSS_SELECTOR, "button.banner-title-bar-button span[title='Actions']"),
+    ),
+    "page2.work_and_assignments": (
+        (By.CSS_SELECTOR, "li[title='Work and Assignments']"),
+        (By.XPATH, "//li[normalize-space()='Work and Assignments']"),
+    ),
+
+    # Work and Assignments grid
+    "grid.right": (
+        (By.CSS_SELECTOR, "div[class='grid-canvas grid-canvas-top grid-canvas-right']"),
+        (By.CSS_SELECTOR, "div.grid-canvas.grid-canvas-top.grid-canvas-right"),
+    ),
+    "grid.left": (
+        (By.CSS_SELECTOR, "div[class='grid-canvas grid-canvas-top grid-canvas-left']"),
+        (By.CSS_SELECTOR, "div.grid-canvas.grid-canvas-top.grid-canvas-left"),
+    ),
+    "grid.first_row": (
+        (By.CSS_SELECTOR, "div"),
+    ),
+    "grid.status_flag_no": (
+        (By.XPATH, "//*[text()='No']"),
+    ),
+    "grid.status_flag_yes": (
+        (By.CSS_SELECTOR, "option[value='Y']"),
+    ),
+    "grid.bi_assignment_owner_cells": (
+        (By.CSS_SELECTOR,
+         "div:last-of-type"
+         "> div[class='slick-cell l4 r4 hasEditor']"),
+        (By.CSS_SELECTOR, "div:last-of-type > div.slick-cell.l4.hasEditor"),
+    ),
+    "grid.bi_assignment_owner_option": (
+        (By.CSS_SELECTOR, "option[value='{bi_assignment_owner_name}']"),
+    ),
+    "grid.bi_team_cell": (
+        (By.CSS_SELECTOR,
+         "div"
+         "> div:nth-child(2)"),
+    ),
+    # a cell without an editor; activating it commits the open editor
+    "grid.commit_cell": (
+        (By.CSS_SELECTOR,
+         "div"
+         "> div:nth-child(3)"),
+    ),
+    "grid.bi_team_option": (
+        (By.XPATH, "//*[text()='{bi_team_name}']"),
+        (By.XPATH, "//*[normalize-space(text())='{bi_team_name}']"),
+    ),
+    "grid.row_actions": (
+        (By.CSS_SELECTOR,
+         "div:last-of-type"
+         "> div"
+         "> div[class='ActionLinkButton'][title='Actions']"),
+        (By.CSS_SELECTOR, "div:last-of-type div.ActionLinkButton[title='Actions']"),
+    ),
+    "menu.assignments": (
+        (By.XPATH, "//*[text()='Assignments']"),
+        (By.XPATH, "//*[normalize-space(text())='Assignments']"),
+    ),
+    "menu.new_allocation": (
+        (By.XPATH, "//*[text()='New Allocation']"),
+        (By.XPATH, "//*[normalize-space(text())='New Allocation']"),
+    ),
+
+    # resource search popup
+    "search.view_frame": (
+        (By.CSS_SELECTOR, "iframe[name='iframeSearchView']"),
+        (By.CSS_SELECTOR, "iframe[id='iframeSearchView']"),
+    ),
+    "search.attributes_frame": (
+        (By.CSS_SELECTOR, "frame[id='frameAttributes']"),
+        (By.CSS_SELECTOR, "frame[name='frameAttributes'], iframe[name='frameAttributes']"),
+    ),
+    "search.description": (
+        (By.CSS_SELECTOR, "input[id='attribute_description']"),
+        (By.CSS_SELECTOR, "input[name='attribute_description']"),
+    ),
+    "search.button": (
+        (By.CSS_SELECTOR, "input[name='_search'][type='submit']"),
+        (By.CSS_SELECTOR, "input[name='_search']"),
+    ),
+    "search.list_frame": (
+        (By.CSS_SELECTOR, "frame[id='frameSearchList']"),
+        (By.CSS_SELECTOR, "frame[name='frameSearchList'], iframe[name='frameSearchList']"),
+    ),
+    "search.checkbox": (
+        (By.CSS_SELECTOR, "input[type='checkbox'][name='sel_list']"),
+    ),
+    "search.checkbox_for": (
+        (By.CSS_SELECTOR, "input[type='checkbox'][name='sel_list'][value='{resource_id}']"),
+    ),
+    "search.ok": (
+        (By.CSS_SELECTOR, "input[type='button'][value='OK']"),
+        (By.XPATH, "//button[normalize-space()='OK']"),
+    ),
+
+    # banner menu
+    "banner.actions": (
+        (By.CSS_SELECTOR, "span[class='pv12MenuAffordanceIcon'][title='Actions']"),
+        (By.CSS_SELECTOR, "span.pv12MenuAffordanceIcon[title='Actions']"),
+    ),
+    "banner.work_view": (
+        (By.CSS_SELECTOR, "li[title='Work View'] > span[class='bannerMenuItemText']"),
+        (By.CSS_SELECTOR, "li[title='Work View']"),
+    ),
+
+    # Work View and the Describe & Categorize BI editor
+    "work_view.describe_tab": (
+        (By.XPATH, "//*[text()='Describe & Categorize BI']"),
+        (By.XPATH, "//*[normalize-space(text())='Describe & Categorize BI']"),
+    ),
+    "work_view.describe_iframe": (
+        (By.CSS_SELECTOR, "iframe[name='pv-iframeSets-ConfiguredScreens59']"),
+        (By.CSS_SELECTOR, "iframe[name^='pv-iframeSets-ConfiguredScreens']"),
+    ),
+    "describe.edit": (
+        (By.XPATH, "//*[text()='Edit']"),
+        (By.XPATH, "//*[normalize-space(text())='Edit']"),
+    ),
+    "describe.bi_swim_lanes_label": (
+        (By.XPATH, "//*[text()='BI Swim Lanes']"),
+        (By.XPATH, "//label[normalize-space()='BI Swim Lanes']"),
+    ),
+    "describe.bi_swim_lane_option": (
+        (By.CSS_SELECTOR, "option[value='{bi_swim_lane_name}']"),
+    ),
+    "describe.bi_work_type": (
+        (By.XPATH, "//label[text()='BI Work Type']/parent::div//select/option[@value='3036593']"),
+    ),
+    "describe.executive_sponsor": (
+        (By.XPATH,
+         "//label[text()='Executive Sponsor']"
+         "/parent::div"
+         "//div[@class='attribute-field']"
+         "//div[@class='editor-container datapicker-container required']"
+         "//div[@class='data-picker-form-field-container attribute-part']"
+         "//span[@class='pickerplusmain pickerplusmaingrid']"
+         "//input[@type='text']"),
+        (By.XPATH, "//label[text()='Executive Sponsor']/parent::div//input[@type='text']"),
+    ),
+    "describe.bi_business_owner": (
+        (By.XPATH, "//label[text()='BI Business Owner']/parent::div//input"),
+    ),
+    "describe.bi_domain": (
+        (By.XPATH, "//label[text()='BI Domain']/parent::div//input[@type='text']"),
+    ),
+    "describe.requestor": (
+        (By.XPATH, "//label[text()='Requestor']/parent::div//input[@type='text']"),
+    ),
+    "describe.bi_liaison": (
+        (By.XPATH, "//label[text()='BI Liason']/parent::div//select"),
+        # in case the label's spelling is ever fixed
+        (By.XPATH, "//label[text()='BI Liaison']/parent::div//select"),
+    ),
+    "describe.bi_liaison_option": (
+        (By.CSS_SELECTOR, "option[value='{bi_liaison_name}']"),
+    ),
+    "describe.work_description": (
+        (By.XPATH,
+         "//div[@title='Detailed Work Description.']"
+         "//div[@class='CodeMirror cm-s-paper CodeMirror-wrap']"
+         "//div[@class='CodeMirror-lines']"),
+        (By.XPATH, "//div[@title='Detailed Work Description.']//div[contains(@class, 'CodeMirror-lines')]"),
+    ),
+    "describe.business_need": (
+        (By.XPATH,
+         "//label[text()='Business Need']/parent::div/div[@class='attribute-field']"
+         "//div[@class='CodeMirror cm-s-paper CodeMirror-wrap']"
+         "//div[@class='CodeMirror-lines']"),
+        (By.XPATH, "//label[text()='Business Need']/parent::div//div[contains(@class, 'CodeMirror-lines')]"),
+    ),
+    "describe.save": (
+        (By.XPATH, "//button/span/span[@class='button-text'][text()='Save']"),
+        (By.XPATH, "//button[.//*[normalize-space(text())='Save']]"),
+    ),
+}
+
+# resolved elements per browser session, for containers that are looked up
+# more than once on the same page; see `_locate(..., cache=True)`
+_ELEMENT_CACHE = {}
+
+# names whose first locator has already been reported as not matching
+_FALLBACKS_REPORTED = set()
+
+
+def _locators(name, **params):
+    """
+    The fallback chain for `name` with its placeholders filled in
 
-    logger.debug("click <option>")
-    # click <option>
-    enter_status_flag_selector.click()
+    Parameters
+    ----------
+    name: str
+        Key of `LOCATORS`
 
-    # wait a sec
-    sleep(1)
+    **params:
+        Values for the placeholders
+
+    Returns
+    -------
+    locators: tuple
+        (By, selector) pairs in the order to try them
+    """
+
+    if not params:
+        return LOCATORS[name]
+
+    return tuple((by, selector.format(**params)) for by, selector in LOCATORS[name])
+
+
+def _report_fallback(name, position):
+    """Warn, once per name, that a locator further down the chain was needed"""
+
+    if name not in _FALLBACKS_REPORTED:
+        _FALLBACKS_REPORTED.add(name)
+        logging.getLogger("_locate").warning(
+            "%s: primary locator did not match, fallback #%s did; update LOCATORS", name, position
+        )
 
-    logger.debug("return None")
     return None
 
 
-def bi_assignment_owner(wait, driver, grid_canvas_right, bi_assignment_owner_name):
+def _located(name, condition=None, **params):
     """
-    Locate "BI Assignment Owner" field and select option
+    Condition that holds once `condition` holds for any locator of `name`
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
-
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    name: str
+        Key of `LOCATORS`
 
-    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
-        Location of grid on work and assignments page
+    condition: callable
+        Takes a locator and returns a condition, like the functions in
+        `expected_conditions`; defaults to presence
 
-    bi_assignment_owner_name: str
-        Name of BI Assignment Owner
+    **params:
+        Values for the placeholders in the locators
 
     Returns
     -------
-    None
+    condition: callable
     """
 
-    logger = logging.getLogger("bi_assignment_owner")
+    locators = _locators(name, **params)
 
-    # logger.debug("_locate_grid_canvas_right")
-    # grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+    def _predicate(driver):
+        # built here rather than up front so module-level conditions such as
+        # `ROW_STATES` do not import selenium.webdriver
+        locator_condition = condition or EC.presence_of_element_located
+        for position, locator in enumerate(locators):
+            try:
+                result = locator_condition(locator)(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if result:
+                if position:
+                    _report_fallback(name, position)
+                return result
+        return False
 
-    logger.debug("locate the bi assignment owner")
-    # locate the bi assignment owner  # **Analysis and Solution Development**
-    bi_assignment_owner_ = grid_canvas_right.find_elements_by_css_selector(
-        "div:last-of-type"
-        "> div[class='slick-cell l4 r4 hasEditor']"
-    )[-1]
+    return _predicate
 
-    logger.debug("click it")
-    # click it
-    bi_assignment_owner_.click()
 
-    logger.debug("sleep(1)")
-    sleep(1)
+def _locate(wait, name, condition=None, ceiling="default", required=True, cache=False, **params):
+    """
+    Wait for the element called `name` in `LOCATORS`
 
-    logger.debug("_click_enter")
-    _click_enter(driver)
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
 
-    logger.debug("locate bi assignment owner selector")
-    # locate bi assignment owner selector
-    bi_assignment_owner_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, f"option[value='{bi_assignment_owner_name}']")
-        )
-    )
+    name: str
+        Key of `LOCATORS`
 
-    logger.debug(f"click {bi_assignment_owner_name}")
-    # click <option>
-    bi_assignment_owner_selector.click()
+    condition: callable
+        Takes a locator and returns a condition, defaults to presence
 
-    logger.debug("return None")
-    return None
+    ceiling: str
+        Key of `WAIT_CEILINGS`
 
+    required: bool
+        See `_wait_until`
 
-def bi_team(wait, driver, grid_canvas_right, bi_team_name):
+    cache: bool
+        Reuse the element found earlier on the same page; only for elements
+        that stay put until the page changes
+
+    **params:
+        Values for the placeholders in the locators
+
+    Returns
+    -------
+    result: object
+        Whatever the condition returned, usually the WebElement
     """
-    Locate "BI Team" field and select option
+
+    key = (name, tuple(sorted(params.items())))
+    page_cache = _ELEMENT_CACHE.setdefault(wait.driver.session_id, {}) if cache else None
+
+    if cache and key in page_cache:
+        return page_cache[key]
+
+    result = _wait_until(wait, _located(name, condition, **params), ceiling=ceiling, required=required)
+
+    if cache and result is not None:
+        page_cache[key] = result
+
+    return result
+
+
+def _find(parent, name, many=False, **params):
+    """
+    Find the element called `name` under `parent` without waiting
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    parent: selenium.webdriver.remote.webdriver.WebDriver or selenium.webdriver.remote.webelement.WebElement
+        Where to search
 
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    name: str
+        Key of `LOCATORS`
 
-    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
-        Location of grid on work and assignments page
+    many: bool
+        Return every match instead of the first
 
-    bi_team_name: str
-        Name of BI Team
+    **params:
+        Values for the placeholders in the locators
 
     Returns
     -------
-    None
+    element: selenium.webdriver.remote.webelement.WebElement or list
     """
 
-    logger = logging.getLogger("bi_team")
+    locators = _locators(name, **params)
 
-    # logger.debug("_locate_grid_canvas_right")
-    # grid_canvas_right = _locate_grid_canvas_right(wait)
+    for position, locator in enumerate(locators):
+        elements = parent.find_elements(*locator)
+        if elements:
+            if position:
+                _report_fallback(name, position)
+            return elements if many else elements[0]
 
-    logger.debug("locate bi team")
-    # locate bi team
-    bi_team_ = grid_canvas_right.find_element_by_css_selector(
-        "div"
-        "> div:nth-child(2)"
-    )
+    if many:
+        return []
 
-    logger.debug("click it")
-    # click it
-    bi_team_.click()
+    # raise the usual NoSuchElementException for the primary locator
+    return parent.find_element(*locators[0])
 
-    logger.debug("sleep(1)")
-    sleep(1)
 
-    logger.debug("_click_enter")
-    _click_enter(driver)
+def _forget_elements(driver):
+    """
+    Drop the elements cached for `driver`, after it has navigated
 
-    logger.debug("locate bi team selector")
-    # locate bi team selector
-    bi_team_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, f"//*[text()='{bi_team_name}']")
-        )
-    )
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
 
-    logger.debug(f"click {bi_team_name}")
-    # click <option>
-    bi_team_selector.click()
+    Returns
+    -------
+    None
+    """
+
+    _ELEMENT_CACHE.pop(driver.session_id, None)
 
-    logger.debug("return None")
     return None
 
 
-def work_and_assignments(wait, driver, bi_assignment_owner_name, bi_team_name):
+# every option of the <select> holding arguments[0], by value or visible text
+_HARVEST_OPTIONS_SCRIPT = """
+var select = arguments[0].closest("select");
+var attribute = arguments[1];
+if (!select) return null;
+return Array.from(select.options, function (option) {
+  return attribute === "text" ? option.text.trim() : option.value;
+}).filter(function (value) { return value !== ""; });
+"""
+
+
+def _harvest_picklist(option, name, attribute="value"):
     """
-    Execute `enter_status_flag`, `bi_assignment_owner` and `bi_team` functions
+    Snapshot the options next to `option` into `PICKLIST_CACHE`, unless
+    that picklist's snapshot is still fresh
+
+    Never fails the step it is called from.
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
-
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    option: selenium.webdriver.remote.webelement.WebElement
+        An option the step has just located
 
-    bi_assignment_owner_name: str
-        Name of BI Assignment Owner
+    name: str
+        Key of `PICKLIST_FIELDS`
 
-    bi_team_name: str
-        Name of BI Team
+    attribute: str
+        "value" or "text", whichever the step picks options by
 
     Returns
     -------
-
+    None
     """
 
-    logger = logging.getLogger("work_and_assignments")
+    if PICKLIST_CACHE.get(name) is not None:
+        return None
 
-    logger.debug("_locate_grid_canvas_right")
-    grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+    try:
+        values = option.parent.execute_script(_HARVEST_OPTIONS_SCRIPT, option, attribute)
+    except WebDriverException as e:
+        logging.getLogger("_harvest_picklist").debug("cannot read %s options: %r", name, e)
+        return None
 
-    enter_status_flag(wait, driver, grid_canvas_right)
+    if values:
+        PICKLIST_CACHE.put(name, values)
 
-    bi_assignment_owner(wait, driver, grid_canvas_right, bi_assignment_owner_name)
+    return None
 
-    bi_team(wait, driver, grid_canvas_right, bi_team_name)
 
-    return None
+# one record per step call: {"row": ..., "step": ..., "seconds": ..., "ok": ...}
+STEP_METRICS = []
 
+# list the current thread's step calls are recorded in, None to not record
+# them; set it to keep one job's records apart, `run_rows` hands it on to
+# its workers
+_step_metrics = contextvars.ContextVar("step_metrics", default=STEP_METRICS)
 
-def _locate_grid_canvas_left(wait):
+# index of the ProjectBook row the current thread is working on
+_current_row = contextvars.ContextVar("current_row", default=None)
+
+# step function the current thread is in
+_current_step = contextvars.ContextVar("current_step", default=None)
+
+
+def _timed(step_function):
     """
-    Locates the grid canvas left and returns it
+    Decorator that records the duration of every call of a step function in
+    `STEP_METRICS` (or the current `_step_metrics`), tagged with the current row
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    step_function: callable
+        A step function such as `new_work_page1`
 
     Returns
     -------
-    grid_canvas_left: selenium.webdriver.remote.webelement.WebElement
+    wrapper: callable
     """
 
-    logger = logging.getLogger("_locate_grid_canvas_left")
+    step = step_function.__name__
+
+    @functools.wraps(step_function)
+    def _wrapper(*args, **kwargs):
+        start = perf_counter()
+        ok = False
+        token = _current_step.set(step)
+        try:
+            result = step_function(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            _current_step.reset(token)
+            metrics = _step_metrics.get()
+            if metrics is not None:
+                metrics.append(
+                    {
+                        "row": _current_row.get(),
+                        "step": step,
+                        "seconds": perf_counter() - start,
+                        "ok": ok,
+                    }
+                )
+
+    return _wrapper
+
+
+# where the log pipeline writes and when it rotates; see `configure_logging`
+LOG_SETTINGS = {
+    "path": os.path.join("Logs", "PRM_log.jsonl"),
+    "level": logging.INFO,
+    "rotate": "daily",
+    "max_bytes": 10 * 2 ** 20,
+    "backups": 14,
+    "console": True,
+}
+
+# the running listener, stopped (and its queue drained) at exit
+_LOG_LISTENER = None
+
+
+class _RowContext(logging.Filter):
+    """Tags each record with the row and step of the thread that logged it"""
+
+    def filter(self, record):
+        record.row = _current_row.get()
+        record.step = _current_step.get()
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on the queue untouched
 
-    logger.debug("locate grid canvas right")
-    # locate grid canvas right
-    grid_canvas_left = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "div[class='grid-canvas grid-canvas-top grid-canvas-left']")
-        )
-    )
+    `QueueHandler.prepare` formats the message on the logging thread; here
+    that is left to the listener, so the thread driving the browser only
+    pays for the `put`.
+    """
 
-    logger.debug("return grid_canvas_left")
-    return grid_canvas_left
+    def prepare(self, record):
+        return record
 
 
-def _hover(driver, element):
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, with the row and step it was logged from"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "row": getattr(record, "row", None),
+            "step": getattr(record, "step", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(**settings):
     """
-    Tells driver to hover over element
+    Send every log record through a queue to a background writer
+
+    Callers only tag the record and put it on an unbounded queue; a
+    `QueueListener` thread formats it as a JSON line, writes it to a
+    rotating file and echoes it to the terminal. Replaces the root logger's
+    handlers, so it can be called again to change settings.
 
     Parameters
     ----------
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
-
-    element: selenium.webdriver.remote.webelement.WebElement
-        Element to hover over
+    settings:
+        Keys of `LOG_SETTINGS`; "rotate" is "daily" (at midnight) or
+        "size" (at "max_bytes")
 
     Returns
     -------
-    None
+    listener: logging.handlers.QueueListener
     """
 
-    logger = logging.getLogger("_hover")
+    global _LOG_LISTENER
 
-    logger.debug("define action chain")
-    # define action chain
-    actions = ActionChains(driver=driver)
+    unknown = set(settings) - set(LOG_SETTINGS)
+    if unknown:
+        raise ValueError(f"unknown log settings: {sorted(unknown)}")
+    if settings.get("rotate", LOG_SETTINGS["rotate"]) not in ("daily", "size"):
+        raise ValueError(f"rotate must be 'daily' or 'size', not {settings['rotate']!r}")
+    LOG_SETTINGS.update(settings)
 
-    logger.debug("hover over assignments button")
-    # hover over assignments button
-    actions.move_to_element(element)
-    actions.perform()
+    path = LOG_SETTINGS["path"]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if LOG_SETTINGS["rotate"] == "daily":
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            path, when="midnight", backupCount=LOG_SETTINGS["backups"], encoding="utf-8"
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_SETTINGS["max_bytes"], backupCount=LOG_SETTINGS["backups"], encoding="utf-8"
+        )
+    file_handler.setFormatter(JsonLinesFormatter())
+    handlers = [file_handler]
+
+    if LOG_SETTINGS["console"]:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        handlers.append(console_handler)
+
+    _stop_logging()
+
+    records = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(records)
+    queue_handler.addFilter(_RowContext())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_SETTINGS["level"])
+
+    _LOG_LISTENER = logging.handlers.QueueListener(records, *handlers)
+    _LOG_LISTENER.start()
+
+    return _LOG_LISTENER
+
+
+@atexit.register
+def _stop_logging():
+    """Write out whatever is still queued and close the log file"""
+
+    global _LOG_LISTENER
+
+    if _LOG_LISTENER is not None:
+        _LOG_LISTENER.stop()
+        for handler in _LOG_LISTENER.handlers:
+            handler.close()
+        _LOG_LISTENER = None
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, _DeferredQueueHandler):
+            root.removeHandler(handler)
 
-    logger.debug("return None")
     return None
 
 
-def open_resource_search_window(wait, driver):
+def _percentile(values, q):
     """
-    Open Resource Search window
+    Nearest-rank percentile
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    values: list
+        Numbers to take the percentile of
 
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    q: float
+        Percentile between 0 and 100
 
     Returns
     -------
-    None
+    percentile: float
     """
 
-    logger = logging.getLogger("open_resource_search_window")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
 
-    logger.debug("_locate_grid_canvas_left")
-    grid_canvas_left = _locate_grid_canvas_left(wait)
+    return ordered[rank - 1]
 
-    logger.debug("locate analysis and solution development action button")
-    # locate analysis and solution development action button
-    analysis_and_solution_development_action_button = grid_canvas_left.find_element_by_css_selector(
-        "div:last-of-type"
-        "> div"
-        "> div[class='ActionLinkButton'][title='Actions']"
-    )
 
-    logger.debug("click button")
-    # click button
-    analysis_and_solution_development_action_button.click()
+def write_metrics(metrics, path):
+    """
+    Append step metrics to a JSON-lines file
 
-    logger.debug("locate assignments button")
-    # locate assignments button
-    assignments_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='Assignments']")
-        )
-    )
+    Parameters
+    ----------
+    metrics: list
+        Records from `STEP_METRICS`
 
-    logger.debug("_hover")
-    _hover(driver, assignments_button)
+    path: str
+        File to append to; every run of the day adds to the same one
 
-    logger.debug("locate new allocation button")
-    # locate new allocation button
-    new_allocation_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='New Allocation']")
-        )
-    )
+    Returns
+    -------
+    None
+    """
 
-    logger.debug("click it")
-    # click it
-    new_allocation_button.click()
+    with open(path, "a") as f:
+        for record in metrics:
+            f.write(json.dumps(record) + "\n")
 
-    logger.debug("return None")
     return None
 
 
-def allocate(driver, wait, resource):
+def report_metrics(metrics, rows_completed, wall_seconds):
     """
-    Allocate a resource.
+    Log throughput and p50/p95/max duration of every step
 
     Parameters
     ----------
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    metrics: list
+        Records from `STEP_METRICS`
 
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    rows_completed: int
+        Rows that made it through every step
 
-    resource: str
-        Resource to allocate
+    wall_seconds: float
+        Elapsed time for the whole run
 
     Returns
     -------
     None
     """
 
-    logger = logging.getLogger("allocate")
+    logger = logging.getLogger(__name__)
 
-    logger.debug("get resource search window handle")
-    # get resource search window handle
-    resource_search_window = driver.window_handles[-1]
+    rows_per_hour = rows_completed / wall_seconds * 3600 if wall_seconds else 0.0
+    logger.info("%s rows in %.1fs (%.1f rows/hour)", rows_completed, wall_seconds, rows_per_hour)
 
-    logger.debug("switch to resource window")
-    # switch to resource window
-    driver.switch_to.window(resource_search_window)
+    durations = {}
+    for record in metrics:
+        durations.setdefault(record["step"], []).append(record["seconds"])
 
-    logger.debug("locate search view frame")
-    # locate search view frame
-    search_view_frame = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "iframe[name='iframeSearchView']")
+    logger.info("step                              n     p50     p95     max")
+    for step, seconds in durations.items():
+        logger.info(
+            "%-30s %4s %7.2f %7.2f %7.2f",
+            step, len(seconds), _percentile(seconds, 50), _percentile(seconds, 95), max(seconds)
         )
-    )
 
-    logger.debug("switch to search view frame")
-    # switch to search view frame
-    driver.switch_to.frame(search_view_frame)
+    return None
 
-    logger.debug("locate search attributes frame")
-    # locate search attributes frame
-    search_attributes_frame = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "frame[id='frameAttributes']")
-        )
-    )
 
-    logger.debug("switch to search attributes frame")
-    # switch to search attributes frame
-    driver.switch_to.frame(search_attributes_frame)
+# where PRM lives; point it somewhere else (e.g. the local stand-in in
+# planview_stub.py) with `configure_base_url`
+BASE_URL = "https://ukhs.pvcloud.com"
+NEW_WORK_PATH = "/planview/ConfiguredScreens/ConfiguredScreen.aspx?sid=CfgDef$WDT&mode=RW&popup=1&back=close"
+NEW_WORK_URL = BASE_URL + NEW_WORK_PATH
 
-    logger.debug("locate description input")
-    # locate description input
-    description_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[id='attribute_description']")
-        )
-    )
 
-    logger.debug(f"type {resource}")
+def configure_base_url(base_url):
+    """
+    Run against another Planview host
+
+    Parameters
+    ----------
+    base_url: str
+        Scheme and host, e.g. "http://127.0.0.1:8765"
+
+    Returns
+    -------
+    None
+    """
+
+    global BASE_URL, NEW_WORK_URL
+
+    BASE_URL = base_url.rstrip("/")
+    NEW_WORK_URL = BASE_URL + NEW_WORK_PATH
+
+    return None
+
+
+def check_url(driver):
+    """"""
+
+    return driver.current_url == NEW_WORK_URL
+
+
+def _enter_credentials(wait):
+    """
+    Fill in and submit the log-in form
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_enter_credentials")
+
+    logger.debug("locate user name input")
+    # locate user name input
+    user_name_input = _locate(wait, "login.email")
+
+    logger.debug("type user name")
+    # type user name
+    # user_name_input.send_keys(os.getenv("user"))
+    user_name_input.send_keys(os.getenv("email"))
+
+    logger.debug("click 'Next'")
+    # click "Next"
+    next_button = _locate(wait, "login.next")
+    next_button.click()
+
+    logger.debug("locate password input")
+    # locate password input
+    password_input = _locate(wait, "login.password")
+
+    logger.debug("type password")
+    # type password
+    password_input.send_keys(os.getenv("pass"))
+
+    logger.debug("locate submit button")
+    # locate submit button
+    submit_button = _locate(wait, "login.submit")
+
+    logger.debug("click button")
+    # click button
+    submit_button.click()
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def login(driver, wait):
+    """
+    Log-in to PRM
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("login")
+
+    logger.debug("navigate to new work page")
+    # navigate to new work page
+    driver.get(NEW_WORK_URL)
+
+    logger.debug("wait for new work page or log-in form")
+    # wait for new work page or log-in form
+    _wait_until(wait, _any_of(_url_is(NEW_WORK_URL), _located("login.email")), ceiling="page")
+
+    if not check_url(driver):
+        logger.debug("_enter_credentials")
+        _enter_credentials(wait)
+
+    logger.debug("return None")
+    return None
+
+
+class PlanviewSession:
+    """
+    Keeps one browser logged in to PRM across rows
+
+    The credential form is only filled in when PRM redirects the New Work
+    page to it, i.e. on the first row and whenever the session has expired.
+    Every other row goes straight to the New Work screen.
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+    """
+
+    def __init__(self, driver, wait):
+        self.driver = driver
+        self.wait = wait
+
+        # number of times the credential form has been submitted
+        self.logins = 0
+
+        # the tab the current row runs in and every row tab, when
+        # `run_pipeline` keeps several rows open at once; None/() otherwise
+        self.tab = None
+        self.tabs = ()
+
+        # the last few steps' snapshots, written out by `capture_failure`
+        self.snapshots = deque(maxlen=FAILURE_CAPTURE["snapshots"])
+
+    def _on_page_or_login_form(self, url):
+        """
+        Wait until the last navigation has landed on either `url` or the
+        log-in form, and say which
+
+        Parameters
+        ----------
+        url: str
+            The page that was asked for
+
+        Returns
+        -------
+        on_page: bool
+        """
+
+        _wait_until(self.wait, _any_of(_url_is(url), _located("login.email")), ceiling="page")
+
+        return self.driver.current_url == url
+
+    @_timed
+    def authenticate(self, url=None):
+        """
+        Submit the log-in form and wait to be sent back to the page that was
+        asked for
+
+        Parameters
+        ----------
+        url: str, optional
+            The page PRM should redirect to once logged in, defaults to the
+            New Work page
+
+        Returns
+        -------
+        None
+        """
+
+        logger = logging.getLogger("PlanviewSession.authenticate")
+
+        logger.info("log in")
+        _enter_credentials(self.wait)
+        self.logins += 1
+
+        logger.debug("wait for redirect")
+        # wait for redirect
+        _wait_until(self.wait, _url_is(url or NEW_WORK_URL), ceiling="page")
+
+        logger.debug("return None")
+        return None
+
+    def open(self, url):
+        """
+        Open `url`, logging in first only if PRM asks for it
+
+        Parameters
+        ----------
+        url: str
+            Page to open
+
+        Returns
+        -------
+        None
+        """
+
+        logger = logging.getLogger("PlanviewSession.open")
+
+        logger.debug("navigate to %s", url)
+        # navigate to <url>
+        self.driver.get(url)
+        _forget_elements(self.driver)
+
+        if not self._on_page_or_login_form(url):
+            if self.logins:
+                logger.info("session expired")
+            self.authenticate(url)
+
+        logger.debug("return None")
+        return None
+
+    @_timed
+    def open_new_work(self):
+        """
+        Open the New Work screen, logging in first only if PRM asks for it
+
+        Returns
+        -------
+        None
+        """
+
+        return self.open(NEW_WORK_URL)
+
+
+def _save_new_work_page1(wait):
+    """
+    Click "Save" on the first "New Work" page
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_save_new_work_page1")
+
+    logger.debug("locate save button")
+    # locate save button
+    save_button = _locate(wait, "page1.save", condition=EC.element_to_be_clickable, ceiling="input")
+
+    logger.debug("click button")
+    # click button
+    save_button.click()
+    _forget_elements(wait.driver)
+
+    logger.debug("return None")
+    return None
+
+
+def _complete_new_work_page2(wait):
+    """
+    Click "Save and Complete" on the second "New Work" page and open Work and
+    Assignments from the Actions menu
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_complete_new_work_page2")
+
+    logger.debug("locate save and complete button")
+    # locate save and complete button
+    save_and_complete_button = _locate(wait, "page2.save_and_complete")
+
+    logger.debug("click button")
+    # click button
+    save_and_complete_button.click()
+
+    logger.debug("_open_work_and_assignments")
+    _open_work_and_assignments(wait)
+
+    logger.debug("return None")
+    return None
+
+
+def _open_work_and_assignments(wait):
+    """
+    Open Work and Assignments from the Actions menu of a completed "New
+    Work" page
+
+    Also how a retried `new_work_page2` carries on once Save and Complete
+    has gone through, see `ROW_STATES`.
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_open_work_and_assignments")
+
+    logger.debug("locate action menu button")
+    # locate action menu button
+    action_menu_button = _locate(wait, "page2.actions")
+
+    logger.debug("click button")
+    # click button
+    action_menu_button.click()
+
+    logger.debug("locate work and assignments button")
+    # locate work and assignments button
+    work_and_assignments_button = _locate(wait, "page2.work_and_assignments")
+
+    logger.debug("click button")
+    # click button
+    work_and_assignments_button.click()
+    _forget_elements(wait.driver)
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def new_work_page1(wait, today_str, description):
+    """
+    Fill in fields on first "New Work" page
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    description: str
+        Description/Name of project
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("new_work_page1")
+
+    logger.debug("_enter_new_work_page1")
+    _enter_new_work_page1(wait, today_str, description)
+
+    logger.debug("_save_new_work_page1")
+    _save_new_work_page1(wait)
+
+    logger.debug("return None")
+    return None
+
+
+def _enter_new_work_page1(wait, today_str, description, skip=frozenset()):
+    """
+    Enter the fields of the first "New Work" page one at a time
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    description: str
+        Description/Name of project
+
+    skip: set
+        `LOCATORS` keys of fields that already hold their value, e.g. set by
+        `new_work_page1_fast`
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_enter_new_work_page1")
+
+    if "page1.workstream" not in skip:
+        logger.debug("locate workstream input")
+        # locate workstream input
+        workstream_input = _locate(wait, "page1.workstream")
+
+        logger.debug("type Business Intelligence")
+        # type "Business Intelligence"
+        workstream_input.send_keys("Business Intelligence")
+
+    if "page1.description" not in skip:
+        logger.debug("locate description input")
+        # locate description input
+        description_input = _locate(wait, "page1.description")
+
+        logger.debug("type %s", description)
+        # type <name of project>
+        description_input.send_keys(f"{description}")
+
+    if "page1.work_type" not in skip:
+        logger.debug("locate work type selector")
+        # locate work type selector
+        work_type_selector = _locate(wait, "page1.work_type")
+
+        logger.debug("click <option>")
+        # click <option>
+        work_type_selector.click()
+
+    if "page1.requested_start" not in skip:
+        logger.debug("locate requested start input")
+        # locate requested start input
+        requested_start_input = _locate(wait, "page1.requested_start", condition=EC.element_to_be_clickable, ceiling="input")
+
+        logger.debug("type %s", today_str)
+        # type <date>
+        requested_start_input.send_keys(today_str)
+
+        logger.debug("wait for requested start to take the date")
+        # wait for requested start to take the date
+        _wait_until(wait, _element_has_value(requested_start_input, today_str), ceiling="input", required=False)
+
+    if "page1.requested_finish" not in skip:
+        logger.debug("locate requested finish input")
+        # locate requested finish input
+        requested_finish_input = _locate(wait, "page1.requested_finish", condition=EC.element_to_be_clickable, ceiling="input")
+
+        logger.debug("get end_of_month_str")
+        # get end_of_month_str
+        end_of_month_str = _get_end_of_month(today_str)
+
+        logger.debug("type %s", end_of_month_str)
+        # type <date>
+        requested_finish_input.send_keys(end_of_month_str)
+
+        logger.debug("wait for requested finish to take the date")
+        # wait for requested finish to take the date
+        _wait_until(wait, _element_has_value(requested_finish_input, end_of_month_str), ceiling="input", required=False)
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def new_work_page2(wait, today_str, bi_service_name):
+    """
+    Fill in fields on second "New Work" page
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    bi_service_name: str
+        Name of BI Service
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("new_work_page2")
+
+    logger.debug("_enter_new_work_page2")
+    _enter_new_work_page2(wait, today_str, bi_service_name)
+
+    logger.debug("_complete_new_work_page2")
+    _complete_new_work_page2(wait)
+
+    logger.debug("return None")
+    return None
+
+
+def _enter_new_work_page2(wait, today_str, bi_service_name, skip=frozenset()):
+    """
+    Enter the fields of the second "New Work" page one at a time
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    bi_service_name: str
+        Name of BI Service
+
+    skip: set
+        `LOCATORS` keys of fields that already hold their value, e.g. set by
+        `new_work_page2_fast`
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_enter_new_work_page2")
+
+    if "page2.bi_service_name" not in skip:
+        logger.debug("locate bi service name selector")
+        # locate bi service name selector
+        bi_service_name_selector = _locate(wait, "page2.bi_service_name", bi_service_name=bi_service_name)
+        _harvest_picklist(bi_service_name_selector, "bi_service_name", "text")
+
+        logger.debug("click %s", bi_service_name)
+        # click <option>
+        bi_service_name_selector.click()
+
+    if "page2.bi_scoped_date" not in skip:
+        logger.debug("locate bi scoped date input")
+        # locate bi scoped date input
+        bi_scoped_date_input = _locate(wait, "page2.bi_scoped_date")
+
+        logger.debug("type %s", today_str)
+        # type <date>
+        bi_scoped_date_input.send_keys(today_str)
+
+    if "page2.bi_date_created" not in skip:
+        logger.debug("locate bi date approved input")
+        # locate bi date approved input
+        bi_date_approved_input = _locate(wait, "page2.bi_date_created")
+
+        logger.debug("type %s", today_str)
+        # type <date>
+        bi_date_approved_input.send_keys(today_str)
+
+    logger.debug("return None")
+    return None
+
+
+# finds a field ({"name", "locators", "value"}, from `_field`) by trying its
+# locators in order inside the page, with no round trip per locator; sets
+# `field.matched` to the index of the locator that matched
+_LOCATE_FIELD_JS = """
+function locate(field) {
+  for (var i = 0; i < field.locators.length; i++) {
+    var by = field.locators[i][0], selector = field.locators[i][1];
+    var element = by === "css selector"
+      ? document.querySelector(selector)
+      : document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (element) {
+      field.matched = i;
+      return element;
+    }
+  }
+  return null;
+}
+"""
+
+# Sets every field in one round trip for `_fill_fields`: an <option> is
+# selected, an input or textarea is typed into with the events a user's
+# typing would fire, anything else is clicked. Reports, per field, which
+# locator matched, what was done ("selected", "typed", "clicked" or null if
+# nothing matched) and what the element reads back afterwards.
+_FILL_FIELDS_SCRIPT = _LOCATE_FIELD_JS + """
+var fields = arguments[0];
+
+function fire(element, type) {
+  element.dispatchEvent(new Event(type, {bubbles: true}));
+}
+
+return fields.map(function (field) {
+  var element = locate(field);
+  if (!element) return {matched: null, action: null, value: null};
+
+  if (element.tagName === "OPTION") {
+    element.selected = true;
+    fire(element.parentElement, "change");
+    var selected = element.parentElement.options[element.parentElement.selectedIndex];
+    return {
+      matched: field.matched,
+      action: "selected",
+      value: selected ? (selected.value === field.value ? selected.value : selected.text.trim()) : null
+    };
+  }
+
+  if (element.tagName !== "INPUT" && element.tagName !== "TEXTAREA") {
+    element.click();
+    // a clicked choice only counts once the page marks it as chosen
+    var option = element.closest("option");
+    var chosen = option ? option.selected
+      : element.getAttribute("aria-selected") === "true"
+        || element.classList.contains("selected")
+        || element.classList.contains("active");
+    return {matched: field.matched, action: "clicked", value: chosen ? element.textContent.trim() : null};
+  }
+
+  // use the native setter so framework-bound inputs notice the change
+  var prototype = element.tagName === "INPUT" ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+  Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, field.value);
+
+  element.focus();
+  fire(element, "input");
+  fire(element, "keyup");
+  fire(element, "change");
+  element.blur();
+  fire(element, "blur");
+
+  return {matched: field.matched, action: "typed", value: element.value};
+});
+"""
+
+
+def _field(name, value, **params):
+    """
+    Describe one field for `_fill_fields`; the page script tries the
+    locators of `name` in order
+
+    Parameters
+    ----------
+    name: str
+        Key of `LOCATORS`
+
+    value: str
+        Value the field should end up with
+
+    **params:
+        Values for the placeholders in the locators
+
+    Returns
+    -------
+    field: dict
+    """
+
+    return {"name": name, "locators": [list(locator) for locator in _locators(name, **params)], "value": value}
+
+
+def _fill_fields(driver, fields):
+    """
+    Fill several fields with one script execution and confirm they took
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    fields: list
+        Output of `_field` for each field to set
+
+    Returns
+    -------
+    unfilled: list
+        The fields that were not found or do not read back the value they
+        were given; a clicked element that the page does not mark as chosen
+        is only warned about, as clicking it again could undo it
+    """
+
+    logger = logging.getLogger("_fill_fields")
+
+    logger.debug("fill %s field(s)", len(fields))
+    # fill fields
+    reports = driver.execute_script(_FILL_FIELDS_SCRIPT, fields)
+
+    unfilled = []
+    mismatched = []
+    for field, report in zip(fields, reports):
+        if report["matched"]:
+            _report_fallback(field["name"], report["matched"])
+        if report["value"] != field["value"]:
+            mismatched.append(
+                f"{field['name']} ({report['action'] or 'not found'}, reads {report['value']!r})"
+            )
+            if report["action"] != "clicked":
+                unfilled.append(field)
+    if mismatched:
+        logger.warning("fields did not take their values: %s", "; ".join(mismatched))
+
+    return unfilled
+
+
+def _clear_fields(driver, fields):
+    """
+    Empty the text inputs among `fields` so the per-field path starts clean
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    fields: list
+        Dicts as passed to `_fill_fields`
+
+    Returns
+    -------
+    None
+    """
+
+    driver.execute_script(
+        _LOCATE_FIELD_JS + """
+        arguments[0].forEach(function (field) {
+          var element = locate(field);
+          if (element && (element.tagName === "INPUT" || element.tagName === "TEXTAREA")) element.value = "";
+        });
+        """,
+        fields
+    )
+
+    return None
+
+
+@_timed
+def new_work_page1_fast(driver, wait, today_str, description):
+    """
+    Fill in the first "New Work" page with one script execution, entering
+    any field that does not take its value one at a time
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    description: str
+        Description/Name of project
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("new_work_page1_fast")
+
+    logger.debug("wait for the page to load")
+    # wait for the page to load
+    _locate(wait, "page1.requested_finish", ceiling="page")
+    _wait_until(wait, _page_is_ready(), ceiling="page")
+
+    fields = [
+        _field("page1.workstream", "Business Intelligence"),
+        _field("page1.description", f"{description}"),
+        _field("page1.work_type", "3036594"),
+        _field("page1.requested_start", today_str),
+        _field("page1.requested_finish", _get_end_of_month(today_str)),
+    ]
+
+    unfilled = _fill_fields(driver, fields)
+    if unfilled:
+        logger.info("enter %s field(s) one at a time", len(unfilled))
+        _clear_fields(driver, unfilled)
+        _enter_new_work_page1(
+            wait,
+            today_str,
+            description,
+            skip={field["name"] for field in fields if field not in unfilled}
+        )
+
+    logger.debug("_save_new_work_page1")
+    _save_new_work_page1(wait)
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def new_work_page2_fast(driver, wait, today_str, bi_service_name):
+    """
+    Fill in the second "New Work" page with one script execution, entering
+    any field that does not take its value one at a time
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    bi_service_name: str
+        Name of BI Service
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("new_work_page2_fast")
+
+    logger.debug("wait for the page to load")
+    # wait for the page to load
+    _locate(wait, "page2.bi_date_created", ceiling="page")
+    _wait_until(wait, _page_is_ready(), ceiling="page")
+
+    fields = [
+        _field("page2.bi_service_name", bi_service_name, bi_service_name=bi_service_name),
+        _field("page2.bi_scoped_date", today_str),
+        _field("page2.bi_date_created", today_str),
+    ]
+
+    unfilled = _fill_fields(driver, fields)
+    if unfilled:
+        logger.info("enter %s field(s) one at a time", len(unfilled))
+        _clear_fields(driver, unfilled)
+        _enter_new_work_page2(
+            wait,
+            today_str,
+            bi_service_name,
+            skip={field["name"] for field in fields if field not in unfilled}
+        )
+
+    logger.debug("_complete_new_work_page2")
+    _complete_new_work_page2(wait)
+
+    logger.debug("return None")
+    return None
+
+
+def _locate_grid_canvas_right(wait):
+    """
+    Locates the grid canvas right and returns it
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
+    """
+
+    logger = logging.getLogger("_locate_grid_canvas_right")
+
+    logger.debug("locate grid canvas right")
+    # locate grid canvas right
+    grid_canvas_right = _locate(wait, "grid.right", cache=True)
+
+    logger.debug("return grid_canvas_right")
+    return grid_canvas_right
+
+
+def _click_enter(driver):
+    """
+    Tells driver to click ENTER key
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_click_enter")
+
+    logger.debug("define action chain")
+    # define action chain
+    actions = ActionChains(driver=driver)
+
+    logger.debug("click ENTER")
+    # click ENTER
+    actions.send_keys(Keys.ENTER)
+    actions.perform()
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def enter_status_flag(wait, driver, grid_canvas_right):
+    """
+    Locates "Enter Status Flag" and changes it from "No" to "Yes"
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
+        Location of grid on work and assignments page
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("enter_status_flag")
+
+    # logger.debug("_locate_grid_canvas_right")
+    # grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+
+    logger.debug("locate enter status flag")
+    # locate enter status flag
+    enter_status_flag_ = _find(grid_canvas_right, "grid.first_row")
+
+    logger.debug("find tag with text = No")
+    # find tag with text = "No"
+    enter_status_flag_ = _find(enter_status_flag_, "grid.status_flag_no")
+
+    logger.debug("click it")
+    # click it
+    enter_status_flag_.click()
+
+    logger.debug("_click_enter")
+    _click_enter(driver)
+
+    logger.debug("locate the enter status flag selector")
+    # locate the enter status flag selector
+    enter_status_flag_selector = _locate(wait, "grid.status_flag_yes")
+
+    logger.debug("click <option>")
+    # click <option>
+    enter_status_flag_selector.click()
+
+    logger.debug("wait for Yes to be selected")
+    # wait for "Yes" to be selected
+    _wait_until(wait, EC.element_to_be_selected(enter_status_flag_selector), ceiling="picker", required=False)
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def bi_assignment_owner(wait, driver, grid_canvas_right, bi_assignment_owner_name):
+    """
+    Locate "BI Assignment Owner" field and select option
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
+        Location of grid on work and assignments page
+
+    bi_assignment_owner_name: str
+        Name of BI Assignment Owner
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("bi_assignment_owner")
+
+    # logger.debug("_locate_grid_canvas_right")
+    # grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+
+    logger.debug("locate the bi assignment owner")
+    # locate the bi assignment owner  # **Analysis and Solution Development**
+    bi_assignment_owner_ = _find(grid_canvas_right, "grid.bi_assignment_owner_cells", many=True)[-1]
+
+    logger.debug("click it")
+    # click it
+    bi_assignment_owner_.click()
+
+    logger.debug("wait for cell to become active")
+    # wait for cell to become active
+    _wait_until(wait, _element_has_class(bi_assignment_owner_, "active"), ceiling="picker", required=False)
+
+    logger.debug("_click_enter")
+    _click_enter(driver)
+
+    logger.debug("locate bi assignment owner selector")
+    # locate bi assignment owner selector
+    bi_assignment_owner_selector = _locate(wait, "grid.bi_assignment_owner_option", bi_assignment_owner_name=bi_assignment_owner_name)
+    _harvest_picklist(bi_assignment_owner_selector, "bi_assignment_owner")
+
+    logger.debug("click %s", bi_assignment_owner_name)
+    # click <option>
+    bi_assignment_owner_selector.click()
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def bi_team(wait, driver, grid_canvas_right, bi_team_name):
+    """
+    Locate "BI Team" field and select option
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    grid_canvas_right: selenium.webdriver.remote.webelement.WebElement
+        Location of grid on work and assignments page
+
+    bi_team_name: str
+        Name of BI Team
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("bi_team")
+
+    # logger.debug("_locate_grid_canvas_right")
+    # grid_canvas_right = _locate_grid_canvas_right(wait)
+
+    logger.debug("locate bi team")
+    # locate bi team
+    bi_team_ = _find(grid_canvas_right, "grid.bi_team_cell")
+
+    logger.debug("click it")
+    # click it
+    bi_team_.click()
+
+    logger.debug("wait for cell to become active")
+    # wait for cell to become active
+    _wait_until(wait, _element_has_class(bi_team_, "active"), ceiling="picker", required=False)
+
+    logger.debug("_click_enter")
+    _click_enter(driver)
+
+    logger.debug("locate bi team selector")
+    # locate bi team selector
+    bi_team_selector = _locate(wait, "grid.bi_team_option", bi_team_name=bi_team_name)
+    _harvest_picklist(bi_team_selector, "bi_team", "text")
+
+    logger.debug("click %s", bi_team_name)
+    # click <option>
+    bi_team_selector.click()
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def work_and_assignments(wait, driver, bi_assignment_owner_name, bi_team_name):
+    """
+    Execute `enter_status_flag`, `bi_assignment_owner` and `bi_team` functions
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    bi_assignment_owner_name: str
+        Name of BI Assignment Owner
+
+    bi_team_name: str
+        Name of BI Team
+
+    Returns
+    -------
+
+    """
+
+    logger = logging.getLogger("work_and_assignments")
+
+    logger.debug("_locate_grid_canvas_right")
+    grid_canvas_right = _locate_grid_canvas_right(wait=wait)
+
+    enter_status_flag(wait, driver, grid_canvas_right)
+
+    bi_assignment_owner(wait, driver, grid_canvas_right, bi_assignment_owner_name)
+
+    bi_team(wait, driver, grid_canvas_right, bi_team_name)
+
+    logger.debug("commit the open editor")
+    # commit the open editor; the grid only saves a cell once another one is
+    # activated, so until then the BI Team choice exists only in the browser
+    _find(grid_canvas_right, "grid.commit_cell").click()
+
+    logger.debug("wait for the commit")
+    # wait for the cell to show the choice and for its save request
+    _wait_until(wait, _cell_is_committed(grid_canvas_right, "grid.bi_team_cell", bi_team_name), ceiling="save")
+    _wait_until(wait, _network_is_idle(), ceiling="save", required=False)
+
+    return None
+
+
+def _cell_is_committed(grid_canvas, name, text):
+    """
+    Condition that holds once the grid cell `name` has closed its editor and
+    shows `text`
+
+    Returns
+    -------
+    condition: callable
+    """
+
+    def _predicate(driver):
+        cell = _find(grid_canvas, name)
+        return not cell.find_elements(By.CSS_SELECTOR, "select") and cell.text.strip() == text
+
+    return _predicate
+
+
+def _locate_grid_canvas_left(wait):
+    """
+    Locates the grid canvas left and returns it
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    Returns
+    -------
+    grid_canvas_left: selenium.webdriver.remote.webelement.WebElement
+    """
+
+    logger = logging.getLogger("_locate_grid_canvas_left")
+
+    logger.debug("locate grid canvas right")
+    # locate grid canvas right
+    grid_canvas_left = _locate(wait, "grid.left", cache=True)
+
+    logger.debug("return grid_canvas_left")
+    return grid_canvas_left
+
+
+def _scroll_into_view(driver, element):
+    """
+    Scroll `element` to the middle of the viewport
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    element: selenium.webdriver.remote.webelement.WebElement
+        Element to scroll to
+
+    Returns
+    -------
+    None
+    """
+
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", element)
+
+    return None
+
+
+def _hover(driver, element):
+    """
+    Tells driver to hover over element
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    element: selenium.webdriver.remote.webelement.WebElement
+        Element to hover over
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_hover")
+
+    logger.debug("scroll element into view")
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, element)
+
+    logger.debug("define action chain")
+    # define action chain
+    actions = ActionChains(driver=driver)
+
+    logger.debug("hover over assignments button")
+    # hover over assignments button
+    actions.move_to_element(element)
+    actions.perform()
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def open_resource_search_window(wait, driver):
+    """
+    Open Resource Search window
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("open_resource_search_window")
+
+    logger.debug("_locate_grid_canvas_left")
+    grid_canvas_left = _locate_grid_canvas_left(wait)
+
+    logger.debug("locate analysis and solution development action button")
+    # locate analysis and solution development action button
+    analysis_and_solution_development_action_button = _find(grid_canvas_left, "grid.row_actions")
+
+    logger.debug("click button")
+    # click button
+    analysis_and_solution_development_action_button.click()
+
+    logger.debug("locate assignments button")
+    # locate assignments button
+    assignments_button = _locate(wait, "menu.assignments")
+
+    logger.debug("_hover")
+    _hover(driver, assignments_button)
+
+    logger.debug("locate new allocation button")
+    # locate new allocation button
+    new_allocation_button = _locate(wait, "menu.new_allocation")
+
+    handles = driver.window_handles
+
+    logger.debug("click it")
+    # click it
+    new_allocation_button.click()
+
+    logger.debug("wait for the resource search window")
+    # wait for the resource search window and remember which one it is
+    if _wait_until(wait, EC.new_window_is_opened(handles), ceiling="page", required=False):
+        popup = (set(driver.window_handles) - set(handles)).pop()
+        _SEARCH_WINDOWS[driver.session_id, driver.current_window_handle] = popup
+
+    logger.debug("return None")
+    return None
+
+
+# resource search window opened by each (browser session, window) pair, so
+# `allocate` picks the right one when several rows' tabs are open
+_SEARCH_WINDOWS = {}
+
+
+@_timed
+def allocate(driver, wait, resource):
+    """
+    Allocate a resource.
+
+    The result list is only ever filled by a search, so the search always
+    runs; a cached id in `RESOURCE_IDS` just picks the same resource out of
+    the results again. Only the REST backend saves a lookup with it.
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    resource: str
+        Resource to allocate
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("allocate")
+
+    logger.debug("get window handles")
+    # get this row's window and the resource search window it opened
+    main_window = driver.current_window_handle
+    resource_search_window = _SEARCH_WINDOWS.pop((driver.session_id, main_window), None)
+    if resource_search_window is None:
+        resource_search_window = driver.window_handles[-1]
+
+    logger.debug("switch to resource window")
+    # switch to resource window
+    driver.switch_to.window(resource_search_window)
+
+    logger.debug("locate search view frame")
+    # locate search view frame
+    search_view_frame = _locate(wait, "search.view_frame")
+
+    logger.debug("switch to search view frame")
+    # switch to search view frame
+    driver.switch_to.frame(search_view_frame)
+
+    logger.debug("locate search attributes frame")
+    # locate search attributes frame
+    search_attributes_frame = _locate(wait, "search.attributes_frame")
+
+    logger.debug("switch to search attributes frame")
+    # switch to search attributes frame
+    driver.switch_to.frame(search_attributes_frame)
+
+    logger.debug("locate description input")
+    # locate description input
+    description_input = _locate(wait, "search.description")
+
+    logger.debug("type %s", resource)
     # type <resource name>
     description_input.send_keys(f"{resource}")
 
-    logger.debug("locate search button")
-    # locate search button
-    search_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[name='_search'][type='submit']")
-        )
-    )
+    logger.debug("locate search button")
+    # locate search button
+    search_button = _locate(wait, "search.button")
+
+    logger.debug("click button")
+    # click button
+    search_button.click()
+
+    logger.debug("switch to previous frame")
+    # switch to previous frame
+    driver.switch_to.parent_frame()
+
+    logger.debug("locate search list frame")
+    # locate search list frame
+    search_list_frame = _locate(wait, "search.list_frame")
+
+    logger.debug("switch to search list frame")
+    # switch to search list frame
+    driver.switch_to.frame(search_list_frame)
+
+    logger.debug("locate checkbox input")
+    # locate checkbox input, i.e. wait for the results
+    checkbox_input = _locate(wait, "search.checkbox")
+
+    resource_id = RESOURCE_IDS.get(resource)
+    if resource_id is not None:
+        logger.debug("pick resource %s from the results", resource_id)
+        # pick the resource this description resolved to before; the results are in, so no waiting
+        matches = _find(driver, "search.checkbox_for", many=True, resource_id=resource_id)
+        if matches:
+            checkbox_input = matches[0]
+        else:
+            logger.warning("resource %s not among the results for %s, forget it", resource_id, resource)
+            RESOURCE_IDS.forget(resource)
+
+    logger.debug("click checkbox")
+    # click checkbox
+    checkbox_input.click()
+    RESOURCE_IDS.put(resource, checkbox_input.get_attribute("value"))
+
+    logger.debug("switch to previous frame")
+    # switch to previous frame
+    driver.switch_to.parent_frame()
+
+    logger.debug("switch to previous frame (i.e. outermost frame)")
+    # switch to previous frame (i.e. outermost frame)
+    driver.switch_to.parent_frame()
+
+    logger.debug("locate OK button")
+    # locate OK button
+    ok_button = _locate(wait, "search.ok")
+
+    logger.debug("click OK button")
+    # click OK button
+    ok_button.click()
+
+    logger.debug("wait for resource search window to close")
+    # wait for resource search window to close
+    _wait_until(wait, _window_is_closed(resource_search_window), ceiling="save", required=False)
+
+    logger.debug("switch to main window")
+    # switch to main window
+    driver.switch_to.window(main_window)
+
+    logger.debug("wait for allocation to finish loading")
+    # wait for allocation to finish loading
+    _wait_until(wait, _network_is_idle(), ceiling="save", required=False)
+
+    logger.debug("return None")
+    return None
+
+
+@_timed
+def navigate_to_work_view(wait):
+    """"""
+
+    #
+    action_menu_button = _locate(wait, "banner.actions")
+
+    #
+    action_menu_button.click()
+
+    #
+    work_view_button = _locate(wait, "banner.work_view")
+
+    #
+    work_view_button.click()
+    _forget_elements(wait.driver)
+
+    return None
+
+
+@_timed
+def edit_work_detail(driver, wait):
+    """"""
+
+    #
+    describe_and_categorize_tab = _locate(wait, "work_view.describe_tab")
+
+    #
+    describe_and_categorize_tab.click()
+
+    # let the tab load before looking for its iframe
+    _wait_until(wait, _network_is_idle(), ceiling="page", required=False)
+
+    # wait for the tab's iframe and switch into it
+    _locate(wait, "work_view.describe_iframe", condition=EC.frame_to_be_available_and_switch_to_it, ceiling="page")
+
+    #
+    edit_button = _locate(wait, "describe.edit")
+
+    #
+    edit_button.click()
+
+    return None
+
+
+@_timed
+def bi_swim_lane(wait, bi_swim_lane_name):
+    """"""
+
+    #
+    bi_swim_lanes_label = _locate(wait, "describe.bi_swim_lanes_label")
+
+    #
+    bi_swim_lanes_selector = _find(
+        bi_swim_lanes_label.parent, "describe.bi_swim_lane_option", bi_swim_lane_name=bi_swim_lane_name
+    )
+    _harvest_picklist(bi_swim_lanes_selector, "bi_swim_lane")
+
+    #
+    bi_swim_lanes_selector.click()
+
+    return None
+
+
+@_timed
+def bi_work_type(wait):
+    """"""
+
+    #
+    bi_work_type_selector = _locate(wait, "describe.bi_work_type")
+
+    #
+    bi_work_type_selector.click()
+
+    return None
+
+
+@_timed
+def executive_sponsor(wait, driver, executive_sponsor_name):
+    """"""
+
+    #
+    executive_sponsor_input = _locate(wait, "describe.executive_sponsor", condition=_located_and_enabled, ceiling="picker")
+
+    #
+    # executive_sponsor_input.click()  # not interactable
+    # executive_sponsor_input.clear()  # not interactable
+
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, executive_sponsor_input)
+
+    actions = ActionChains(driver=driver)
+
+    actions.move_to_element(executive_sponsor_input)
+    actions.click()
+    actions.send_keys(executive_sponsor_name)
+    actions.perform()
+
+    #
+    # executive_sponsor_input.send_keys(executive_sponsor_name)
+
+    return None
+
+
+@_timed
+def bi_business_owner(wait, driver, bi_business_owner_name):
+    """"""
+
+    #
+    bi_business_owner_input = _locate(wait, "describe.bi_business_owner", condition=_located_and_enabled, ceiling="picker")
+
+    #
+    # bi_business_owner_input.click()  # not interactable
+    # bi_business_owner_input.clear()  # not interactable
+
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, bi_business_owner_input)
+
+    actions = ActionChains(driver=driver)
+
+    actions.move_to_element(bi_business_owner_input)
+    actions.click()
+    actions.send_keys(bi_business_owner_name)
+    actions.perform()
+
+    #
+    # bi_business_owner_input.send_keys(bi_business_owner_name)
+
+    return None
+
+
+@_timed
+def bi_domain(wait, driver, bi_domain_name):
+    """"""
+
+    #
+    bi_domain_input = _locate(wait, "describe.bi_domain", condition=_located_and_enabled, ceiling="picker")
+
+    #
+    # bi_domain_input.click()  # not interactable?
+    # bi_domain_input.clear()
+
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, bi_domain_input)
+
+    actions = ActionChains(driver=driver)
+
+    actions.move_to_element(bi_domain_input)
+    actions.click()
+    actions.send_keys(bi_domain_name)
+    actions.perform()
+
+    #
+    # bi_domain_input.send_keys(bi_domain_name)
+
+    return None
+
+
+@_timed
+def requestor(wait, driver, requestor_name):
+    """"""
+
+    #
+    requestor_input = _locate(wait, "describe.requestor", condition=_located_and_enabled, ceiling="picker")
+
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, requestor_input)
+
+    actions = ActionChains(driver=driver)
+
+    actions.move_to_element(requestor_input)
+    actions.click()
+    actions.send_keys(requestor_name)
+    actions.perform()
+
+    return None
+
+
+@_timed
+def bi_liaison(wait, driver, bi_liaison_name):
+    """"""
+
+    #
+    bi_liaison_select = _locate(wait, "describe.bi_liaison")
+
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, bi_liaison_select)
+
+    actions = ActionChains(driver=driver)
+
+    actions.click(bi_liaison_select)
+    actions.perform()
+
+    bi_liaison_click = _find(bi_liaison_select, "describe.bi_liaison_option", bi_liaison_name=bi_liaison_name)
+    _harvest_picklist(bi_liaison_click, "bi_liaison")
+
+    #
+    bi_liaison_click.click()
+
+    return None
+
+
+@_timed
+def work_description(wait, driver, work_description_text):
+    """"""
+
+    #
+    work_description_text_area = _locate(wait, "describe.work_description")
+
+    #
+    # work_description_text_area.click()
+
+    #
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, work_description_text_area)
+
+    actions = ActionChains(driver=driver)
+
+    #
+    actions.click(work_description_text_area)
+    actions.send_keys(work_description_text)
+    actions.perform()
+
+    return None
+
+
+@_timed
+def business_need(wait, driver, business_need_text):
+    """"""
+
+    #
+    business_need_text_area = _locate(wait, "describe.business_need")
+
+    #
+    # business_need_text_area.click()
+
+    #
+    # bring it into the viewport, ActionChains do not scroll
+    _scroll_into_view(driver, business_need_text_area)
+
+    actions = ActionChains(driver=driver)
+
+    #
+    actions.click(business_need_text_area)
+    actions.send_keys(business_need_text)
+    actions.perform()
+
+    return None
+
+
+@_timed
+def save_edits(wait):
+    """"""
+
+    save_button = _locate(wait, "describe.save")
+
+    save_button.click()
+
+    # wait for the editor to close
+    _wait_until(
+        wait,
+        _any_of(EC.staleness_of(save_button), EC.invisibility_of_element(save_button)),
+        ceiling="save",
+        required=False
+    )
+
+    # and for the save's requests to finish
+    _wait_until(wait, _network_is_idle(), ceiling="save", required=False)
+
+    return None
+
+
+@_timed
+def describe_and_categorize_bi(
+        wait,
+        driver,
+        bi_swim_lane_name,
+        executive_sponsor_name,
+        bi_business_owner_name,
+        bi_domain_name,
+        requestor_name,
+        bi_liaison_name,
+        work_description_text,
+        business_need_text
+):
+    """
+    Edit the Describe & Categorize BI page
+
+    Parameters
+    ----------
+    wait: selenium.webdriver.support.wait.WebDriverWait
+        Tells the driver to look for an element every 0.5 seconds until it is found
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    bi_swim_lane_name: str
+        text to enter in BI Swim Lane field
+
+    executive_sponsor_name: str
+        text to enter in Executive Sponsor field
+
+    bi_business_owner_name: str
+        text to enter in BI Business Owner field
+
+    bi_domain_name: str
+        text to enter in BI Domain field
+
+    requestor_name: str
+        text to enter in Requestor field
+
+    bi_liaison_name: str
+        text to enter in BI Liaison field
+
+    work_description_text: str
+        text to enter in Work Description field
+
+    business_need_text: str
+        text to enter in Business Need field
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("describe_and_categorize_bi")
+
+    logger.debug("bi_swim_lane")
+    bi_swim_lane(wait, bi_swim_lane_name)
+
+    logger.debug("bi_work_type")
+    bi_work_type(wait)
+
+    logger.debug("executive_sponsor")
+    executive_sponsor(wait, driver, executive_sponsor_name)
+
+    logger.debug("bi_business_owner")
+    bi_business_owner(wait, driver, bi_business_owner_name)
+
+    logger.debug("bi_domain")
+    bi_domain(wait, driver, bi_domain_name)
+
+    logger.debug("requestor")
+    requestor(wait, driver, requestor_name)
+
+    logger.debug("bi_liaison")
+    bi_liaison(wait, driver, bi_liaison_name)
+
+    logger.debug("work_description")
+    work_description(wait, driver, work_description_text)
+
+    logger.debug("business_need")
+    business_need(wait, driver, business_need_text)
+
+    logger.debug("save_edits")
+    save_edits(wait)
+
+
+PROJECT_BOOK = r"\\kuha.kumed.com\shares\departments\AA & BIS\PRM\2022494_Automation_of_PRM_Task_Creation\ProjectBook.xlsx"
+# PROJECT_BOOK = r"\\kuha.kumed.com\shares\departments\AA & BIS\PRM\2022494_Automation_of_PRM_Task_Creation\ProjectBookTest.xlsx"
+
+# local copies of parsed workbooks, see `read_project_book`
+CACHE_DIR = "cache"
+
+
+def _file_digest(path):
+    """
+    SHA-256 of a file, read in 1 MiB chunks
+
+    Parameters
+    ----------
+    path: str
+        File to hash
+
+    Returns
+    -------
+    digest: str
+    """
+
+    sha256 = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def _write_snapshot(df, data_path):
+    """
+    Write `df` as Feather, or as a pickle if pyarrow is missing or cannot
+    represent one of the columns
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        The parsed workbook
+
+    data_path: str
+        Path without extension
+
+    Returns
+    -------
+    path: str
+        The file that was written
+    """
+
+    logger = logging.getLogger("_write_snapshot")
+
+    try:
+        df.to_feather(f"{data_path}.feather.tmp")
+    except Exception as e:
+        logger.debug("feather unavailable (%r), use pickle", e)
+        if os.path.exists(f"{data_path}.feather.tmp"):
+            os.remove(f"{data_path}.feather.tmp")
+        path = f"{data_path}.pkl"
+        df.to_pickle(f"{path}.tmp")
+    else:
+        path = f"{data_path}.feather"
+
+    os.replace(f"{path}.tmp", path)
+
+    return path
+
+
+def read_project_book(path=PROJECT_BOOK, cache_dir=CACHE_DIR):
+    """
+    Read the ProjectBook, from a local snapshot whenever the workbook on the
+    share has not changed
+
+    The snapshot is reused straight away if the workbook's mtime and size
+    match the ones it was taken from. If either differs, the workbook is
+    hashed, and only a changed hash means the xlsx is parsed again.
+
+    Parameters
+    ----------
+    path: str
+        The ProjectBook workbook
+
+    cache_dir: str or None
+        Folder for snapshots; None always parses the workbook
+
+    Returns
+    -------
+    df: pandas.DataFrame
+    """
+
+    logger = logging.getLogger("read_project_book")
+
+    if cache_dir is None:
+        logger.debug("read excel")
+        return pd.read_excel(io=path)
+
+    stat = os.stat(path)
+
+    key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+    data_path = os.path.join(cache_dir, key)
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if not os.path.exists(meta["data"]):
+            meta = None
+
+    digest = None
+    if meta is not None and (meta["mtime_ns"], meta["size"]) != (stat.st_mtime_ns, stat.st_size):
+        logger.debug("mtime or size changed, hash workbook")
+        # mtime or size changed, hash workbook
+        digest = _file_digest(path)
+        if digest != meta["sha256"]:
+            meta = None
+
+    if meta is not None:
+        logger.info("read snapshot %s", meta["data"])
+        # read snapshot
+        if meta["data"].endswith(".feather"):
+            df = pd.read_feather(meta["data"])
+        else:
+            df = pd.read_pickle(meta["data"])
+    else:
+        logger.info("read excel %s", path)
+        # read excel
+        df = pd.read_excel(io=path)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        meta = {"source": path, "data": _write_snapshot(df, data_path)}
+
+    meta.update(
+        {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest or meta.get("sha256") or _file_digest(path),
+        }
+    )
+
+    with open(f"{meta_path}.tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+    return df
+
+
+class ResourceCache:
+    """
+    Planview resource ids by resource description, kept on disk between runs
+
+    Filled from the checkbox `allocate` ticks and from `find_resource`. The
+    REST backend allocates straight to a cached id without looking the
+    resource up; the browser still has to search, and only uses the id to
+    pick the same result again.
+
+    Parameters
+    ----------
+    path: str, optional
+        JSON file to load and save; None keeps the cache in memory only
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ids = {}
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._ids = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logging.getLogger("ResourceCache").warning("ignore unreadable %s: %r", path, e)
+
+    def get(self, description):
+        """The id `description` resolved to before, or None"""
+
+        with self._lock:
+            return self._ids.get(_normalize_description(description))
+
+    def put(self, description, resource_id):
+        """Remember the id of `description`"""
+
+        if not resource_id:
+            return None
+
+        key = _normalize_description(description)
+        with self._lock:
+            if self._ids.get(key) == resource_id:
+                return None
+            self._ids[key] = resource_id
+            self._save()
+
+        return None
+
+    def forget(self, description):
+        """Drop the id of `description`, e.g. once Planview no longer knows it"""
+
+        with self._lock:
+            if self._ids.pop(_normalize_description(description), None) is not None:
+                self._save()
+
+        return None
+
+    def _save(self):
+        """Write the cache; callers hold the lock"""
+
+        if self.path is None:
+            return None
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump(self._ids, f, indent=1, sort_keys=True)
+        os.replace(f"{self.path}.tmp", self.path)
+
+        return None
+
+
+# shared by every worker; `configure_resource_cache` points it at a file
+RESOURCE_IDS = ResourceCache()
+
+
+def configure_resource_cache(path):
+    """
+    Keep resource ids in `path` between runs
+
+    Parameters
+    ----------
+    path: str or None
+        JSON file, None for memory only
+
+    Returns
+    -------
+    None
+    """
+
+    global RESOURCE_IDS
+
+    RESOURCE_IDS = ResourceCache(path)
+
+    return None
+
+
+# picklists the steps choose from, and the ProjectInfo field each one checks
+PICKLIST_FIELDS = {
+    "bi_service_name": "bi_service_name",
+    "bi_assignment_owner": "bi_assignment_owner_name",
+    "bi_team": "bi_team_name",
+    "bi_swim_lane": "bi_swim_lane_name",
+    "bi_liaison": "bi_liaison_name",
+}
+
+
+class PicklistCache:
+    """
+    Snapshot of the options each picklist offers, trusted for `ttl` seconds
+
+    Filled from the REST API by `fetch_picklists` or harvested by the steps
+    from the pages they are on (`_harvest_picklist`), and read by
+    `preflight_picklists`.
+
+    Parameters
+    ----------
+    path: str, optional
+        JSON file to load and save; None keeps the snapshot in memory only
+
+    ttl: float
+        Seconds a picklist's snapshot stays fresh
+    """
+
+    def __init__(self, path=None, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._lists = {}
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._lists = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logging.getLogger("PicklistCache").warning("ignore unreadable %s: %r", path, e)
+
+    def get(self, name):
+        """The options of `name`, or None if there is no fresh snapshot"""
+
+        with self._lock:
+            snapshot = self._lists.get(name)
+
+        if snapshot is None or datetime.now().timestamp() - snapshot["taken"] > self.ttl:
+            return None
+
+        return snapshot["values"]
+
+    def put(self, name, values):
+        """Replace the snapshot of `name`"""
+
+        with self._lock:
+            self._lists[name] = {"values": list(values), "taken": datetime.now().timestamp()}
+
+            if self.path is not None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(f"{self.path}.tmp", "w") as f:
+                    json.dump(self._lists, f, indent=1, sort_keys=True)
+                os.replace(f"{self.path}.tmp", self.path)
+
+        logging.getLogger("PicklistCache").info("snapshot %s %s option(s)", len(values), name)
+
+        return None
+
+
+# shared by every worker; `configure_picklist_cache` points it at a file
+PICKLIST_CACHE = PicklistCache()
+
+
+def configure_picklist_cache(path, ttl=24 * 3600):
+    """
+    Keep picklist snapshots in `path` between runs
+
+    Parameters
+    ----------
+    path: str or None
+        JSON file, None for memory only
+
+    ttl: float
+        Seconds a snapshot stays fresh
+
+    Returns
+    -------
+    None
+    """
+
+    global PICKLIST_CACHE
+
+    PICKLIST_CACHE = PicklistCache(path, ttl)
+
+    return None
+
+
+class ProjectInfo(NamedTuple):
+    """Everything the step functions need for one ProjectBook row"""
+
+    index: int
+    description: str
+    bi_service_name: str
+    bi_assignment_owner_name: str
+    bi_team_name: str
+    resource: str
+    bi_swim_lane_name: str
+    executive_sponsor_name: str
+    bi_business_owner_name: str
+    bi_domain_name: str
+    requestor_name: str
+    bi_liaison_name: str
+    work_description_text: str
+    business_need_text: str
+
+
+# columns of the ProjectBook the automation reads
+PROJECT_BOOK_COLUMNS = [
+    "Description",
+    "BIServiceName",
+    "BIAssignmentOwner",
+    "BITeam",
+    "BISwimLanes",
+    "ExecutiveSponsor",
+    "BIBusinessOwner",
+    "BIDomain",
+    "Requestor",
+    "BILiaison",
+    "WorkDescription",
+    "BusinessNeed",
+]
+
+
+def parse_project_book(df, month, year):
+    """
+    Parse and validate every ProjectBook row before the browser starts
+
+    "Name (value)" cells are split with one vectorized `str.extract` per
+    column instead of slicing each row, and every problem in the book is
+    collected rather than stopping at the first.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        The ProjectBook
+
+    month: str
+        Name of the current month
+
+    year: int
+        The current year
+
+    Returns
+    -------
+    project_infos: list
+        A ProjectInfo for every valid row
+
+    invalid: dict
+        Maps the index of every invalid row to what is wrong with it
+    """
+
+    logger = logging.getLogger("parse_project_book")
+
+    required = PROJECT_BOOK_COLUMNS
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise ValueError(f"ProjectBook is missing column(s): {', '.join(missing)}")
+
+    logger.debug("cast columns to string")
+    # cast columns to string, blanks stay <NA>
+    text = df[required].astype("string")
+
+    logger.debug("split Name (value) columns")
+    # split "Name (value)" columns
+    owner = text["BIAssignmentOwner"].str.extract(r"^(?P<resource>[^(]*)\((?P<name>[^)]*)\)")
+    swim_lane = text["BISwimLanes"].str.extract(r"^[^(]*\((?P<name>.*)\)$", flags=re.DOTALL)
+    liaison = text["BILiaison"].str.extract(r"^[^(]*\((?P<name>.*)\)$", flags=re.DOTALL)
+
+    parsed = pd.DataFrame(
+        {
+            "description": f"{month} {year} " + text["Description"],
+            "bi_service_name": text["BIServiceName"],
+            "bi_assignment_owner_name": owner["name"],
+            "bi_team_name": text["BITeam"],
+            "resource": owner["resource"].str.strip(),
+            "bi_swim_lane_name": swim_lane["name"],
+            "executive_sponsor_name": text["ExecutiveSponsor"],
+            "bi_business_owner_name": text["BIBusinessOwner"],
+            "bi_domain_name": text["BIDomain"],
+            "requestor_name": text["Requestor"],
+            "bi_liaison_name": liaison["name"],
+            "work_description_text": text["WorkDescription"],
+            "business_need_text": text["BusinessNeed"],
+        },
+        index=df.index,
+    )
+
+    logger.debug("collect problems")
+    # collect problems
+    problems = pd.DataFrame(index=df.index)
+    for column in required:
+        problems[f"{column} is blank"] = (text[column].isna() | (text[column].str.strip() == "")).fillna(True)
+    for column, extracted in (("BIAssignmentOwner", owner), ("BISwimLanes", swim_lane), ("BILiaison", liaison)):
+        problems[f"{column} is not 'Name (value)'"] = text[column].notna() & extracted["name"].isna()
+    problems["Description is repeated"] = parsed["description"].notna() & parsed["description"].duplicated(keep=False)
+
+    invalid = {}
+    for index, flags in problems[problems.any(axis=1)].iterrows():
+        invalid[index] = "; ".join(flags.index[flags])
+        logger.error("row %s (%s): %s", index, df.at[index, "Description"], invalid[index])
+
+    project_infos = [
+        ProjectInfo(index, **record)
+        for index, record in zip(parsed.index, parsed.to_dict("records"))
+        if index not in invalid
+    ]
+
+    logger.debug("return project_infos, invalid")
+    return project_infos, invalid
+
+
+def parse_row_spec(spec):
+    """
+    Parse a row selection such as "3", "3-7" or "3-7,12"
+
+    Rows are numbered as in the run summary, i.e. by ProjectBook index.
+
+    Parameters
+    ----------
+    spec: str
+        Comma-separated row numbers and inclusive ranges
+
+    Returns
+    -------
+    rows: set
+    """
+
+    rows = set()
+    for part in spec.split(","):
+        first, dash, last = part.strip().partition("-")
+        try:
+            first = int(first)
+            last = int(last) if dash else first
+        except ValueError:
+            raise ValueError(f"not a row or row range: {part.strip()!r}") from None
+        if last < first:
+            raise ValueError(f"empty row range: {part.strip()!r}")
+        rows.update(range(first, last + 1))
+
+    return rows
+
+
+def select_rows(df, month, year, rows=None, match=None, failed=None):
+    """
+    Pick the ProjectBook rows a run should work on
+
+    Every given criterion has to hold.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        The ProjectBook
+
+    month: str
+        Name of the current month
+
+    year: int
+        The current year
+
+    rows: set, optional
+        Row indices, see `parse_row_spec`
+
+    match: str, optional
+        Regular expression searched for in the Description, ignoring case
+
+    failed: set, optional
+        Work item descriptions ("<month> <year> <Description>") whose last
+        attempt failed, see `Journal.load`
+
+    Returns
+    -------
+    selected: set
+        Indices of the selected rows
+    """
+
+    logger = logging.getLogger("select_rows")
+
+    selected = pd.Series(True, index=df.index)
+    description = df["Description"].astype("string")
+
+    if rows is not None:
+        logger.debug("keep rows %s", sorted(rows))
+        # keep the given rows
+        selected &= df.index.isin(rows)
+
+    if match is not None:
+        logger.debug("keep descriptions matching %r", match)
+        # keep descriptions matching the pattern
+        selected &= description.str.contains(match, case=False, regex=True).fillna(False).astype(bool)
+
+    if failed is not None:
+        logger.debug("keep %s failed row(s)", len(failed))
+        # keep rows whose last attempt failed
+        selected &= (f"{month} {year} " + description).isin(failed).astype(bool)
+
+    logger.info("%s of %s row(s) selected", int(selected.sum()), len(df))
+
+    logger.debug("return selected")
+    return set(df.index[selected])
+
+
+def preflight_picklists(project_infos, picklists=None):
+    """
+    Reject rows whose values are not among a picklist's options before any
+    browser work starts
+
+    Picklists without a fresh snapshot are not checked.
+
+    Parameters
+    ----------
+    project_infos: list
+        Valid rows from `parse_project_book`
+
+    picklists: PicklistCache, optional
+        Defaults to `PICKLIST_CACHE`
+
+    Returns
+    -------
+    project_infos: list
+        The rows that passed
+
+    rejected: dict
+        Maps the index of every rejected row to what is wrong with it,
+        with the closest option where there is one
+    """
+
+    logger = logging.getLogger("preflight_picklists")
+
+    picklists = picklists or PICKLIST_CACHE
+
+    options = {}
+    for name in PICKLIST_FIELDS:
+        values = picklists.get(name)
+        if values is None:
+            logger.info("no fresh %s snapshot, not checked", name)
+        else:
+            options[name] = set(values)
+
+    passed = []
+    rejected = {}
+    for project_info in project_infos:
+        problems = []
+        for name, values in options.items():
+            value = str(getattr(project_info, PICKLIST_FIELDS[name]))
+            if value in values:
+                continue
+            problem = f"{name} {value!r} is not an option"
+            closest = difflib.get_close_matches(value, values, n=1, cutoff=0.6)
+            if closest:
+                problem += f", did you mean {closest[0]!r}?"
+            problems.append(problem)
+
+        if problems:
+            rejected[project_info.index] = "; ".join(problems)
+            logger.error("row %s (%s): %s", project_info.index, project_info.description, rejected[project_info.index])
+        else:
+            passed.append(project_info)
+
+    logger.debug("return project_infos, rejected")
+    return passed, rejected
+
+
+# steps of a row in order, and whether the page a step leaves the browser on
+# can be reopened by URL to carry on from there after a crash
+ROW_STEPS = (
+    ("new_work_page1", False),
+    ("new_work_page2", False),
+    ("work_and_assignments", True),
+    ("open_resource_search_window", False),
+    ("allocate", True),
+    ("navigate_to_work_view", False),
+    ("edit_work_detail", False),
+    ("describe_and_categorize_bi", False),
+)
+
+
+class RowState(NamedTuple):
+    """How a row step is recognised and re-entered after it fails, see `ROW_STATES`"""
+
+    # condition that holds while the browser is on the page the step starts on
+    entered: object
+    # condition that holds once the step has taken effect, so running it again
+    # would repeat it; None if the step is safe to repeat
+    done: object
+    # earlier step to run again before retrying this one, e.g. to reopen a popup
+    redo_from: object
+    # condition that holds once the step has submitted its form but not got
+    # to its end, and the call (given the session's wait) that carries it on
+    # from there instead of filling the form in again
+    submitted: object = None
+    finish: object = None
+
+
+# what each row step looks like from the outside; the step that opens the
+# row's first page (None) can always just be run again
+ROW_STATES = {
+    None: RowState(None, None, None),
+    "new_work_page1": RowState(_located("page1.description"), _located("page2.save_and_complete"), None),
+    "new_work_page2": RowState(
+        _located("page2.save_and_complete"),
+        _located("grid.right"),
+        None,
+        submitted=_located("page2.actions"),
+        finish=_open_work_and_assignments,
+    ),
+    "work_and_assignments": RowState(_located("grid.right"), None, None),
+    "open_resource_search_window": RowState(_located("grid.left"), None, None),
+    "allocate": RowState(_located("grid.left"), None, "open_resource_search_window"),
+    "navigate_to_work_view": RowState(_located("banner.actions"), _located("work_view.describe_tab"), None),
+    "edit_work_detail": RowState(_located("work_view.describe_tab"), None, None),
+    "describe_and_categorize_bi": RowState(_located("work_view.describe_tab"), None, "edit_work_detail"),
+}
+
+# failures worth another attempt at the same step; anything else fails the row
+TRANSIENT_ERRORS = (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+
+# attempts per step, and the delay before each retry: `backoff` seconds,
+# doubling every retry, never more than `max_backoff`. Change them with
+# `configure_retries`.
+RETRY_POLICY = {
+    "attempts": 3,
+    "backoff": 1.0,
+    "max_backoff": 10.0,
+}
+
+
+def configure_retries(**policy):
+    """
+    Change how failed steps are retried
+
+    Parameters
+    ----------
+    **policy: float
+        New value for any key of `RETRY_POLICY`, e.g. `attempts=1` to never retry
+
+    Returns
+    -------
+    None
+    """
+
+    unknown = set(policy) - set(RETRY_POLICY)
+    if unknown:
+        raise ValueError(f"unknown retry setting(s): {', '.join(sorted(unknown))}")
+
+    RETRY_POLICY.update(policy)
+
+    return None
+
+
+# What is kept for diagnosing a failed row: the last `snapshots` steps of
+# each session in memory, and on failure those plus a screenshot, the page
+# source and the console log in a folder under `dir`. Change with
+# `configure_failure_capture`; `snapshots=0` turns it off.
+FAILURE_CAPTURE = {
+    "snapshots": 8,
+    "dir": os.path.join("Logs", "failures"),
+}
+
+# where the browser is and a digest of the DOM, in one round trip; the frame
+# path lists each frame's id, name or src from the top document down
+_SNAPSHOT_SCRIPT = """
+var path = [];
+for (var w = window; w !== w.parent; w = w.parent) {
+  var frame = null;
+  try { frame = w.frameElement; } catch (e) {}
+  path.unshift(frame ? (frame.id || frame.name || frame.getAttribute("src") || frame.tagName) : "?");
+}
+var elements = document.getElementsByTagName("*");
+var hash = 0;
+for (var i = 0; i < elements.length; i++) {
+  var key = elements[i].tagName + "#" + elements[i].id;
+  for (var j = 0; j < key.length; j++) hash = (hash * 31 + key.charCodeAt(j)) | 0;
+}
+var active = document.activeElement;
+return {
+  url: location.href,
+  title: document.title,
+  ready_state: document.readyState,
+  frame_path: path,
+  elements: elements.length,
+  digest: (hash >>> 0).toString(16),
+  active: active ? active.tagName + (active.id ? "#" + active.id : "") : null
+};
+"""
+
+
+def configure_failure_capture(**settings):
+    """
+    Change what is kept for failed rows
+
+    Sessions created afterwards pick up a new `snapshots`.
+
+    Parameters
+    ----------
+    **settings:
+        New value for any key of `FAILURE_CAPTURE`
+
+    Returns
+    -------
+    None
+    """
+
+    unknown = set(settings) - set(FAILURE_CAPTURE)
+    if unknown:
+        raise ValueError(f"unknown failure capture setting(s): {', '.join(sorted(unknown))}")
+
+    FAILURE_CAPTURE.update(settings)
+
+    return None
+
+
+def _snapshot(driver):
+    """
+    Cheap record of where the browser is: window, frame path, URL and a
+    digest of the DOM's tags and ids
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    Returns
+    -------
+    snapshot: dict
+    """
+
+    try:
+        return {"handle": driver.current_window_handle, **driver.execute_script(_SNAPSHOT_SCRIPT)}
+    except WebDriverException as e:
+        # e.g. the window has just closed
+        return {"unavailable": e.msg}
+
+
+def _remember_step(session, step, seconds, error=None):
+    """
+    Add a snapshot of the browser after `step` to the session's ring buffer
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        The row's browser session
+
+    step: str or None
+        Key of `ROW_STATES`
+
+    seconds: float
+        How long the step took, retries included
+
+    error: Exception, optional
+        What the step failed with
+
+    Returns
+    -------
+    None
+    """
+
+    if not session.snapshots.maxlen:
+        return None
+
+    session.snapshots.append(
+        {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "row": _current_row.get(),
+            "step": step or "open",
+            "seconds": round(seconds, 3),
+            "error": None if error is None else f"{type(error).__name__}: {error}".strip(),
+            **_snapshot(session.driver),
+        }
+    )
+
+    return None
+
+
+def capture_failure(session, step, error):
+    """
+    Write what is known about a failed step to its own folder under
+    `FAILURE_CAPTURE["dir"]`
+
+    The folder gets failure.json (the error, its traceback, requests still
+    in flight and the session's recent step snapshots), screenshot.png
+    (the whole page, not just the viewport), page.html (the current frame's
+    source) and console.json (the browser console). Anything that cannot be
+    captured is skipped; the row's own error is what gets reported.
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        The row's browser session
+
+    step: str or None
+        Key of `ROW_STATES`
+
+    error: Exception
+        What the step failed with
+
+    Returns
+    -------
+    folder: str or None
+        None if capturing is turned off
+    """
+
+    logger = logging.getLogger("capture_failure")
+
+    if not session.snapshots.maxlen:
+        return None
+
+    driver = session.driver
+    row = _current_row.get()
+    folder = os.path.join(FAILURE_CAPTURE["dir"], f"{datetime.now():%Y%m%d_%H%M%S_%f}_row{row}_{step or 'open'}")
+    os.makedirs(folder, exist_ok=True)
+
+    logger.debug("write screenshot")
+    # write screenshot of the whole page
+    try:
+        try:
+            png = base64.b64decode(
+                driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "captureBeyondViewport": True})["data"]
+            )
+        except WebDriverException:
+            png = driver.get_screenshot_as_png()
+        with open(os.path.join(folder, "screenshot.png"), "wb") as f:
+            f.write(png)
+    except WebDriverException as e:
+        logger.warning("no screenshot: %s", e.msg)
+
+    logger.debug("write page source")
+    # write page source
+    try:
+        with open(os.path.join(folder, "page.html"), "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
+    except WebDriverException as e:
+        logger.warning("no page source: %s", e.msg)
+
+    logger.debug("write console log")
+    # write console log
+    try:
+        with open(os.path.join(folder, "console.json"), "w") as f:
+            json.dump(driver.get_log("browser"), f, indent=1)
+    except WebDriverException as e:
+        logger.warning("no console log: %s", e.msg)
+
+    logger.debug("write failure.json")
+    # write the error and the recent steps
+    activity = _NETWORK_ACTIVITY.get(driver.session_id)
+    now = perf_counter()
+    with open(os.path.join(folder, "failure.json"), "w") as f:
+        json.dump(
+            {
+                "row": row,
+                "step": step or "open",
+                "error": f"{type(error).__name__}: {error}".strip(),
+                "traceback": traceback.format_exception(type(error), error, error.__traceback__),
+                "requests_in_flight": [
+                    {"target": target, "seconds": round(now - started, 3)}
+                    for target, started in (activity or {"requests": {}})["requests"].values()
+                ],
+                "snapshots": list(session.snapshots),
+            },
+            f,
+            indent=1,
+            default=str,
+        )
+
+    logger.warning("row %s: failure captured in %s", row, folder)
+
+    return folder
+
+
+def _run_step(session, step, calls):
+    """
+    Run one step of a row with retries (`_attempt_step`), keeping a snapshot
+    of where it left the browser and capturing the page if it fails
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        The row's browser session
+
+    step: str or None
+        Key of `ROW_STATES`
+
+    calls: dict
+        Maps each step of the row to its call, from `_row_plan`
+
+    Returns
+    -------
+    None
+    """
+
+    start = perf_counter()
+    try:
+        _attempt_step(session, step, calls)
+    except Exception as e:
+        _remember_step(session, step, perf_counter() - start, error=e)
+        try:
+            capture_failure(session, step, e)
+        except OSError as capture_error:
+            logging.getLogger("_run_step").warning("could not capture the failure: %r", capture_error)
+        raise
+
+    _remember_step(session, step, perf_counter() - start)
+
+    return None
+
+
+def _attempt_step(session, step, calls):
+    """
+    Run one step of a row, retrying it from a known state if it fails on
+    something transient
+
+    Before each retry the browser is brought back to the main window's top
+    document, and the step's `RowState` decides what happens next: if the
+    step turns out to have taken effect it is not run again, if it got as
+    far as submitting its form only its `finish` is run, if the browser is
+    still on the step's page (or was sent to the log-in form) the page the
+    step started on is reopened by its URL (and `redo_from` run) before the
+    retry, and if it is none of these the original error is raised.
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        The row's browser session
+
+    step: str or None
+        Key of `ROW_STATES`
+
+    calls: dict
+        Maps each step of the row to its call, from `_row_plan`
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_attempt_step")
+
+    driver = session.driver
+    state = ROW_STATES[step]
+    attempts = max(1, int(RETRY_POLICY["attempts"]))
+
+    # the top document's URL, even from inside a frame; what the retry reopens
+    start_url = driver.current_url if state.entered is not None else None
+    finishing = False
+
+    for attempt in range(1, attempts + 1):
+        try:
+            if finishing:
+                logger.info("finish %s", step)
+                state.finish(session.wait)
+                return None
+
+            if attempt > 1 and state.redo_from is not None:
+                logger.info("redo %s", state.redo_from)
+                calls[state.redo_from]()
+
+            calls[step]()
+            return None
+        except TRANSIENT_ERRORS as e:
+            if attempt == attempts:
+                raise
+
+            delay = min(RETRY_POLICY["max_backoff"], RETRY_POLICY["backoff"] * 2 ** (attempt - 1))
+            logger.warning(
+                "%s failed on attempt %s of %s (%s), retrying in %.1fs",
+                step or "open", attempt, attempts, type(e).__name__, delay
+            )
+
+            logger.debug("leave popups and frames")
+            # leave popups and frames
+            _reset_driver(driver, session.tab, session.tabs)
+            sleep(delay)
+
+            if state.entered is None:
+                continue
+
+            logger.debug("wait for the step's page or its outcome")
+            # wait for the step's page or its outcome, a slow save may still land
+            on_login_form = _located("login.email")
+            _wait_until(
+                session.wait,
+                _any_of(
+                    *[
+                        condition for condition in (state.done, state.submitted, state.entered, on_login_form)
+                        if condition is not None
+                    ]
+                ),
+                ceiling="page",
+                required=False
+            )
+
+            if state.done is not None and state.done(driver):
+                logger.info("%s took effect after all", step)
+                return None
+
+            if state.submitted is not None and state.submitted(driver):
+                logger.info("%s was submitted, carrying on from there", step)
+                finishing = True
+                continue
+
+            if not state.entered(driver) and not on_login_form(driver):
+                raise RuntimeError(f"lost track of the page after {step} failed") from e
+
+            logger.debug("reopen %s", start_url)
+            # reopen the page the step started on; `open` logs in again if the session has expired
+            session.open(start_url)
+            finishing = state.submitted is not None and state.submitted(driver)
+
+    return None
+
+
+class Journal:
+    """
+    Append-only record of every step each row has completed
+
+    Each line is a JSON object with the row's description, its index in the
+    ProjectBook, the step and the URL the browser was on once the step had
+    finished. Lines are flushed and fsync'd as they are written so the
+    journal survives the process or the machine going down mid-row.
+
+    Parameters
+    ----------
+    path: str
+        JSON-lines file to append to; created if missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+        # finish off a line cut short by a crash so the next record starts on its own line
+        if self._file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def record(self, index, description, step, **fields):
+        """
+        Append one step to the journal and force it to disk
+
+        Parameters
+        ----------
+        index: int
+            Row index in the ProjectBook
+
+        description: str
+            Work item name, used as the row key
+
+        step: str
+            Name of the step, "done" once the row is finished or "failed"
+
+        **fields:
+            Anything else worth keeping, e.g. `url` or `error`
+
+        Returns
+        -------
+        None
+        """
+
+        line = json.dumps(
+            {
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "index": index,
+                "row": description,
+                "step": step,
+                **fields,
+            }
+        )
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        return None
+
+    def close(self):
+        """Close the journal file"""
+
+        self._file.close()
+
+        return None
+
+    @staticmethod
+    def load(path):
+        """
+        Read a journal back into the progress of each row
+
+        Parameters
+        ----------
+        path: str
+            Journal file written by `Journal.record`
+
+        Returns
+        -------
+        progress: dict
+            Maps each row description to {"steps": {step: url}, "done": bool,
+            "failed": bool, "work_id": id or None}; "failed" is only True if
+            the last attempt at the row failed, "work_id" is the work item a
+            REST run created for it
+        """
+
+        progress = {}
+
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # a line cut short by a crash
+                    continue
+
+                row = progress.setdefault(entry["row"], {"steps": {}, "done": False, "failed": False, "work_id": None})
+                if entry.get("work_id") is not None:
+                    row["work_id"] = entry["work_id"]
+
+                if entry["step"] == "done":
+                    row["done"] = True
+                    row["failed"] = False
+                elif entry["step"] == "failed":
+                    row["failed"] = True
+                else:
+                    row["steps"][entry["step"]] = entry.get("url")
+                    row["failed"] = False
+
+        return progress
+
+
+def _latest_journal(log_dir="Logs"):
+    """
+    Find the most recently written journal
+
+    Parameters
+    ----------
+    log_dir: str
+        Folder the journals are written to
+
+    Returns
+    -------
+    path: str or None
+    """
+
+    journals = glob.glob(os.path.join(log_dir, "PRM_*_journal.jsonl"))
+
+    return max(journals, key=os.path.getmtime) if journals else None
+
+
+def _find_journal(run, log_dir="Logs"):
+    """
+    Find the journal of a run
+
+    Parameters
+    ----------
+    run: str
+        A journal path, "latest", or the run's timestamp as in
+        PRM_<timestamp>_journal.jsonl, e.g. "20261018_093000"
+
+    log_dir: str
+        Folder the journals are written to
+
+    Returns
+    -------
+    path: str or None
+    """
+
+    if run == "latest":
+        return _latest_journal(log_dir)
+
+    for path in (run, os.path.join(log_dir, f"PRM_{run}_journal.jsonl")):
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def _resume_point(row_progress):
+    """
+    Work out where a row should pick up from
+
+    Parameters
+    ----------
+    row_progress: dict or None
+        The row's entry from `Journal.load`
+
+    Returns
+    -------
+    resume_point: tuple or None
+        None to start the row from scratch, ("done", None) if it is finished,
+        (step, url) to reopen `url` and carry on after `step`, ("work_id",
+        id) if the REST backend created the work item and can carry it on by
+        its id, or ("stranded", step) if the work item exists but cannot be
+        reopened
+    """
+
+    if not row_progress or not row_progress["steps"]:
+        return None
+
+    if row_progress["done"]:
+        return "done", None
+
+    steps = row_progress["steps"]
+    completed = [step for step, _ in ROW_STEPS if step in steps]
+
+    logger = logging.getLogger("_resume_point")
+
+    for step, reopenable in reversed(ROW_STEPS):
+        if step in steps and reopenable and steps[step]:
+            logger.debug("resume after %s", step)
+            return step, steps[step]
+
+    if row_progress.get("work_id") is not None:
+        logger.debug("resume work item %s", row_progress["work_id"])
+        return "work_id", row_progress["work_id"]
+
+    # new_work_page1 saves the work item, so starting again would create a duplicate
+    return "stranded", completed[-1]
+
+
+def _row_plan(session, today_str, project_info, resume_from=None, fast_fill=False):
+    """
+    The calls that make up one row, in order
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        Logged-in (or about to be) browser session
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    project_info: ProjectInfo
+        The row to create
+
+    resume_from: tuple, optional
+        (step, url) from `_resume_point`
+
+    fast_fill: bool
+        Use `new_work_page1_fast` and `new_work_page2_fast`
+
+    Returns
+    -------
+    plan: list
+        (step, call) pairs; the first opens the page the row starts on and
+        has step None, the others are named after `ROW_STEPS`
+    """
+
+    logger = logging.getLogger("_row_plan")
+
+    driver = session.driver
+    wait = session.wait
+
+    steps = {
+        "new_work_page1": lambda: new_work_page1(wait, today_str, project_info.description),
+        "new_work_page2": lambda: new_work_page2(wait, today_str, project_info.bi_service_name),
+        "work_and_assignments": lambda: work_and_assignments(
+            wait,
+            driver,
+            project_info.bi_assignment_owner_name,
+            project_info.bi_team_name
+        ),
+        "open_resource_search_window": lambda: open_resource_search_window(wait, driver),
+        "allocate": lambda: allocate(driver, wait, project_info.resource),
+        "navigate_to_work_view": lambda: navigate_to_work_view(wait),
+        "edit_work_detail": lambda: edit_work_detail(driver, wait),
+        "describe_and_categorize_bi": lambda: describe_and_categorize_bi(
+            wait,
+            driver,
+            project_info.bi_swim_lane_name,
+            project_info.executive_sponsor_name,
+            project_info.bi_business_owner_name,
+            project_info.bi_domain_name,
+            project_info.requestor_name,
+            project_info.bi_liaison_name,
+            project_info.work_description_text,
+            project_info.business_need_text
+        ),
+    }
+    if fast_fill:
+        steps["new_work_page1"] = lambda: new_work_page1_fast(driver, wait, today_str, project_info.description)
+        steps["new_work_page2"] = lambda: new_work_page2_fast(driver, wait, today_str, project_info.bi_service_name)
+
+    step_names = [step for step, _ in ROW_STEPS]
+
+    if resume_from is None:
+        plan = [(None, session.open_new_work)]
+        remaining = step_names
+    else:
+        last_step, url = resume_from
+        logger.info("resume %s after %s", project_info.description, last_step)
+        plan = [(None, functools.partial(session.open, url))]
+        remaining = step_names[step_names.index(last_step) + 1:]
+
+    return plan + [(step, steps[step]) for step in remaining]
+
+
+def process_row(session, today_str, project_info, index=None, journal=None, resume_from=None, fast_fill=False):
+    """
+    Create one work item from start to finish
+
+    Parameters
+    ----------
+    session: PlanviewSession
+        Logged-in (or about to be) browser session
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    project_info: ProjectInfo
+        The row to create
+
+    index: int, optional
+        Row index in the ProjectBook, for the journal
+
+    journal: Journal, optional
+        Records each step as soon as it is done
+
+    resume_from: tuple, optional
+        (step, url) from `_resume_point`; reopens `url` and runs the steps
+        after `step` instead of starting a new work item
+
+    fast_fill: bool
+        Fill the New Work pages with one script execution each, see
+        `new_work_page1_fast`
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    A step that fails on something transient is retried on its own, see
+    `_run_step`; the row only fails once a step has run out of attempts.
+    """
+
+    logger = logging.getLogger("process_row")
+
+    plan = _row_plan(session, today_str, project_info, resume_from, fast_fill)
+    calls = dict(plan)
+
+    for step, _ in plan:
+        logger.info(*_step_message(step, project_info, resume_from))
+        _run_step(session, step, calls)
+
+        if step is not None and journal is not None:
+            journal.record(index, project_info.description, step, url=session.driver.current_url)
+
+    if journal is not None:
+        journal.record(index, project_info.description, "done")
+
+    logger.debug("return None")
+    return None
+
+
+async def process_row_async(session, today_str, project_info, index=None, journal=None, resume_from=None, fast_fill=False):
+    """
+    Awaitable `process_row`
+
+    Each step, retries included, still blocks on Selenium, so it runs on a
+    worker thread with `asyncio.to_thread`; the event loop carries on with other sessions'
+    rows in the meantime. Takes the same parameters as `process_row`.
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("process_row_async")
+
+    plan = _row_plan(session, today_str, project_info, resume_from, fast_fill)
+    calls = dict(plan)
+
+    for step, _ in plan:
+        logger.info(*_step_message(step, project_info, resume_from))
+        await asyncio.to_thread(_run_step, session, step, calls)
+
+        if step is not None and journal is not None:
+            # reading the URL and the fsync'd write both block; keep them off the loop
+            url = await asyncio.to_thread(lambda: session.driver.current_url)
+            await asyncio.to_thread(journal.record, index, project_info.description, step, url=url)
+
+    if journal is not None:
+        await asyncio.to_thread(journal.record, index, project_info.description, "done")
+
+    logger.debug("return None")
+    return None
+
+
+def _step_message(step, project_info, resume_from=None):
+    """
+    What to log as a step of `project_info` starts, as a format string and
+    its arguments for `logger.info(*...)`, so nothing is formatted unless
+    the record is emitted
+    """
+
+    if step is None:
+        return ("open_new_work",) if resume_from is None else ("open %s", resume_from[1])
+    if step == "new_work_page1":
+        return "new_work_page1 %s", project_info.description
+    return "%s", step
+
+
+# URL patterns dropped by `create_driver(block_resources=True)`; none of
+# them hold anything the step functions read or click
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*newrelic.com*", "*nr-data.net*", "*pendo.io*", "*hotjar.com*",
+]
+
+
+def create_driver(browser="edge", headless=False, block_resources=False, window_size=(1280, 800)):
+    """
+    Start a browser session
+
+    Parameters
+    ----------
+    browser: str
+        "edge" or "chrome"
+
+    headless: bool
+        Run without a visible window
+
+    block_resources: bool
+        Drop images, fonts, media and analytics requests (`BLOCKED_URL_PATTERNS`)
+
+    window_size: tuple
+        Width and height of the window, in pixels; also the headless viewport
+
+    Returns
+    -------
+    driver: selenium.webdriver.edge.webdriver.WebDriver or selenium.webdriver.chrome.webdriver.WebDriver
+    """
+
+    logger = logging.getLogger("create_driver")
+
+    logger.debug("define options")
+    # define options
+    options = EdgeOptions() if browser == "edge" else Options()
+    if browser == "edge":
+        options.use_chromium = True
+
+    if headless:
+        options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+
+    if block_resources:
+        # images are also switched off at the renderer so popups skip them too
+        options.add_argument("--blink-settings=imagesEnabled=false")
+
+    # network events only, for `_network_is_idle`,
+    # and the console, for `capture_failure`
+    options.set_capability(
+        "ms:loggingPrefs" if browser == "edge" else "goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"}
+    )
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    logger.debug("create %s driver", browser)
+    # create driver
+    if browser == "edge":
+        driver = webdriver.Edge(executable_path="msedgedriver.exe", options=options)
+    elif browser == "chrome":
+        driver = webdriver.Chrome(options=options)
+    else:
+        raise ValueError(f"unknown browser {browser!r}, expected 'edge' or 'chrome'")
+
+    if block_resources:
+        logger.debug("block non-essential requests")
+        # block non-essential requests
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+    logger.debug("return driver")
+    return driver
+
+
+def _reset_driver(driver, main_window=None, keep=()):
+    """
+    Close any leftover popups and go back to the top of the main window
+
+    Used after a failed row so the next row does not start inside a frame
+    or a resource search window.
+
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
+
+    main_window: str, optional
+        Handle to end up on, defaults to the first window
+
+    keep: tuple
+        Handles that are not popups, e.g. other rows' tabs in `run_pipeline`
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("_reset_driver")
+
+    main_window = main_window or driver.window_handles[0]
+
+    logger.debug("close popup windows")
+    # close popup windows
+    for handle in driver.window_handles:
+        if handle != main_window and handle not in keep:
+            driver.switch_to.window(handle)
+            driver.close()
+
+    logger.debug("switch to main window")
+    # switch to main window
+    driver.switch_to.window(main_window)
+    driver.switch_to.default_content()
+    _forget_elements(driver)
+
+    logger.debug("return None")
+    return None
+
+
+# A backend creates whole work items for one worker. Every backend has
+#   process_row(today_str, project_info, index=None, journal=None, resume_from=None)
+#   process_row_async(...)  -- the same, awaitable
+#   tabs                    -- rows it can keep in progress at once, see `run_pipeline`
+#   recover()  -- get back to a clean state after a failed row
+#   close()    -- release whatever the worker was holding
+# `run_rows` builds one backend per worker from the factory it is given.
+class BrowserBackend:
+    """
+    Creates work items by driving PRM in a browser of its own
+
+    Parameters
+    ----------
+    driver_options: dict, optional
+        Keyword arguments for `create_driver`
+
+    fast_fill: bool
+        Passed on to `process_row`
+
+    tabs: int
+        Rows to keep in progress at once in separate tabs, see `run_pipeline`
+    """
+
+    def __init__(self, driver_options=None, fast_fill=False, tabs=1):
+        logger = logging.getLogger("BrowserBackend")
+
+        logger.info("create driver")
+        # create driver
+        self.driver = create_driver(**(driver_options or {}))
+
+        logger.info("define wait")
+        # define wait
+        self.wait = WebDriverWait(driver=self.driver, timeout=30)
+
+        logger.debug("define session")
+        # define session
+        self.session = PlanviewSession(self.driver, self.wait)
+
+        self.fast_fill = fast_fill
+        self.tabs = tabs
+
+    @staticmethod
+    def _refuse_existing(project_info, resume_from):
+        """Raise for a work item that exists but is incomplete"""
+
+        if resume_from is not None and resume_from[0] == "work_id":
+            raise RuntimeError(
+                f"work item {resume_from[1]} was created over the REST API and is incomplete,"
+                " finish it with --backend rest"
+            )
+
+        if resume_from is not None and resume_from[0] == "existing":
+            # there is no URL to reopen an arbitrary work item's pages by
+            missing = _missing_steps(resume_from[1], project_info)
+            raise RuntimeError(
+                f"work item {resume_from[1]['id']} already exists without {', '.join(missing)},"
+                " finish it by hand or with --backend rest"
+            )
+
+        return None
 
-    logger.debug("click button")
-    # click button
-    search_button.click()
+    def process_row(self, today_str, project_info, index=None, journal=None, resume_from=None):
+        """Create one work item, see `process_row`"""
 
-    logger.debug("switch to previous frame")
-    # switch to previous frame
-    driver.switch_to.parent_frame()
+        self._refuse_existing(project_info, resume_from)
 
-    logger.debug("locate search list frame")
-    # locate search list frame
-    search_list_frame = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "frame[id='frameSearchList']")
-        )
-    )
+        return process_row(self.session, today_str, project_info, index, journal, resume_from, self.fast_fill)
 
-    logger.debug("switch to search list frame")
-    # switch to search list frame
-    driver.switch_to.frame(search_list_frame)
+    async def process_row_async(self, today_str, project_info, index=None, journal=None, resume_from=None):
+        """Create one work item a step at a time, see `process_row_async`"""
 
-    logger.debug("locate checkbox input")
-    # locate checkbox input
-    checkbox_input = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[type='checkbox'][name='sel_list']")
-        )
-    )
+        self._refuse_existing(project_info, resume_from)
 
-    logger.debug("click checkbox")
-    # click checkbox
-    checkbox_input.click()
+        await process_row_async(self.session, today_str, project_info, index, journal, resume_from, self.fast_fill)
 
-    logger.debug("switch to previous frame")
-    # switch to previous frame
-    driver.switch_to.parent_frame()
+    def recover(self):
+        """Close leftover popups and leave any frame, see `_reset_driver`"""
 
-    logger.debug("switch to previous frame (i.e. outermost frame)")
-    # switch to previous frame (i.e. outermost frame)
-    driver.switch_to.parent_frame()
+        return _reset_driver(self.driver)
 
-    logger.debug("locate OK button")
-    # locate OK button
-    ok_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[type='button'][value='OK']")
+    def close(self):
+        """Quit the browser"""
+
+        logging.getLogger("BrowserBackend").info("quit after %s log-in(s)", self.session.logins)
+        _NETWORK_ACTIVITY.pop(self.driver.session_id, None)
+        self.driver.quit()
+
+        return None
+
+
+# Planview REST API paths, relative to BASE_URL; "{placeholders}" are filled
+# in per request. Change them with `configure_rest_endpoints`.
+REST_ENDPOINTS = {
+    "token": "/api/v1/token",
+    "work": "/api/v1/work",
+    "work_item": "/api/v1/work/{work_id}",
+    "allocations": "/api/v1/work/{work_id}/allocations",
+    "resources": "/api/v1/resources",
+    "picklist": "/api/v1/picklists/{name}",
+}
+
+
+def configure_rest_endpoints(**paths):
+    """
+    Change the REST API paths
+
+    Parameters
+    ----------
+    **paths: str
+        New path for any key of `REST_ENDPOINTS`, e.g. `work="/api/v2/work"`
+
+    Returns
+    -------
+    None
+    """
+
+    unknown = set(paths) - set(REST_ENDPOINTS)
+    if unknown:
+        raise ValueError(f"unknown REST endpoint(s): {', '.join(sorted(unknown))}")
+
+    REST_ENDPOINTS.update(paths)
+
+    return None
+
+
+class PlanviewApiError(Exception):
+    """A Planview REST call answered with an error status or not with JSON"""
+
+    def __init__(self, method, path, status, body):
+        super().__init__(f"{method} {path} returned {status}: {body[:200]}")
+        self.status = status
+
+
+class PlanviewClient:
+    """
+    Planview REST API client with a pool of kept-alive connections
+
+    Connections are opened as they are needed, up to `pool_size` are kept
+    for reuse, and every worker thread can share one client. The bearer
+    token is fetched with the same credentials the log-in form uses, on
+    the first call and again whenever the API answers 401.
+
+    Parameters
+    ----------
+    base_url: str, optional
+        Scheme and host, defaults to `BASE_URL`
+
+    pool_size: int
+        Most idle connections to keep
+
+    timeout: float
+        Seconds to wait for the server on each call
+    """
+
+    def __init__(self, base_url=None, pool_size=4, timeout=30):
+        url = urlsplit(base_url or BASE_URL)
+        self._connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
         )
+        self._host = url.netloc
+        self._prefix = url.path.rstrip("/")
+        self.timeout = timeout
+
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._token = None
+        self._token_lock = threading.Lock()
+
+        # number of tokens fetched and connections opened, for the log
+        self.logins = 0
+        self.connections = 0
+
+    def _acquire(self):
+        """An idle connection from the pool, or a new one"""
+
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            self.connections += 1
+            return self._connection_class(self._host, timeout=self.timeout)
+
+    def _release(self, connection):
+        """Put `connection` back in the pool, or close it if the pool is full"""
+
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+        return None
+
+    def _send(self, method, path, payload, headers):
+        """
+        Send one request on a pooled connection
+
+        Returns
+        -------
+        status: int
+
+        content_type: str
+
+        data: bytes
+        """
+
+        connection = self._acquire()
+        try:
+            reused = connection.sock is not None
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # the server dropped the idle connection before reading the request
+                connection.close()
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+
+            # the body has to be read in full before the connection can be reused
+            data = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        self._release(connection)
+
+        return response.status, response.getheader("Content-Type", ""), data
+
+    def _bearer(self):
+        """The current token, fetching one if there is none"""
+
+        with self._token_lock:
+            if self._token is None:
+                logging.getLogger("PlanviewClient").info("fetch token")
+                token = self.request(
+                    "POST",
+                    "token",
+                    body={"username": os.getenv("email"), "password": os.getenv("pass")},
+                    authenticate=False
+                )
+                if not isinstance(token, dict) or "access_token" not in token:
+                    raise PlanviewApiError("POST", self._prefix + REST_ENDPOINTS["token"], 200, "no access_token in answer")
+                self._token = token["access_token"]
+                self.logins += 1
+
+            return self._token
+
+    def _expire(self, token):
+        """Forget `token` unless another thread has already replaced it"""
+
+        with self._token_lock:
+            if self._token == token:
+                self._token = None
+
+        return None
+
+    def request(self, method, endpoint, body=None, query=None, authenticate=True, **params):
+        """
+        Call the API and decode its JSON answer
+
+        Parameters
+        ----------
+        method: str
+            HTTP method
+
+        endpoint: str
+            Key of `REST_ENDPOINTS`
+
+        body: dict or list, optional
+            Sent as JSON
+
+        query: dict, optional
+            Query string parameters
+
+        authenticate: bool
+            Send the bearer token, and fetch a new one if it has expired
+
+        **params:
+            Values for the placeholders in the endpoint path
+
+        Returns
+        -------
+        data: object
+            Decoded JSON, None if a 204 had no body
+
+        Raises
+        ------
+        PlanviewApiError
+            The answer was not 2xx (a 3xx is usually a redirect to the log-in
+            page), was not JSON, or could not be decoded
+        """
+
+        logger = logging.getLogger("PlanviewClient.request")
+
+        path = self._prefix + REST_ENDPOINTS[endpoint].format(**params)
+        if query:
+            path += "?" + urlencode(query)
+
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        for attempt in range(2):
+            if authenticate:
+                token = self._bearer()
+                headers["Authorization"] = f"Bearer {token}"
+
+            logger.debug("%s %s", method, path)
+            status, content_type, data = self._send(method, path, payload, headers)
+
+            if status == 401 and authenticate and attempt == 0:
+                logger.info("token expired")
+                self._expire(token)
+                continue
+            break
+
+        text = data.decode("utf-8", "replace")
+        if not 200 <= status < 300:
+            raise PlanviewApiError(method, path, status, text)
+
+        if status == 204 and not data:
+            return None
+
+        if content_type.split(";")[0].strip().lower() != "application/json":
+            raise PlanviewApiError(method, path, status, f"expected JSON, got {content_type or 'no content type'}: {text}")
+
+        try:
+            return json.loads(data)
+        except ValueError:
+            raise PlanviewApiError(method, path, status, f"undecodable JSON: {text}") from None
+
+    def close(self):
+        """Close every pooled connection"""
+
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+        return None
+
+
+def _work_and_assignments_attributes(project_info):
+    """The attributes `work_and_assignments` sets in the grid"""
+
+    return {
+        "status_flag": "Y",
+        "bi_assignment_owner": project_info.bi_assignment_owner_name,
+        "bi_team": project_info.bi_team_name,
+    }
+
+
+def _describe_and_categorize_bi_attributes(project_info):
+    """The attributes `describe_and_categorize_bi` sets in the editor"""
+
+    return {
+        "bi_swim_lane": project_info.bi_swim_lane_name,
+        "bi_work_type": "3036593",
+        "executive_sponsor": project_info.executive_sponsor_name,
+        "bi_business_owner": project_info.bi_business_owner_name,
+        "bi_domain": project_info.bi_domain_name,
+        "requestor": project_info.requestor_name,
+        "bi_liaison": project_info.bi_liaison_name,
+        "work_description": project_info.work_description_text,
+        "business_need": project_info.business_need_text,
+    }
+
+
+@_timed
+def create_work_item(client, today_str, project_info):
+    """
+    Create the work item with everything the two New Work pages and the Work
+    and Assignments grid set
+
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
+
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
+
+    project_info: ProjectInfo
+        The row to create
+
+    Returns
+    -------
+    work_id: int
+    """
+
+    logger = logging.getLogger("create_work_item")
+
+    logger.debug("post work item")
+    # post work item
+    work = client.request(
+        "POST",
+        "work",
+        body={
+            "workstream": "Business Intelligence",
+            "description": project_info.description,
+            "work_type": "3036594",
+            "requested_start": today_str,
+            "requested_finish": _get_end_of_month(today_str),
+            "bi_service_name": project_info.bi_service_name,
+            "bi_scoped_date": today_str,
+            "bi_date_created": today_str,
+            **_work_and_assignments_attributes(project_info),
+        }
     )
 
-    logger.debug("click OK button")
-    # click OK button
-    ok_button.click()
+    logger.debug("return work_id")
+    return work["id"]
 
-    logger.debug("get main window handle")
-    # switch back to main window
-    main_window = driver.window_handles[0]
 
-    logger.debug("switch to main window")
-    # switch to main window
-    driver.switch_to.window(main_window)
+@_timed
+def update_describe_and_categorize_bi(client, work_id, project_info):
+    """
+    Set the attributes `describe_and_categorize_bi` sets in the browser
+
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
+
+    work_id: int
+        The work item to update
+
+    project_info: ProjectInfo
+        The row being created
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("update_describe_and_categorize_bi")
+
+    logger.debug("patch work item")
+    # patch work item
+    client.request("PATCH", "work_item", work_id=work_id, body=_describe_and_categorize_bi_attributes(project_info))
 
     logger.debug("return None")
     return None
 
 
-def navigate_to_work_view(wait):
-    """"""
+@_timed
+def update_work_and_assignments(client, work_id, project_info):
+    """
+    Set the grid attributes of a work item that was saved without them
 
-    #
-    action_menu_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "span[class='pv12MenuAffordanceIcon'][title='Actions']")
-        )
-    )
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
 
-    #
-    action_menu_button.click()
+    work_id: int
+        The work item to update
 
-    #
-    work_view_button = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "li[title='Work View'] > span[class='bannerMenuItemText']")
-        )
-    )
+    project_info: ProjectInfo
+        The row being created
 
-    #
-    work_view_button.click()
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("update_work_and_assignments")
 
+    logger.debug("patch work item")
+    # patch work item
+    client.request("PATCH", "work_item", work_id=work_id, body=_work_and_assignments_attributes(project_info))
+
+    logger.debug("return None")
     return None
 
 
-def edit_work_detail(driver, wait):
-    """"""
+@_timed
+def find_resource(client, resource):
+    """
+    Look up a resource the way the resource search popup does
 
-    #
-    describe_and_categorize_tab = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='Describe & Categorize BI']")
-        )
-    )
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
 
-    #
-    describe_and_categorize_tab.click()
+    resource: str
+        Resource description from the ProjectBook
 
-    sleep(2)
+    Returns
+    -------
+    resource_id: str
+    """
 
-    #
-    iframe = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "iframe[name='pv-iframeSets-ConfiguredScreens59']")
-        )
-    )
+    logger = logging.getLogger("find_resource")
 
-    #
-    driver.switch_to.frame(iframe)
+    logger.debug("search for %s", resource)
+    # search for <resource>
+    matches = client.request("GET", "resources", query={"description": resource})
 
-    #
-    edit_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='Edit']")
-        )
-    )
+    if not matches:
+        raise LookupError(f"no resource matches {resource!r}")
 
-    #
-    edit_button.click()
+    logger.debug("return resource_id")
+    return str(matches[0]["id"])
 
-    return None
 
+@_timed
+def create_allocation(client, work_id, resource_id):
+    """
+    Allocate a resource to the work item
 
-def bi_swim_lane(wait, bi_swim_lane_name):
-    """"""
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
 
-    #
-    bi_swim_lanes_label = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//*[text()='BI Swim Lanes']")
-        )
-    )
+    work_id: int
+        The work item
 
-    #
-    bi_swim_lanes_selector = bi_swim_lanes_label.parent.find_element_by_css_selector(
-        f"option[value='{bi_swim_lane_name}']")
+    resource_id: str
+        Output of `find_resource`
 
-    #
-    bi_swim_lanes_selector.click()
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("create_allocation")
 
+    logger.debug("post allocation")
+    # post allocation
+    client.request("POST", "allocations", work_id=work_id, body={"resource_id": resource_id})
+
+    logger.debug("return None")
     return None
 
 
-def bi_work_type(wait):
-    """"""
+def fetch_picklists(client, names=None):
+    """
+    Snapshot picklist options from the REST API into `PICKLIST_CACHE`
 
-    #
-    bi_work_type_selector = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//label[text()='BI Work Type']/parent::div//select/option[@value='3036593']")
-        )
-    )
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
 
-    #
-    bi_work_type_selector.click()
+    names: list, optional
+        Picklists to fetch, defaults to every stale one in `PICKLIST_FIELDS`
+
+    Returns
+    -------
+    None
+    """
+
+    logger = logging.getLogger("fetch_picklists")
+
+    if names is None:
+        names = [name for name in PICKLIST_FIELDS if PICKLIST_CACHE.get(name) is None]
+
+    for name in names:
+        logger.debug("get %s options", name)
+        # get <name> options
+        values = client.request("GET", "picklist", name=name)
+        if not isinstance(values, list):
+            raise ValueError(f"{name} options are not a list: {values!r:.200}")
+        PICKLIST_CACHE.put(name, [str(value) for value in values])
 
     return None
 
 
-def executive_sponsor(wait, driver, executive_sponsor_name):
-    """"""
+def _normalize_description(description):
+    """Work item name as compared against existing work: case and spacing ignored"""
 
-    #
-    executive_sponsor_input = wait.until(
-        EC.presence_of_element_located(
-            (
-                By.XPATH,
-                "//label[text()='Executive Sponsor']"
-                "/parent::div"
-                "//div[@class='attribute-field']"
-                "//div[@class='editor-container datapicker-container required']"
-                "//div[@class='data-picker-form-field-container attribute-part']"
-                "//span[@class='pickerplusmain pickerplusmaingrid']"
-                "//input[@type='text']"
-            )
+    return " ".join(str(description).split()).casefold()
+
+
+@_timed
+def fetch_existing_work(client, month, year, page_size=100):
+    """
+    Index this month's BI work items that already exist in Planview
+
+    Parameters
+    ----------
+    client: PlanviewClient
+        REST client
+
+    month: str
+        Name of the current month
+
+    year: int
+        The current year
+
+    page_size: int
+        Work items asked for per call
+
+    Returns
+    -------
+    existing: dict
+        Maps each normalized description (`_normalize_description`) to the
+        work item; the oldest one wins if a name is used twice
+    """
+
+    logger = logging.getLogger("fetch_existing_work")
+
+    existing = {}
+    offset = 0
+
+    while True:
+        logger.debug("list work items from %s", offset)
+        # list work items from <offset>
+        page = client.request(
+            "GET",
+            "work",
+            query={
+                "workstream": "Business Intelligence",
+                "description_startswith": f"{month} {year} ",
+                "limit": page_size,
+                "offset": offset,
+            }
         )
-    )
 
-    sleep(1)  # slow down
+        for work in page:
+            key = _normalize_description(work["description"])
+            if key in existing:
+                logger.warning("work item %s repeats %r, using %s", work["id"], work["description"], existing[key]["id"])
+                continue
+            existing[key] = work
 
-    #
-    # executive_sponsor_input.click()  # not interactable
-    # executive_sponsor_input.clear()  # not interactable
+        if len(page) < page_size:
+            break
+        offset += page_size
 
-    actions = ActionChains(driver=driver)
+    logger.info("%s existing work item(s) for %s %s", len(existing), month, year)
 
-    actions.move_to_element(executive_sponsor_input)
-    actions.click()
-    actions.send_keys(executive_sponsor_name)
-    actions.perform()
+    logger.debug("return existing")
+    return existing
 
-    #
-    # executive_sponsor_input.send_keys(executive_sponsor_name)
 
-    return None
+def _missing_steps(work, project_info):
+    """
+    Steps whose attributes an existing work item is still missing
+
+    Parameters
+    ----------
+    work: dict
+        The work item, from `fetch_existing_work`
 
+    project_info: ProjectInfo
+        The row it was created for
 
-def bi_business_owner(wait, driver, bi_business_owner_name):
-    """"""
+    Returns
+    -------
+    missing: tuple
+        Names from `ROW_STEPS`, empty if the work item is complete
+    """
+
+    def blank(attributes):
+        return any(not work.get(attribute) for attribute in attributes)
+
+    missing = []
+    if blank(_work_and_assignments_attributes(project_info)):
+        missing.append("work_and_assignments")
+    if not work.get("allocations"):
+        missing.append("allocate")
+    if blank(_describe_and_categorize_bi_attributes(project_info)):
+        missing.append("describe_and_categorize_bi")
+
+    return tuple(missing)
+
+
+class RestBackend:
+    """
+    Creates work items through the Planview REST API, no browser needed
+
+    Parameters
+    ----------
+    client: PlanviewClient
+        Shared by every worker; its connection pool is what they share
+    """
+
+    # rows are never pipelined; the API calls are short and there is no page to wait on
+    tabs = 1
+
+    def __init__(self, client):
+        self.client = client
+
+    def process_row(self, today_str, project_info, index=None, journal=None, resume_from=None):
+        """
+        Create one work item with three calls instead of the browser steps
+
+        The journal gets "new_work_page1" (with the work item's id) once the
+        item exists, so a browser run resuming the journal treats the row
+        like one the browser had saved, and "done" at the end.
+
+        Parameters
+        ----------
+        today_str: str
+            Today's date formatted as mm/dd/yyyy
+
+        project_info: ProjectInfo
+            The row to create
+
+        index: int, optional
+            Row index in the ProjectBook, for the journal
+
+        journal: Journal, optional
+            Records each step as soon as it is done
+
+        resume_from: tuple, optional
+            ("existing", work) to only fill in what an existing work item is
+            missing (`_missing_steps`), or ("work_id", id) to do the same for
+            the item an earlier REST run journaled; browser pages cannot be
+            carried on over the API
+
+        Returns
+        -------
+        None
+        """
+
+        logger = logging.getLogger("RestBackend.process_row")
+
+        if resume_from is None:
+            logger.info("create_work_item %s", project_info.description)
+            work_id = create_work_item(self.client, today_str, project_info)
+            if journal is not None:
+                journal.record(index, project_info.description, "new_work_page1", work_id=work_id)
+            missing = ("allocate", "describe_and_categorize_bi")
+        elif resume_from[0] in ("existing", "work_id"):
+            work = resume_from[1]
+            if resume_from[0] == "work_id":
+                logger.info("get work item %s", work)
+                work = self.client.request("GET", "work_item", work_id=work)
+            work_id = work["id"]
+            missing = _missing_steps(work, project_info)
+            logger.info("complete work item %s %s: %s", work_id, project_info.description, ", ".join(missing))
+        else:
+            raise ValueError(f"cannot carry on from browser step {resume_from[0]} over the REST API")
+
+        if "work_and_assignments" in missing:
+            logger.info("update_work_and_assignments")
+            update_work_and_assignments(self.client, work_id, project_info)
+
+        if "describe_and_categorize_bi" in missing:
+            logger.info("update_describe_and_categorize_bi")
+            update_describe_and_categorize_bi(self.client, work_id, project_info)
+
+        if "allocate" in missing:
+            logger.info("allocate")
+            self._allocate(work_id, project_info.resource)
+
+        if journal is not None:
+            journal.record(index, project_info.description, "done", work_id=work_id)
+
+        logger.debug("return None")
+        return None
+
+    async def process_row_async(self, today_str, project_info, index=None, journal=None, resume_from=None):
+        """Awaitable `process_row`, the calls run on a worker thread"""
 
-    #
-    bi_business_owner_input = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//label[text()='BI Business Owner']/parent::div//input")
-        )
-    )
+        await asyncio.to_thread(self.process_row, today_str, project_info, index, journal, resume_from)
 
-    sleep(1)  # slow down
+    def _allocate(self, work_id, resource):
+        """
+        Allocate `resource` by its cached id, looking the id up only if it is
+        not cached or Planview no longer accepts it
 
-    #
-    # bi_business_owner_input.click()  # not interactable
-    # bi_business_owner_input.clear()  # not interactable
+        Returns
+        -------
+        None
+        """
 
-    actions = ActionChains(driver=driver)
+        resource_id = RESOURCE_IDS.get(resource)
+        if resource_id is not None:
+            try:
+                return create_allocation(self.client, work_id, resource_id)
+            except PlanviewApiError as e:
+                if e.status not in (400, 404, 422):
+                    raise
+                logging.getLogger("RestBackend").warning("cached resource %s rejected, look %s up again", resource_id, resource)
+                RESOURCE_IDS.forget(resource)
 
-    actions.move_to_element(bi_business_owner_input)
-    actions.click()
-    actions.send_keys(bi_business_owner_name)
-    actions.perform()
+        resource_id = find_resource(self.client, resource)
+        RESOURCE_IDS.put(resource, resource_id)
 
-    #
-    # bi_business_owner_input.send_keys(bi_business_owner_name)
+        return create_allocation(self.client, work_id, resource_id)
 
-    return None
+    def recover(self):
+        """Nothing to clean up between rows"""
 
+        return None
+
+    def close(self):
+        """The client outlives the worker, `run_rows`' caller closes it"""
 
-def bi_domain(wait, driver, bi_domain_name):
-    """"""
+        return None
 
-    #
-    bi_domain_input = wait.until(
-        EC.presence_of_element_located(
-            (
-                By.XPATH,
-                "//label[text()='BI Domain']/parent::div//input[@type='text']"
-            )
-        )
-    )
 
-    sleep(1)  # slow down
+def _result(index, description, ok, seconds, error=None, skipped=False):
+    """
+    Build the outcome record of one row
 
-    #
-    # bi_domain_input.click()  # not interactable?
-    # bi_domain_input.clear()
+    Returns
+    -------
+    result: dict
+    """
 
-    actions = ActionChains(driver=driver)
+    return {
+        "index": index,
+        "description": description,
+        "ok": ok,
+        "skipped": skipped,
+        "seconds": seconds,
+        "error": error,
+    }
 
-    actions.move_to_element(bi_domain_input)
-    actions.click()
-    actions.send_keys(bi_domain_name)
-    actions.perform()
 
-    #
-    # bi_domain_input.send_keys(bi_domain_name)
+def run_worker(rows, today_str, results, journal=None, make_backend=BrowserBackend):
+    """
+    Work through rows from a shared queue with a backend of its own
 
-    return None
+    Parameters
+    ----------
+    rows: queue.Queue
+        Holds (index, project_info, resume_from) tuples; shared by every worker
 
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
 
-def requestor(wait, driver, requestor_name):
-    """"""
+    results: list
+        Each finished row appends a dict with its outcome
 
-    #
-    requestor_input = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//label[text()='Requestor']/parent::div//input[@type='text']")
-        )
-    )
+    journal: Journal, optional
+        Records each step as soon as it is done
 
-    sleep(1)  # slow down
+    make_backend: callable
+        Builds this worker's backend, e.g. `BrowserBackend`
 
-    actions = ActionChains(driver=driver)
+    Returns
+    -------
+    None
+    """
 
-    actions.move_to_element(requestor_input)
-    actions.click()
-    actions.send_keys(requestor_name)
-    actions.perform()
+    logger = logging.getLogger("run_worker")
+
+    if rows.empty():
+        # the other workers have taken every row already
+        logger.debug("return None")
+        return None
+
+    logger.debug("create backend")
+    # create backend
+    backend = make_backend()
+
+    try:
+        if backend.tabs > 1:
+            run_pipeline(backend, rows, today_str, results, journal)
+
+        while True:
+            try:
+                index, project_info, resume_from = rows.get_nowait()
+            except queue.Empty:
+                break
+
+            _current_row.set(index)
+
+            start = perf_counter()
+            try:
+                backend.process_row(today_str, project_info, index, journal, resume_from)
+            except Exception as e:
+                logger.exception("row %s failed: %s", index, project_info.description)
+                error = f"{type(e).__name__}: {e}".strip()
+                if journal is not None:
+                    journal.record(index, project_info.description, "failed", error=error)
+                results.append(_result(index, project_info.description, False, perf_counter() - start, error))
+                backend.recover()
+            else:
+                results.append(_result(index, project_info.description, True, perf_counter() - start))
+
+    finally:
+        backend.close()
 
+    logger.debug("return None")
     return None
 
 
-def bi_liaison(wait, driver, bi_liaison_name):
-    """"""
-
-    #
-    bi_liaison_select = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, f"//label[text()='BI Liason']/parent::div//select")
-        )
-    )
+# steps that leave the browser in a popup or inside a frame; the step after
+# them runs straight away, before switching to another tab loses that context
+_CHAINED_STEPS = {"open_resource_search_window", "edit_work_detail"}
 
-    actions = ActionChains(driver=driver)
 
-    actions.click(bi_liaison_select)
-    actions.perform()
+def _step_is_ready(driver, step, waiting_since, page_is_ready):
+    """
+    True once the page `step` starts on has loaded in the current tab, or
+    once it has been waited for longer than the "page" ceiling (the step's
+    own waits then decide)
 
-    bi_liaison_click = bi_liaison_select.find_element_by_css_selector(f"option[value='{bi_liaison_name}']")
+    Parameters
+    ----------
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        The driver used to control the browser
 
-    #
-    bi_liaison_click.click()
+    step: str or None
+        Key of `ROW_STATES`
 
-    return None
+    waiting_since: float
+        `perf_counter()` when the previous step of the row finished
 
+    page_is_ready: callable
+        The tab's `_page_is_ready()` condition for this wait, reused across
+        polls so it can tell a long-lived request from a short one
 
-def work_description(wait, driver, work_description_text):
-    """"""
+    Returns
+    -------
+    ready: bool
+    """
 
-    #
-    work_description_text_area = wait.until(
-        EC.presence_of_element_located(
-            (
-                By.XPATH,
-                "//div[@title='Detailed Work Description.']"
-                "//div[@class='CodeMirror cm-s-paper CodeMirror-wrap']"
-                "//div[@class='CodeMirror-lines']"
-            )
-        )
-    )
+    state = ROW_STATES[step]
 
-    #
-    # work_description_text_area.click()
+    if state.entered is None or perf_counter() - waiting_since > WAIT_CEILINGS["page"]:
+        return True
 
-    #
-    actions = ActionChains(driver=driver)
+    try:
+        if not page_is_ready(driver):
+            return False
+        return bool(state.entered(driver) or (state.done is not None and state.done(driver)))
+    except WebDriverException:
+        # the tab is mid-navigation
+        return False
 
-    #
-    actions.click(work_description_text_area)
-    actions.send_keys(work_description_text)
-    actions.perform()
 
-    return None
+def run_pipeline(backend, rows, today_str, results, journal=None):
+    """
+    Keep `backend.tabs` rows in progress at once in tabs of one browser
 
+    Every row gets a tab of its own in the logged-in browser. After each
+    step the row's tab is left to load (a save, or the next page) while the
+    other tabs are visited, and a row's next step only runs once the page it
+    starts on is there (`ROW_STATES`), so time spent waiting on the server
+    overlaps instead of adding up. One browser and one log-in serve every
+    tab.
 
-def business_need(wait, driver, business_need_text):
-    """"""
+    Parameters
+    ----------
+    backend: BrowserBackend
+        The worker's browser
 
-    #
-    business_need_text_area = wait.until(
-        EC.presence_of_element_located(
-            (
-                By.XPATH,
-                f"//label[text()='Business Need']/parent::div/div[@class='attribute-field']"
-                "//div[@class='CodeMirror cm-s-paper CodeMirror-wrap']"
-                "//div[@class='CodeMirror-lines']"
-            )
-        )
-    )
+    rows: queue.Queue
+        Holds (index, project_info, resume_from) tuples; shared by every worker
 
-    #
-    # business_need_text_area.click()
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
 
-    #
-    actions = ActionChains(driver=driver)
+    results: list
+        Each finished row appends a dict with its outcome
 
-    #
-    actions.click(business_need_text_area)
-    actions.send_keys(business_need_text)
-    actions.perform()
+    journal: Journal, optional
+        Records each step as soon as it is done
 
-    return None
+    Returns
+    -------
+    None
+    """
 
+    logger = logging.getLogger("run_pipeline")
+
+    session = backend.session
+    driver = session.driver
+
+    logger.debug("open tabs")
+    # open tabs, the first row uses the window the browser started with
+    tabs = [driver.current_window_handle]
+    try:
+        for _ in range(backend.tabs - 1):
+            driver.switch_to.new_window("tab")
+            tabs.append(driver.current_window_handle)
+        session.tabs = tuple(tabs)
+
+        _run_lanes(backend, tabs, rows, today_str, results, journal)
+    finally:
+        logger.debug("close tabs")
+        # close the extra tabs and their popups, a pooled session outlives this run
+        try:
+            _reset_driver(driver, tabs[0])
+        except WebDriverException as e:
+            logger.warning("could not close the pipeline tabs: %s", e.msg)
+        session.tab = None
+        session.tabs = ()
 
-def save_edits(wait):
-    """"""
+    logger.debug("return None")
+    return None
 
-    save_button = wait.until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//button/span/span[@class='button-text'][text()='Save']")
-        )
-    )
 
-    save_button.click()
+def _run_lanes(backend, tabs, rows, today_str, results, journal):
+    """Take rows from `rows` in each of `tabs` until none are left, see `run_pipeline`"""
+
+    logger = logging.getLogger("run_pipeline")
+
+    session = backend.session
+    driver = session.driver
+
+    # the row each tab is working on, None once it has run out of rows
+    lanes = dict.fromkeys(tabs)
+
+    def switch_to(tab):
+        if session.tab != tab:
+            driver.switch_to.window(tab)
+            _forget_elements(driver)
+            session.tab = tab
+
+    def next_row():
+        while True:
+            try:
+                index, project_info, resume_from = rows.get_nowait()
+            except queue.Empty:
+                return None
+
+            try:
+                backend._refuse_existing(project_info, resume_from)
+            except RuntimeError as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.error("row %s failed: %s", index, error)
+                if journal is not None:
+                    journal.record(index, project_info.description, "failed", error=error)
+                results.append(_result(index, project_info.description, False, 0.0, error))
+                continue
+            break
+
+        plan = _row_plan(session, today_str, project_info, resume_from, backend.fast_fill)
+        return {
+            "index": index,
+            "project_info": project_info,
+            "resume_from": resume_from,
+            "plan": plan,
+            "calls": dict(plan),
+            "position": 0,
+            "start": perf_counter(),
+            "waiting_since": perf_counter(),
+            "page_is_ready": _page_is_ready(),
+        }
+
+    for tab in tabs:
+        lanes[tab] = next_row()
+
+    logger.info("pipeline %s tab(s)", len(tabs))
+    while any(lanes.values()):
+        progressed = False
+
+        for tab, lane in lanes.items():
+            if lane is None:
+                continue
+
+            switch_to(tab)
+            _current_row.set(lane["index"])
+            project_info = lane["project_info"]
+
+            step, _ = lane["plan"][lane["position"]]
+            if not _step_is_ready(driver, step, lane["waiting_since"], lane["page_is_ready"]):
+                continue
+            progressed = True
+
+            try:
+                while True:
+                    step, _ = lane["plan"][lane["position"]]
+                    logger.info(*_step_message(step, project_info, lane["resume_from"]))
+                    _run_step(session, step, lane["calls"])
+                    lane["position"] += 1
+
+                    if step is not None and journal is not None:
+                        journal.record(lane["index"], project_info.description, step, url=driver.current_url)
+
+                    if lane["position"] == len(lane["plan"]) or step not in _CHAINED_STEPS:
+                        break
+            except Exception as e:
+                logger.exception("row %s failed: %s", lane["index"], project_info.description)
+                error = f"{type(e).__name__}: {e}".strip()
+                if journal is not None:
+                    journal.record(lane["index"], project_info.description, "failed", error=error)
+                results.append(_result(lane["index"], project_info.description, False, perf_counter() - lane["start"], error))
+                _reset_driver(driver, tab, session.tabs)
+                lanes[tab] = next_row()
+                continue
+
+            if lane["position"] == len(lane["plan"]):
+                if journal is not None:
+                    journal.record(lane["index"], project_info.description, "done")
+                results.append(_result(lane["index"], project_info.description, True, perf_counter() - lane["start"]))
+                lanes[tab] = next_row()
+            else:
+                lane["waiting_since"] = perf_counter()
+                lane["page_is_ready"] = _page_is_ready()
+
+        if not progressed:
+            sleep(POLL_FREQUENCY)
 
+    logger.debug("return None")
     return None
 
 
-def describe_and_categorize_bi(
-        wait,
-        driver,
-        bi_swim_lane_name,
-        executive_sponsor_name,
-        bi_business_owner_name,
-        bi_domain_name,
-        requestor_name,
-        bi_liaison_name,
-        work_description_text,
-        business_need_text
-):
+def _plan_rows(project_infos, progress=None, existing=None, journal=None):
     """
-    Edit the Describe & Categorize BI page
+    Decide, for every row, whether to create it, carry it on or skip it
 
     Parameters
     ----------
-    wait: selenium.webdriver.support.wait.WebDriverWait
-        Tells the driver to look for an element every 0.5 seconds until it is found
+    project_infos: list
+        Valid rows from `parse_project_book`
 
-    driver: selenium.webdriver.chrome.webdriver.WebDriver
-        The driver used to control the browser
+    progress: dict, optional
+        Output of `Journal.load`
 
-    bi_swim_lane_name: str
-        text to enter in BI Swim Lane field
+    existing: dict, optional
+        Output of `fetch_existing_work`
 
-    executive_sponsor_name: str
-        text to enter in Executive Sponsor field
+    journal: Journal, optional
+        Rows that cannot be carried on are recorded as failed in it, so
+        `--failed-from` finds them once they have been finished by hand
 
-    bi_business_owner_name: str
-        text to enter in BI Business Owner field
+    Returns
+    -------
+    queued: list
+        (index, project_info, resume_from) for every row to run
 
-    bi_domain_name: str
-        text to enter in BI Domain field
+    results: list
+        Results of the rows that will not run
+    """
 
-    requestor_name: str
-        text to enter in Requestor field
+    logger = logging.getLogger("_plan_rows")
+
+    queued = []
+    results = []
+
+    for project_info in project_infos:
+        index = project_info.index
+        resume_from = _resume_point((progress or {}).get(project_info.description))
+        work = (existing or {}).get(_normalize_description(project_info.description))
+
+        if resume_from is not None and resume_from[0] == "done":
+            logger.info("skip row %s, already done: %s", index, project_info.description)
+            results.append(_result(index, project_info.description, True, 0.0, skipped=True))
+        elif work is not None and (resume_from is None or resume_from[0] in ("stranded", "work_id")):
+            missing = _missing_steps(work, project_info)
+            if not missing:
+                logger.info("skip row %s, work item %s exists: %s", index, work["id"], project_info.description)
+                results.append(_result(index, project_info.description, True, 0.0, skipped=True))
+            else:
+                logger.info("row %s exists as work item %s, missing %s", index, work["id"], ", ".join(missing))
+                queued.append((index, project_info, ("existing", work)))
+        elif resume_from is None:
+            queued.append((index, project_info, None))
+        elif resume_from[0] == "stranded":
+            error = f"created up to {resume_from[1]} but cannot be reopened, finish it by hand"
+            logger.error("row %s %s %s", index, project_info.description, error)
+            if journal is not None:
+                journal.record(index, project_info.description, "failed", error=f"stranded: {error}")
+            results.append(_result(index, project_info.description, False, 0.0, error))
+        else:
+            queued.append((index, project_info, resume_from))
+
+    logger.debug("return queued, results")
+    return queued, results
+
+
+def run_rows(project_infos, today_str, workers=1, journal=None, progress=None, make_backend=BrowserBackend, existing=None):
+    """
+    Create work items for every row, spread over `workers` backends
 
-    bi_liaison_name: str
-        text to enter in BI Liaison field
+    Parameters
+    ----------
+    project_infos: list
+        Valid rows from `parse_project_book`
 
-    work_description_text: str
-        text to enter in Work Description field
+    today_str: str
+        Today's date formatted as mm/dd/yyyy
 
-    business_need_text: str
-        text to enter in Business Need field
+    workers: int
+        Number of backends, e.g. browser sessions, to run at once
+
+    journal: Journal, optional
+        Records each step as soon as it is done
+
+    progress: dict, optional
+        Output of `Journal.load` for a run being resumed; finished rows are
+        skipped and half-finished rows carry on from their last step
+
+    make_backend: callable
+        Builds one worker's backend, e.g.
+        `functools.partial(BrowserBackend, {"headless": True})`
+
+    existing: dict, optional
+        Output of `fetch_existing_work`; rows whose work item is already
+        complete are skipped and incomplete ones only get their missing steps
 
     Returns
     -------
-    None
+    results: list
+        One dict per row, sorted by row index
     """
 
-    logger = logging.getLogger("describe_and_categorize_bi")
-
-    logger.debug("bi_swim_lane")
-    bi_swim_lane(wait, bi_swim_lane_name)
+    logger = logging.getLogger("run_rows")
 
-    logger.debug("bi_work_type")
-    bi_work_type(wait)
+    logger.debug("fill row queue")
+    # fill row queue
+    queued, results = _plan_rows(project_infos, progress, existing, journal)
+    rows = queue.Queue()
+    for row in queued:
+        rows.put(row)
 
-    logger.debug("executive_sponsor")
-    executive_sponsor(wait, driver, executive_sponsor_name)
+    if rows.empty():
+        logger.info("no rows to run")
+        return sorted(results, key=lambda result: result["index"])
 
-    logger.debug("bi_business_owner")
-    bi_business_owner(wait, driver, bi_business_owner_name)
+    # a worker only costs a backend if there is a row for it
+    workers = min(workers, rows.qsize())
 
-    logger.debug("bi_domain")
-    bi_domain(wait, driver, bi_domain_name)
+    logger.info("start %s worker(s)", workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker") as executor:
+        # each worker runs in a copy of the caller's context, so its step
+        # calls land in the caller's `_step_metrics`
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_worker, rows, today_str, results, journal, make_backend)
+            for _ in range(workers)
+        ]
 
-    logger.debug("requestor")
-    requestor(wait, driver, requestor_name)
+    for future in futures:
+        # a worker that could not even start its backend leaves its rows in the queue
+        if future.exception() is not None:
+            logger.error("worker failed: %r", future.exception())
 
-    logger.debug("bi_liaison")
-    bi_liaison(wait, driver, bi_liaison_name)
+    logger.debug("record rows no worker reached")
+    # record rows no worker reached
+    while not rows.empty():
+        index, project_info, _ = rows.get_nowait()
+        results.append(_result(index, project_info.description, False, 0.0, "not run"))
 
-    logger.debug("work_description")
-    work_description(wait, driver, work_description_text)
+    logger.debug("return results")
+    return sorted(results, key=lambda result: result["index"])
 
-    logger.debug("business_need")
-    business_need(wait, driver, business_need_text)
 
-    logger.debug("save_edits")
-    save_edits(wait)
+async def run_rows_async(project_infos, today_str, workers=1, journal=None, progress=None, make_backend=BrowserBackend, existing=None):
+    """
+    Create work items for every row from one event loop
 
+    Takes the same parameters and returns the same results as `run_rows`,
+    but instead of one thread per worker looping over a queue, every row is
+    a task. A semaphore lets at most `workers` rows run at once, each on a
+    backend borrowed from a pool that grows to `workers` sessions; a
+    session's blocking Selenium calls run on a worker thread one step at a
+    time (`process_row_async`) while the loop schedules the other sessions.
 
-if __name__ == "__main__":
+    Returns
+    -------
+    results: list
+        One dict per row, sorted by row index
+    """
 
-    logger = logging.getLogger(__name__)
+    logger = logging.getLogger("run_rows_async")
 
-    log_date = str(pd.to_datetime("today").date()).replace("-", "")
+    queued, results = _plan_rows(project_infos, progress, existing, journal)
 
-    logging.basicConfig(
-        filename=f"Logs/PRM_{log_date}.log",
-        filemode="w",
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    if not queued:
+        logger.info("no rows to run")
+        return sorted(results, key=lambda result: result["index"])
 
-    # adding StreamHandler so logs print to terminal
-    logger.addHandler(logging.StreamHandler())
+    # a session only costs a backend if there is a row for it
+    workers = min(workers, len(queued))
 
-    logger.info("read data")
-    # read data
-    df = pd.read_excel(
-        io=r"\\kuha.kumed.com\shares\departments\AA & BIS\PRM\2022494_Automation_of_PRM_Task_Creation\ProjectBook.xlsx"
-        # io=r"\\kuha.kumed.com\shares\departments\AA & BIS\PRM\2022494_Automation_of_PRM_Task_Creation\ProjectBookTest.xlsx"
+    # one thread per session is all the blocking calls ever need at once
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="session")
     )
 
-    logger.info("define options")
-    # define options
-    # options = Options()
-    # options.headless = True
+    semaphore = asyncio.Semaphore(workers)
+    idle = []
+    backends = []
+
+    async def run_row(index, project_info, resume_from):
+        async with semaphore:
+            if idle:
+                backend = idle.pop()
+            else:
+                try:
+                    backend = await asyncio.to_thread(make_backend)
+                except Exception as e:
+                    logger.error("session failed to start: %r", e)
+                    results.append(_result(index, project_info.description, False, 0.0, "not run"))
+                    return
+                backends.append(backend)
+
+            # tasks run in a copy of the context, so this tags only this row's steps
+            _current_row.set(index)
+
+            start = perf_counter()
+            try:
+                await backend.process_row_async(today_str, project_info, index, journal, resume_from)
+            except Exception as e:
+                logger.exception("row %s failed: %s", index, project_info.description)
+                error = f"{type(e).__name__}: {e}".strip()
+                if journal is not None:
+                    await asyncio.to_thread(journal.record, index, project_info.description, "failed", error=error)
+                results.append(_result(index, project_info.description, False, perf_counter() - start, error))
+                await asyncio.to_thread(backend.recover)
+            else:
+                results.append(_result(index, project_info.description, True, perf_counter() - start))
+            finally:
+                idle.append(backend)
+
+    logger.info("run %s row(s) on up to %s session(s)", len(queued), workers)
+    try:
+        await asyncio.gather(*(run_row(*row) for row in queued))
+    finally:
+        for backend in backends:
+            await asyncio.to_thread(backend.close)
+
+    logger.debug("return results")
+    return sorted(results, key=lambda result: result["index"])
+
+
+def _summarize(results, wall_seconds):
+    """
+    Log a one-line outcome for every row followed by the totals
 
-    logger.info("_get_date")
-    today_str = _get_date()
-    date = pd.to_datetime(today_str)
-    month = date.month_name()
-    year = date.year
+    Parameters
+    ----------
+    results: list
+        Output of `run_rows`
 
-    logger.info("create driver")
-    # create driver
-    # driver = webdriver.Chrome(options=options)
-    driver = webdriver.Edge("msedgedriver.exe")
+    wall_seconds: float
+        Elapsed time for the whole run
+
+    Returns
+    -------
+    completed: int
+        Number of rows this run finished
 
-    logger.info("define wait")
-    # define wait
-    wait = WebDriverWait(driver=driver, timeout=30)
+    failed: int
+        Number of rows that did not complete
+    """
 
-    for row in df.itertuples():
+    logger = logging.getLogger(__name__)
 
-        logger.info("get project info")
-        description = row.Description
-        description = f"{month} {year} {description}"
+    for result in results:
+        if result["skipped"]:
+            status = "skipped (already done)"
+        elif result["ok"]:
+            status = "ok"
+        else:
+            status = f"FAILED ({result['error']})"
+        logger.info("row %s %s: %s in %.1fs", result["index"], result["description"], status, result["seconds"])
 
-        bi_service_name = row.BIServiceName
+    failed = sum(not result["ok"] for result in results)
+    # rows done by an earlier run do not count towards this run's throughput
+    completed = sum(result["ok"] and not result["skipped"] for result in results)
+    logger.info("%s succeeded, %s failed, %.1fs total", completed, failed, wall_seconds)
 
-        bi_assignment_owner_name = row.BIAssignmentOwner
-        left = bi_assignment_owner_name.index("(")
-        right = bi_assignment_owner_name.index(")")
-        bi_assignment_owner_name = bi_assignment_owner_name[left + 1: right]
+    return completed, failed
 
-        bi_team_name = row.BITeam
 
-        resource = row.BIAssignmentOwner
-        left = resource.index("(")
-        resource = resource[:left]
-        resource = resource.strip()
+def _row_spec_argument(spec):
+    """`parse_row_spec` for argparse"""
 
-        left = row.BISwimLanes.index("(")
-        bi_swim_lane_name = row.BISwimLanes[left + 1:-1]
+    try:
+        return parse_row_spec(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
 
-        executive_sponsor_name = row.ExecutiveSponsor
 
-        bi_business_owner_name = row.BIBusinessOwner
+def _window_size_argument(size):
+    """WIDTHxHEIGHT for argparse, as the (width, height) `create_driver` takes"""
 
-        bi_domain_name = row.BIDomain
+    width, _, height = size.lower().partition("x")
+    try:
+        window_size = (int(width), int(height))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 1280x800, not {size!r}") from None
 
-        requestor_name = row.Requestor
+    if min(window_size) <= 0:
+        raise argparse.ArgumentTypeError(f"window size must be positive, not {size!r}")
 
-        bi_liaison_name = row.BILiaison
-        left = bi_liaison_name.index("(")
-        bi_liaison_name = bi_liaison_name[left + 1: -1]
+    return window_size
 
-        work_description_text = row.WorkDescription
 
-        business_need_text = row.BusinessNeed
+def main(argv=None):
+    """
+    Read the ProjectBook and create a work item for every row
 
-        logger.info("login")
-        login(driver, wait)
+    Parameters
+    ----------
+    argv: list, optional
+        Command line arguments, defaults to `sys.argv[1:]`
 
-        logger.info(f"new_work_page1 {description}")
-        new_work_page1(wait, today_str, description)
+    Returns
+    -------
+    exit_code: int
+    """
 
-        logger.info("new_work_page2")
-        new_work_page2(wait, today_str, bi_service_name)
+    parser = argparse.ArgumentParser(description="Create PRM work items from the ProjectBook")
+    parser.add_argument(
+        "--input",
+        default=PROJECT_BOOK,
+        metavar="PATH",
+        help="ProjectBook workbook to read (default: the ProjectBook on the PRM share)"
+    )
+    parser.add_argument(
+        "--rows",
+        type=_row_spec_argument,
+        metavar="SPEC",
+        help="only these rows, numbered as in the run summary, e.g. 3-7,12"
+    )
+    parser.add_argument(
+        "--match",
+        metavar="PATTERN",
+        help="only rows whose Description contains this regular expression (case-insensitive)"
+    )
+    parser.add_argument(
+        "--failed-from",
+        metavar="RUN",
+        help="only the rows that failed in an earlier run: a journal path, its timestamp"
+             " (as in Logs/PRM_<timestamp>_journal.jsonl) or 'latest'"
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const=8767,
+        type=int,
+        metavar="PORT",
+        help="hand the ProjectBook to a running prm_daemon.py instead of starting"
+             " browsers here (default port: 8767)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["browser", "rest"],
+        default="browser",
+        help="drive PRM in a browser or call the Planview REST API (default: browser)"
+    )
+    parser.add_argument(
+        "--rest-endpoints",
+        metavar="JSON",
+        help="JSON file overriding REST API paths, see REST_ENDPOINTS"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of browser sessions or REST workers to run rows across (default: 1)"
+    )
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help="run the workers' sessions from one event loop instead of a thread each"
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="rows each browser keeps in progress at once, one per tab (default: 1)"
+    )
+    parser.add_argument(
+        "--browser",
+        choices=["edge", "chrome"],
+        default="edge",
+        help="browser to drive (default: edge)"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the browser without a window"
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="skip loading images, fonts, media and analytics"
+    )
+    parser.add_argument(
+        "--window-size",
+        type=_window_size_argument,
+        default="1280x800",
+        help="browser window/viewport size as WIDTHxHEIGHT (default: 1280x800)"
+    )
+    parser.add_argument(
+        "--network-quiet",
+        type=float,
+        default=NETWORK_IDLE["quiet"],
+        help="seconds without XHR/fetch traffic before a save or tab counts as finished"
+             f" (default: {NETWORK_IDLE['quiet']})"
+    )
+    parser.add_argument(
+        "--failure-snapshots",
+        type=int,
+        default=FAILURE_CAPTURE["snapshots"],
+        help="recent steps remembered per session and written to Logs/failures with a screenshot,"
+             f" page source and console log when a row fails; 0 turns this off (default: {FAILURE_CAPTURE['snapshots']})"
+    )
+    parser.add_argument(
+        "--fast-fill",
+        action="store_true",
+        help="fill each New Work page with one script call, falling back to"
+             " field-by-field typing if a value does not take"
+    )
+    parser.add_argument(
+        "--step-attempts",
+        type=int,
+        default=RETRY_POLICY["attempts"],
+        help=f"tries per browser step before the row fails (default: {RETRY_POLICY['attempts']})"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help=f"Planview host to run against, e.g. a local planview_stub.py (default: {BASE_URL})"
+    )
+    parser.add_argument(
+        "--no-existing-check",
+        action="store_true",
+        help="do not list this month's work items first to skip rows that already exist"
+    )
+    parser.add_argument(
+        "--api-lookups",
+        action="store_true",
+        help="with the browser backend, still list this month's work items and fetch the"
+             " picklists over the Planview REST API (the REST backend always does)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="lowest level written to Logs/PRM_log.jsonl and the terminal (default: INFO)"
+    )
+    parser.add_argument(
+        "--log-rotate",
+        choices=["daily", "size"],
+        default="daily",
+        help="start a new log file at midnight or once it reaches --log-max-mb (default: daily)"
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=10,
+        help="log file size that triggers rotation with --log-rotate size (default: 10)"
+    )
+    parser.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="do not check rows against the picklist snapshots before starting"
+    )
+    parser.add_argument(
+        "--picklist-ttl",
+        type=float,
+        default=24,
+        help="hours a picklist snapshot is trusted before it is fetched again (default: 24)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="parse the ProjectBook even if a local snapshot of it is current, and"
+             " look every resource up instead of using the resource id cache"
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="RUN",
+        help="skip rows a previous run finished and carry on half-finished ones; RUN is as for"
+             " --failed-from (default: the most recent journal in Logs)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.tabs > 1 and args.asyncio:
+        parser.error("--tabs cannot be combined with --asyncio")
+    if args.daemon and (args.rows is not None or args.match is not None or args.failed_from):
+        parser.error("--rows, --match and --failed-from cannot be combined with --daemon")
+    if args.match is not None:
+        try:
+            re.compile(args.match)
+        except re.error as e:
+            parser.error(f"--match: {e}")
+
+    configure_logging(
+        level=getattr(logging, args.log_level),
+        rotate=args.log_rotate,
+        max_bytes=int(args.log_max_mb * 2 ** 20)
+    )
+    configure_base_url(args.base_url)
+    configure_retries(attempts=args.step_attempts)
+    configure_network_idle(quiet=args.network_quiet)
+    configure_failure_capture(snapshots=args.failure_snapshots)
+    if not args.no_cache:
+        configure_resource_cache(os.path.join(CACHE_DIR, "resources.json"))
+        configure_picklist_cache(os.path.join(CACHE_DIR, "picklists.json"), ttl=args.picklist_ttl * 3600)
 
-        logger.info("work_and_assignments")
-        work_and_assignments(wait, driver, bi_assignment_owner_name, bi_team_name)
+    logger = logging.getLogger(__name__)
 
-        logger.info("open_resource_search_window")
-        open_resource_search_window(wait, driver)
+    log_date = f"{date.today():%Y%m%d}"
 
-        logger.info("allocate")
-        allocate(driver, wait, resource)
+    if args.daemon:
+        import prm_daemon
 
-        sleep(2)
+        logger.info("submit to daemon on port %s", args.daemon)
+        reply = prm_daemon.submit(
+            {"command": "run", "project_book": args.input, "workers": args.workers, "no_cache": args.no_cache},
+            port=args.daemon
+        )
+        if not reply["ok"]:
+            logger.error("daemon: %s", reply["error"])
+            return 1
 
-        logger.info("navigate_to_work_view")
-        navigate_to_work_view(wait)
+        _summarize(reply["results"], reply["seconds"])
+        return 1 if reply["failed"] else 0
 
-        logger.info("edit_work_detail")
-        edit_work_detail(driver, wait)
+    logger.info("read data")
+    # read data
+    df = read_project_book(args.input, cache_dir=None if args.no_cache else CACHE_DIR)
 
-        logger.info("describe_and_categorize_bi")
-        describe_and_categorize_bi(
-            wait,
-            driver,
-            bi_swim_lane_name,
-            executive_sponsor_name,
-            bi_business_owner_name,
-            bi_domain_name,
-            requestor_name,
-            bi_liaison_name,
-            work_description_text,
-            business_need_text
-        )
+    logger.info("_get_date")
+    today_str = _get_date()
+    month, year = _get_month_and_year(today_str)
+
+    logger.info("parse_project_book")
+    project_infos, invalid = parse_project_book(df, month, year)
+    logger.info("%s valid row(s), %s invalid", len(project_infos), len(invalid))
+
+    progress = None
+    if args.resume:
+        journal_path = _find_journal(args.resume)
+        if journal_path is None:
+            parser.error(f"--resume: no journal found for {args.resume!r}")
+        logger.info("resume from %s", journal_path)
+        progress = Journal.load(journal_path)
+    else:
+        journal_path = f"Logs/PRM_{datetime.now():%Y%m%d_%H%M%S}_journal.jsonl"
+
+    failed_rows = None
+    if args.failed_from:
+        failed_journal = _find_journal(args.failed_from)
+        if failed_journal is None:
+            parser.error(f"--failed-from: no journal found for {args.failed_from!r}")
+        logger.info("rerun failed rows of %s", failed_journal)
+        failed_progress = Journal.load(failed_journal)
+        failed_rows = {description for description, row in failed_progress.items() if row["failed"]}
+        # carry half-finished rows on rather than creating their work items again
+        progress = progress or failed_progress
+
+    if args.rows is not None or args.match is not None or failed_rows is not None:
+        logger.info("select_rows")
+        selected = select_rows(df, month, year, rows=args.rows, match=args.match, failed=failed_rows)
+        project_infos = [project_info for project_info in project_infos if project_info.index in selected]
+        invalid = {index: problem for index, problem in invalid.items() if index in selected}
+
+    client = None
+    if args.backend == "rest":
+        if args.rest_endpoints:
+            with open(args.rest_endpoints) as f:
+                configure_rest_endpoints(**json.load(f))
+
+        logger.info("define REST client")
+        # define REST client, one pooled connection per worker
+        client = PlanviewClient(pool_size=args.workers)
+        make_backend = functools.partial(RestBackend, client)
+    else:
+        logger.info("define options")
+        # define options
+        driver_options = {
+            "browser": args.browser,
+            "headless": args.headless,
+            "block_resources": args.block_resources,
+            "window_size": args.window_size,
+        }
+        make_backend = functools.partial(BrowserBackend, driver_options, args.fast_fill, args.tabs)
+
+    # the browser backend's host may not have the REST API at all
+    use_api = args.backend == "rest" or args.api_lookups
+
+    existing = None
+    lookup_client = client or (PlanviewClient(pool_size=1) if use_api else None)
+    try:
+        if not args.no_existing_check and use_api:
+            logger.info("fetch_existing_work")
+            try:
+                existing = fetch_existing_work(lookup_client, month, year)
+            except Exception as e:
+                # a skip list is an optimisation; without one every row is created as before
+                logger.warning("cannot list existing work items, every row will be created: %s", e)
+
+        if not args.no_preflight:
+            if use_api:
+                logger.info("fetch_picklists")
+                try:
+                    fetch_picklists(lookup_client)
+                except Exception as e:
+                    logger.warning("cannot fetch picklists, checking against the last snapshots only: %s", e)
+            else:
+                logger.info("checking against the picklists harvested by earlier browser runs")
+
+            logger.info("preflight_picklists")
+            project_infos, rejected = preflight_picklists(project_infos)
+            invalid.update(rejected)
+    finally:
+        if lookup_client is not None and lookup_client is not client:
+            lookup_client.close()
+
+    logger.info("journal %s", journal_path)
+    journal = Journal(journal_path)
+
+    # journal invalid rows as failed so --failed-from picks them up once fixed
+    for index, problem in invalid.items():
+        journal.record(index, f"{month} {year} {df.at[index, 'Description']}", "failed", error=f"invalid: {problem}")
+
+    start = perf_counter()
+    try:
+        run_kwargs = {
+            "workers": args.workers,
+            "journal": journal,
+            "progress": progress,
+            "make_backend": make_backend,
+            "existing": existing,
+        }
+        if args.asyncio:
+            results = asyncio.run(run_rows_async(project_infos, today_str, **run_kwargs))
+        else:
+            results = run_rows(project_infos, today_str, **run_kwargs)
+    finally:
+        journal.close()
+        if client is not None:
+            logger.info("REST: %s token(s), %s connection(s) opened", client.logins, client.connections)
+            client.close()
+    wall_seconds = perf_counter() - start
+
+    # invalid rows never reached the browser but still belong in the summary
+    results += [
+        _result(index, str(df.at[index, "Description"]), False, 0.0, f"invalid: {problem}")
+        for index, problem in invalid.items()
+    ]
+    results.sort(key=lambda result: result["index"])
+
+    completed, failed = _summarize(results, wall_seconds)
+    if failed:
+        logger.info("rerun just the failed rows with: prm.bat --failed-from %s", journal_path)
+
+    logger.info("write step metrics")
+    # write step metrics
+    write_metrics(STEP_METRICS, f"Logs/PRM_{log_date}_metrics.jsonl")
+    report_metrics(STEP_METRICS, completed, wall_seconds)
+
+    return 1 if failed else 0
 
-        sleep(2)
 
-    logger.info("quit")
-    driver.quit()
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,918 @@
+"""
+Long-lived process that keeps logged-in browser sessions warm for prm.py
+
+Starting Edge and signing in costs every run several seconds before the
+first row. The daemon pays that once: it starts its sessions, logs them in,
+and then takes jobs over a local socket, one JSON object per line, answering
+each with one JSON line of results:
+
+    python prm_daemon.py serve --sessions 2 --headless
+    python prm.py --daemon                      # the ProjectBook, via the daemon
+    python prm_daemon.py submit --project-book ProjectBook.xlsx --workers 2
+    python prm_daemon.py status
+    python prm_daemon.py shutdown
+
+Jobs are {"command": "run", "project_book": path} or {"command": "run",
+"rows": [{ProjectBook column: value, ...}, ...]}, with optional "workers",
+"no_cache", "no_preflight" and "no_existing_check". Rows this month's
+journals in Logs already record as done are skipped and half-finished ones
+carried on, so a job sent twice does not create its work items twice; with
+`serve --api-lookups` each job also lists this month's work items over the
+REST API and skips rows that already exist. "no_existing_check" turns both
+off. Sessions are recycled after `--max-rows` rows or `--max-age`
+seconds, and replaced if they stop responding; idle ones reopen the New Work
+page every `--keepalive` seconds so their log-in does not expire.
+
+With `serve --watch DIR` the daemon also runs every request file dropped in
+DIR as soon as it has been written: .json (one row object or a list of
+them), .csv or .xlsx, with the ProjectBook's columns. Write the file under a
+name starting with "." and rename it when it is complete, or let it sit
+unchanged for `--settle` seconds. Each file moves to DIR/processing while it
+runs and then to DIR/done or DIR/failed, next to a <name>.result.json with
+the rows' results and the request's latency. A file with the same content
+as one already in DIR/done is not run again, only answered with a pointer
+to the first.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+from time import monotonic, perf_counter
+
+from selenium.common.exceptions import WebDriverException
+
+import prm
+
+pd = prm._LazyModule("pandas")
+
+
+DEFAULT_PORT = 8767
+
+
+class SessionPool:
+    """
+    Browser sessions kept logged in between jobs
+
+    Parameters
+    ----------
+    size: int
+        Most sessions open at once
+
+    driver_options: dict, optional
+        Keyword arguments for `prm.create_driver`
+
+    fast_fill: bool
+        Passed on to `prm.BrowserBackend`
+
+    tabs: int
+        Passed on to `prm.BrowserBackend`
+
+    max_rows: int
+        Rows a session runs before it is replaced; rows pipelined through
+        tabs are not counted, such sessions are replaced on `max_age`
+
+    max_age: float
+        Seconds a session lives before it is replaced
+    """
+
+    def __init__(self, size=1, driver_options=None, fast_fill=False, tabs=1, max_rows=200, max_age=4 * 3600):
+        self.size = size
+        self.driver_options = driver_options
+        self.fast_fill = fast_fill
+        self.tabs = tabs
+        self.max_rows = max_rows
+        self.max_age = max_age
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+        # rows run and start time of every open session
+        self._stats = {}
+
+        # sessions started and replaced, for `status`
+        self.created = 0
+        self.recycled = 0
+
+    def _create(self):
+        """Start a session and log it in"""
+
+        logger = logging.getLogger("SessionPool")
+
+        backend = prm.BrowserBackend(self.driver_options, self.fast_fill, self.tabs)
+        try:
+            backend.session.open_new_work()
+        except Exception:
+            backend.close()
+            raise
+
+        with self._lock:
+            self._stats[backend] = {"rows": 0, "started": monotonic()}
+            self.created += 1
+        logger.info("session %s ready", self.created)
+
+        return backend
+
+    def _discard(self, backend, reason):
+        """Quit a session for good"""
+
+        logging.getLogger("SessionPool").info("recycle session: %s", reason)
+
+        with self._lock:
+            self._stats.pop(backend, None)
+            self.recycled += 1
+
+        try:
+            backend.close()
+        except WebDriverException:
+            # the browser is already gone
+            pass
+
+        return None
+
+    def _expired(self, backend):
+        """Why `backend` is due to be replaced, or None"""
+
+        with self._lock:
+            stats = self._stats[backend]
+
+        if stats["rows"] >= self.max_rows:
+            return f"ran {stats['rows']} rows"
+        if monotonic() - stats["started"] > self.max_age:
+            return f"older than {self.max_age:.0f}s"
+
+        return None
+
+    @staticmethod
+    def _responds(backend):
+        """True if the browser still answers"""
+
+        try:
+            backend.driver.current_url
+        except WebDriverException:
+            return False
+
+        return True
+
+    def count_row(self, backend):
+        """Note that `backend` has run one more row"""
+
+        with self._lock:
+            self._stats[backend]["rows"] += 1
+
+        return None
+
+    def acquire(self):
+        """
+        Borrow a session, waiting for one if all `size` are in use
+
+        Returns
+        -------
+        backend: prm.BrowserBackend
+        """
+
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    backend = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+
+                reason = self._expired(backend) or (None if self._responds(backend) else "not responding")
+                if reason is None:
+                    return backend
+                self._discard(backend, reason)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, backend):
+        """Give a session back, replacing it if it is due"""
+
+        try:
+            reason = self._expired(backend)
+            if reason is None:
+                self._idle.put(backend)
+            else:
+                self._discard(backend, reason)
+        finally:
+            self._slots.release()
+
+        return None
+
+    def warm_up(self):
+        """Start and log in every session up front"""
+
+        backends = []
+        try:
+            for _ in range(self.size):
+                backends.append(self.acquire())
+        finally:
+            for backend in backends:
+                self.release(backend)
+
+        return None
+
+    def keep_alive(self):
+        """Reopen the New Work page in every idle session so its log-in stays fresh"""
+
+        logger = logging.getLogger("SessionPool.keep_alive")
+
+        for _ in range(self._idle.qsize()):
+            if not self._slots.acquire(blocking=False):
+                # a job has every slot; its sessions are busy enough
+                return None
+            try:
+                backend = self._idle.get_nowait()
+            except queue.Empty:
+                self._slots.release()
+                return None
+
+            try:
+                backend.session.open_new_work()
+            except Exception as e:
+                logger.warning("idle session failed its keep-alive: %r", e)
+                self._discard(backend, "keep-alive failed")
+                self._slots.release()
+            else:
+                self.release(backend)
+
+        return None
+
+    def status(self):
+        """Sizes and counters, for the `status` command"""
+
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": len(self._stats),
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "recycled": self.recycled,
+                "rows": sum(stats["rows"] for stats in self._stats.values()),
+            }
+
+    def close(self):
+        """Quit every idle session"""
+
+        while True:
+            try:
+                self._discard(self._idle.get_nowait(), "shutting down")
+            except queue.Empty:
+                break
+
+        return None
+
+
+class PooledBackend:
+    """
+    `prm` backend over a session borrowed from a `SessionPool`
+
+    Everything is passed through to the pooled `prm.BrowserBackend`, except
+    that `close` hands the session back instead of quitting the browser.
+
+    Parameters
+    ----------
+    pool: SessionPool
+        Where to borrow the session from
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.backend = pool.acquire()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def process_row(self, *args, **kwargs):
+        self.pool.count_row(self.backend)
+        return self.backend.process_row(*args, **kwargs)
+
+    async def process_row_async(self, *args, **kwargs):
+        self.pool.count_row(self.backend)
+        return await self.backend.process_row_async(*args, **kwargs)
+
+    def close(self):
+        self.pool.release(self.backend)
+        return None
+
+
+def _job_rows(job):
+    """
+    The ProjectBook a job refers to, as a DataFrame
+
+    Parameters
+    ----------
+    job: dict
+        "project_book" path or inline "rows"
+
+    Returns
+    -------
+    df: pandas.DataFrame
+    """
+
+    if "rows" in job:
+        return pd.DataFrame(job["rows"])
+
+    path = job.get("project_book") or prm.PROJECT_BOOK
+    cache_dir = None if job.get("no_cache") else prm.CACHE_DIR
+
+    return prm.read_project_book(path, cache_dir=cache_dir)
+
+
+def _previous_progress(month_start, log_dir="Logs"):
+    """
+    What the journals written since `month_start` say about each row
+
+    Parameters
+    ----------
+    month_start: datetime
+        Journals last written before this are ignored
+
+    log_dir: str
+        Folder the journals are written to
+
+    Returns
+    -------
+    progress: dict
+        As `prm.Journal.load`, merged oldest first; a row any journal saw
+        done stays done
+    """
+
+    journals = [
+        path for path in glob.glob(os.path.join(log_dir, "PRM_*_journal.jsonl"))
+        if os.path.getmtime(path) >= month_start.timestamp()
+    ]
+
+    progress = {}
+    for path in sorted(journals, key=os.path.getmtime):
+        for description, row in prm.Journal.load(path).items():
+            if not progress.get(description, {}).get("done"):
+                progress[description] = row
+
+    return progress
+
+
+def run_job(pool, job, job_lock, lookup_client=None):
+    """
+    Create the work items of one job with the pool's sessions
+
+    Parameters
+    ----------
+    pool: SessionPool
+        Warm sessions to run the rows on
+
+    job: dict
+        See the module docstring
+
+    job_lock: threading.Lock
+        Jobs take turns; they would be competing for the same sessions
+
+    lookup_client: prm.PlanviewClient, optional
+        Lists the work items that already exist, so a job sent twice does
+        not create them twice
+
+    Returns
+    -------
+    reply: dict
+        "results" (one per row), "completed", "failed" and "seconds"
+    """
+
+    logger = logging.getLogger("run_job")
+
+    df = _job_rows(job)
+
+    today_str = prm._get_date()
+
+    month, year = prm._get_month_and_year(today_str)
+    project_infos, invalid = prm.parse_project_book(df, month, year)
+    logger.info("job: %s valid row(s), %s invalid", len(project_infos), len(invalid))
+
+    # the sessions keep the picklist snapshots fresh as they pick options
+    if not job.get("no_preflight"):
+        project_infos, rejected = prm.preflight_picklists(project_infos)
+        invalid.update(rejected)
+
+    # this job's step calls only, whatever else runs meanwhile
+    metrics = []
+    token = prm._step_metrics.set(metrics)
+    try:
+        # looked up under the lock, so a job cannot miss the rows of the one before it
+        with job_lock:
+            progress = None
+            existing = None
+            if not job.get("no_existing_check"):
+                progress = _previous_progress(datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+                if lookup_client is not None:
+                    try:
+                        existing = prm.fetch_existing_work(lookup_client, month, year)
+                    except Exception as e:
+                        logger.warning("cannot list existing work items, every row will be created: %s", e)
+
+            # drop-folder requests can follow each other within a second
+            journal_path = f"Logs/PRM_{datetime.now():%Y%m%d_%H%M%S_%f}_journal.jsonl"
+            journal = prm.Journal(journal_path)
+
+            start = perf_counter()
+            try:
+                results = prm.run_rows(
+                    project_infos,
+                    today_str,
+                    workers=min(int(job.get("workers", pool.size)), pool.size),
+                    journal=journal,
+                    progress=progress,
+                    make_backend=lambda: PooledBackend(pool),
+                    existing=existing
+                )
+            finally:
+                journal.close()
+            wall_seconds = perf_counter() - start
+    finally:
+        prm._step_metrics.reset(token)
+
+    results += [
+        prm._result(index, str(df.at[index, "Description"]), False, 0.0, f"invalid: {problem}")
+        for index, problem in invalid.items()
+    ]
+    results.sort(key=lambda result: result["index"])
+
+    completed, failed = prm._summarize(results, wall_seconds)
+    prm.write_metrics(metrics, journal_path.replace("_journal.jsonl", "_metrics.jsonl"))
+    prm.report_metrics(metrics, completed, wall_seconds)
+
+    return {
+        "ok": True,
+        "results": results,
+        "completed": completed,
+        "failed": failed,
+        "seconds": wall_seconds,
+        "journal": journal_path,
+    }
+
+
+def _read_request(path):
+    """
+    The rows of a dropped request file
+
+    Parameters
+    ----------
+    path: str
+        .json, .csv or .xlsx file
+
+    Returns
+    -------
+    df: pandas.DataFrame
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".json":
+        with open(path) as f:
+            rows = json.load(f)
+        return pd.DataFrame([rows] if isinstance(rows, dict) else rows)
+
+    if extension == ".csv":
+        return pd.read_csv(path, dtype=str, keep_default_na=False).replace("", None)
+
+    return pd.read_excel(path)
+
+
+class DropFolder:
+    """
+    Runs each request file dropped in a folder as its own job
+
+    A request is one file, so a bad one fails on its own instead of holding
+    up a whole ProjectBook. Jobs take turns with the socket's through the
+    same lock.
+
+    Parameters
+    ----------
+    folder: str
+        Folder to watch; processing, done and failed are made inside it
+
+    pool: SessionPool
+        Warm sessions to run the rows on
+
+    job_lock: threading.Lock
+        The job server's lock
+
+    settle: float
+        Seconds a file's size and modification time have to stay the same,
+        as seen by the daemon, before it is picked up
+
+    lookup_client: prm.PlanviewClient, optional
+        Passed on to `run_job`
+    """
+
+    EXTENSIONS = (".json", ".csv", ".xlsx")
+
+    def __init__(self, folder, pool, job_lock, settle=1.0, lookup_client=None):
+        self.folder = folder
+        self.pool = pool
+        self.job_lock = job_lock
+        self.settle = settle
+        self.lookup_client = lookup_client
+        self.processed = 0
+
+        # when each waiting file was first seen, and its size and mtime since
+        # when; a copy can keep its source's mtime, so that alone proves nothing
+        self._seen = {}
+
+        for subfolder in ("processing", "done", "failed"):
+            os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
+
+        # content digest of every request that has run to completion
+        self.done = {}
+        for entry in sorted(os.scandir(os.path.join(folder, "done")), key=lambda entry: entry.stat().st_mtime):
+            if entry.is_file() and not entry.name.endswith(".result.json"):
+                self.done.setdefault(prm._file_digest(entry.path), entry.name)
+
+        # a request cut off by a restart may have created some of its work
+        # items already; dropped again, it carries on from its journal
+        for name in os.listdir(os.path.join(folder, "processing")):
+            self._finish(
+                os.path.join(folder, "processing", name),
+                {"ok": False, "error": "interrupted by a daemon restart, drop it again to finish its rows"},
+                "failed"
+            )
+
+    def _ready(self):
+        """Request files that have been fully written, first seen first"""
+
+        now = datetime.now().timestamp()
+        present = set()
+        for entry in os.scandir(self.folder):
+            if (
+                not entry.is_file()
+                or entry.name.startswith((".", "~$"))
+                or os.path.splitext(entry.name)[1].lower() not in self.EXTENSIONS
+            ):
+                continue
+
+            present.add(entry.path)
+            stat = entry.stat()
+            seen = self._seen.setdefault(entry.path, {"arrived": now, "since": now})
+            if (seen.get("size"), seen.get("mtime")) != (stat.st_size, stat.st_mtime):
+                seen.update(size=stat.st_size, mtime=stat.st_mtime, since=now)
+
+        # forget files taken away before they settled
+        for path in set(self._seen) - present:
+            del self._seen[path]
+
+        ready = [path for path, seen in self._seen.items() if now - seen["since"] >= self.settle]
+
+        return sorted(ready, key=lambda path: self._seen[path]["arrived"])
+
+    def _finish(self, path, reply, outcome):
+        """
+        Move a request to `outcome` with its reply beside it
+
+        Returns
+        -------
+        name: str
+            The request's name in `outcome`, suffixed if an earlier request
+            of the same name is already there
+        """
+
+        name = os.path.basename(path)
+        if os.path.exists(os.path.join(self.folder, outcome, name)):
+            stem, extension = os.path.splitext(name)
+            name = f"{stem}.{datetime.now():%Y%m%d_%H%M%S_%f}{extension}"
+
+        target = os.path.join(self.folder, outcome, name)
+        os.replace(path, target)
+        with open(f"{target}.result.json", "w") as f:
+            json.dump(reply, f, indent=1, default=str)
+
+        return name
+
+    def process(self, path):
+        """
+        Run one request file
+
+        Parameters
+        ----------
+        path: str
+            Request file in the watched folder
+
+        Returns
+        -------
+        reply: dict
+            `run_job`'s reply plus "request" and "latency", the seconds from
+            the file landing to its rows being done
+        """
+
+        logger = logging.getLogger("DropFolder")
+
+        arrived = self._seen.pop(path, {}).get("arrived", datetime.now().timestamp())
+        claimed = os.path.join(self.folder, "processing", os.path.basename(path))
+        os.replace(path, claimed)
+
+        digest = prm._file_digest(claimed)
+        if digest in self.done:
+            logger.info("request %s repeats %s, not run again", os.path.basename(path), self.done[digest])
+            reply = {"ok": True, "request": os.path.basename(path), "duplicate_of": self.done[digest]}
+            self._finish(claimed, reply, "done")
+            return reply
+
+        try:
+            reply = run_job(
+                self.pool,
+                {"command": "run", "rows": _read_request(claimed).to_dict("records")},
+                self.job_lock,
+                self.lookup_client
+            )
+        except Exception as e:
+            logger.exception("request %s failed", os.path.basename(path))
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        reply["request"] = os.path.basename(path)
+        reply["latency"] = datetime.now().timestamp() - arrived
+        outcome = "done" if reply["ok"] and not reply["failed"] else "failed"
+        name = self._finish(claimed, reply, outcome)
+        if outcome == "done":
+            self.done.setdefault(digest, name)
+        self.processed += 1
+
+        logger.info("request %s %s, %.1fs after it arrived", reply["request"], outcome, reply["latency"])
+
+        return reply
+
+    def poll(self):
+        """Run every request that is ready; returns how many there were"""
+
+        paths = self._ready()
+        for path in paths:
+            self.process(path)
+
+        return len(paths)
+
+    def watch(self, interval, stop):
+        """Poll every `interval` seconds until `stop` is set"""
+
+        logger = logging.getLogger("DropFolder")
+        logger.info("watch %s for requests", self.folder)
+
+        while not stop.is_set():
+            try:
+                self.poll()
+            except OSError as e:
+                # e.g. a file taken away between listing and claiming it
+                logger.warning("cannot read %s: %r", self.folder, e)
+            stop.wait(interval)
+
+        return None
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Answers each JSON line on the connection with one JSON line"""
+
+    # set by `make_server`
+    pool = None
+    job_lock = None
+    lookup_client = None
+
+    def _reply(self, reply):
+        self.wfile.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        logger = logging.getLogger("JobHandler")
+
+        for line in self.rfile:
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                self._reply({"ok": False, "error": f"not JSON: {e}"})
+                continue
+
+            command = job.get("command", "run")
+            if command == "status":
+                self._reply({"ok": True, **self.pool.status()})
+            elif command == "shutdown":
+                self._reply({"ok": True})
+                # shutdown() waits for serve_forever, which this thread is not running
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            elif command == "run":
+                try:
+                    self._reply(run_job(self.pool, job, self.job_lock, self.lookup_client))
+                except Exception as e:
+                    logger.exception("job failed")
+                    self._reply({"ok": False, "error": f"{type(e).__name__}: {e}"})
+            else:
+                self._reply({"ok": False, "error": f"unknown command {command!r}"})
+
+
+class JobServer(socketserver.ThreadingTCPServer):
+    """One thread per connection; restarts can rebind the port straight away"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def make_server(pool, host="127.0.0.1", port=DEFAULT_PORT, lookup_client=None):
+    """
+    Build the job server; call `serve_forever()` on it to start it
+
+    Parameters
+    ----------
+    pool: SessionPool
+        Sessions the jobs run on
+
+    host: str
+        Interface to listen on, keep it local
+
+    port: int
+        Port to listen on, 0 picks a free one
+
+    lookup_client: prm.PlanviewClient, optional
+        Passed on to `run_job`
+
+    Returns
+    -------
+    server: JobServer
+    """
+
+    handler = type(
+        "BoundJobHandler",
+        (JobHandler,),
+        {"pool": pool, "job_lock": threading.Lock(), "lookup_client": lookup_client}
+    )
+
+    return JobServer((host, port), handler)
+
+
+def submit(job, host="127.0.0.1", port=DEFAULT_PORT, timeout=None):
+    """
+    Send one job to a running daemon and wait for its reply
+
+    Parameters
+    ----------
+    job: dict
+        See the module docstring
+
+    host: str
+        Where the daemon listens
+
+    port: int
+        Where the daemon listens
+
+    timeout: float, optional
+        Seconds to wait for the reply, None waits as long as the job takes
+
+    Returns
+    -------
+    reply: dict
+    """
+
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall((json.dumps(job) + "\n").encode("utf-8"))
+        with connection.makefile("r", encoding="utf-8") as replies:
+            line = replies.readline()
+
+    if not line:
+        raise ConnectionError("the daemon closed the connection without replying")
+
+    return json.loads(line)
+
+
+def _keep_alive_loop(pool, interval, stop):
+    """Call `pool.keep_alive` every `interval` seconds until `stop` is set"""
+
+    # keep-alive page loads belong to no job, and nothing would ever write them
+    prm._step_metrics.set(None)
+
+    while not stop.wait(interval):
+        pool.keep_alive()
+
+    return None
+
+
+def serve(args):
+    """Run the daemon until it is told to shut down"""
+
+    logger = logging.getLogger("prm_daemon")
+
+    prm.configure_base_url(args.base_url)
+    prm.configure_resource_cache(os.path.join(prm.CACHE_DIR, "resources.json"))
+    prm.configure_picklist_cache(os.path.join(prm.CACHE_DIR, "picklists.json"))
+
+    pool = SessionPool(
+        size=args.sessions,
+        driver_options={
+            "browser": args.browser,
+            "headless": args.headless,
+            "block_resources": args.block_resources,
+            "window_size": args.window_size,
+        },
+        fast_fill=args.fast_fill,
+        tabs=args.tabs,
+        max_rows=args.max_rows,
+        max_age=args.max_age
+    )
+
+    # step calls outside a job (warm-up, keep-alive) are not recorded; a
+    # long-lived process would only pile them up
+    prm._step_metrics.set(None)
+
+    lookup_client = prm.PlanviewClient(pool_size=1) if args.api_lookups else None
+
+    logger.info("warm up %s session(s)", args.sessions)
+    pool.warm_up()
+
+    server = make_server(pool, args.host, args.port, lookup_client)
+    logger.info("listening on %s:%s", args.host, server.server_address[1])
+
+    stop = threading.Event()
+    threading.Thread(target=_keep_alive_loop, args=(pool, args.keepalive, stop), daemon=True).start()
+
+    if args.watch:
+        drop_folder = DropFolder(
+            args.watch,
+            pool,
+            server.RequestHandlerClass.job_lock,
+            settle=args.settle,
+            lookup_client=lookup_client
+        )
+        threading.Thread(target=drop_folder.watch, args=(args.poll, stop), name="DropFolder", daemon=True).start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        pool.close()
+        if lookup_client is not None:
+            lookup_client.close()
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep PRM browser sessions warm and run jobs on them")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="start the daemon")
+    serve_parser.add_argument("--sessions", type=int, default=1, help="browser sessions to keep warm (default: 1)")
+    serve_parser.add_argument("--browser", choices=["edge", "chrome"], default="edge")
+    serve_parser.add_argument("--headless", action="store_true")
+    serve_parser.add_argument("--block-resources", action="store_true")
+    serve_parser.add_argument("--window-size", type=prm._window_size_argument, default="1280x800")
+    serve_parser.add_argument("--fast-fill", action="store_true")
+    serve_parser.add_argument("--tabs", type=int, default=1, help="rows each session keeps in progress at once")
+    serve_parser.add_argument("--base-url", default=prm.BASE_URL)
+    serve_parser.add_argument("--max-rows", type=int, default=200, help="rows before a session is replaced (default: 200)")
+    serve_parser.add_argument("--max-age", type=float, default=4 * 3600, help="seconds before a session is replaced (default: 4h)")
+    serve_parser.add_argument("--watch", metavar="DIR", help="also run request files dropped in DIR")
+    serve_parser.add_argument("--poll", type=float, default=2, help="seconds between looks at --watch (default: 2)")
+    serve_parser.add_argument("--settle", type=float, default=1, help="seconds a dropped file must sit unchanged (default: 1)")
+    serve_parser.add_argument(
+        "--api-lookups",
+        action="store_true",
+        help="list this month's work items over the Planview REST API before each job and skip rows that exist"
+    )
+    serve_parser.add_argument("--keepalive", type=float, default=600, help="seconds between log-in refreshes of idle sessions (default: 600)")
+
+    submit_parser = commands.add_parser("submit", help="run a ProjectBook on the daemon")
+    submit_parser.add_argument("--project-book", default=prm.PROJECT_BOOK)
+    submit_parser.add_argument("--workers", type=int, default=None, help="sessions to use (default: all)")
+    submit_parser.add_argument("--no-cache", action="store_true")
+
+    commands.add_parser("status", help="show the daemon's sessions")
+    commands.add_parser("shutdown", help="stop the daemon")
+
+    args = parser.parse_args(argv)
+
+    prm.configure_logging(path=os.path.join("Logs", "PRM_daemon_log.jsonl"))
+
+    if args.command == "serve":
+        return serve(args)
+
+    job = {"command": args.command}
+    if args.command == "submit":
+        job = {"command": "run", "project_book": args.project_book, "no_cache": args.no_cache}
+        if args.workers is not None:
+            job["workers"] = args.workers
+
+    reply = submit(job, args.host, args.port)
+    print(json.dumps(reply, indent=2, default=str))
+
+    return 0 if reply.get("ok") and not reply.get("failed") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Journal, and how rows resume from what it recorded"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prm  # noqa: E402
+
+
+def project_info(index=0, description="PRM test row"):
+    return prm.ProjectInfo(
+        index=index,
+        description=description,
+        bi_service_name="Reporting",
+        bi_assignment_owner_name="1001",
+        bi_team_name="Analytics",
+        resource="Ada Lovelace",
+        bi_swim_lane_name="1",
+        executive_sponsor_name="Sponsor",
+        bi_business_owner_name="Owner",
+        bi_domain_name="Domain",
+        requestor_name="Requestor",
+        bi_liaison_name="1",
+        work_description_text="What the work is",
+        business_need_text="Why it is needed",
+    )
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_truncated_last_line(self):
+        journal = prm.Journal(self.path)
+        journal.record(0, "Dashboards", "new_work_page1", url="https://planview/page2")
+        journal.record(0, "Dashboards", "new_work_page2", url="https://planview/grid")
+        journal.close()
+
+        # the machine went down halfway through the next line
+        with open(self.path, "a") as f:
+            f.write('{"time": "2026-01-15T09:30:00", "index": 0, "row": "Dashbo')
+
+        progress = prm.Journal.load(self.path)
+        self.assertEqual(list(progress), ["Dashboards"])
+        self.assertEqual(
+            progress["Dashboards"]["steps"],
+            {"new_work_page1": "https://planview/page2", "new_work_page2": "https://planview/grid"},
+        )
+        self.assertFalse(progress["Dashboards"]["done"])
+
+        # the next run starts on a line of its own
+        journal = prm.Journal(self.path)
+        journal.record(0, "Dashboards", "done")
+        journal.close()
+
+        self.assertTrue(prm.Journal.load(self.path)["Dashboards"]["done"])
+
+    def test_last_attempt_decides_failed(self):
+        journal = prm.Journal(self.path)
+        journal.record(0, "Dashboards", "failed", error="timeout")
+        journal.record(1, "Extracts", "new_work_page1")
+        journal.record(1, "Extracts", "failed", error="timeout")
+        journal.record(0, "Dashboards", "new_work_page1")
+        journal.close()
+
+        progress = prm.Journal.load(self.path)
+        self.assertFalse(progress["Dashboards"]["failed"])
+        self.assertTrue(progress["Extracts"]["failed"])
+
+
+class ResumePointTest(unittest.TestCase):
+
+    def progress(self, steps, done=False, work_id=None):
+        return {"steps": steps, "done": done, "failed": False, "work_id": work_id}
+
+    def test_nothing_done(self):
+        self.assertIsNone(prm._resume_point(None))
+        self.assertIsNone(prm._resume_point(self.progress({})))
+
+    def test_done(self):
+        self.assertEqual(prm._resume_point(self.progress({"new_work_page1": None}, done=True)), ("done", None))
+
+    def test_latest_reopenable_step(self):
+        steps = {
+            "new_work_page1": "https://planview/page2",
+            "new_work_page2": "https://planview/grid",
+            "work_and_assignments": "https://planview/grid",
+            "open_resource_search_window": "https://planview/grid",
+            "allocate": "https://planview/allocated",
+            "navigate_to_work_view": "https://planview/work",
+        }
+
+        self.assertEqual(prm._resume_point(self.progress(steps)), ("allocate", "https://planview/allocated"))
+
+    def test_work_id(self):
+        self.assertEqual(prm._resume_point(self.progress({"new_work_page1": None}, work_id="17")), ("work_id", "17"))
+
+    def test_stranded(self):
+        steps = {"new_work_page1": "https://planview/page2", "new_work_page2": "https://planview/grid"}
+
+        self.assertEqual(prm._resume_point(self.progress(steps)), ("stranded", "new_work_page2"))
+
+
+class PlanRowsTest(unittest.TestCase):
+
+    def test_plans_each_row(self):
+        with tempfile.TemporaryDirectory() as folder:
+            journal = prm.Journal(os.path.join(folder, "journal.jsonl"))
+            journal.record(0, "Finished", "new_work_page1", url="https://planview/page2")
+            journal.record(0, "Finished", "done")
+            journal.record(1, "Stranded", "new_work_page1", url="https://planview/page2")
+            journal.record(2, "Reopenable", "work_and_assignments", url="https://planview/grid")
+            journal.close()
+            progress = prm.Journal.load(journal.path)
+
+            journal = prm.Journal(journal.path)
+            rows = [
+                project_info(0, "Finished"),
+                project_info(1, "Stranded"),
+                project_info(2, "Reopenable"),
+                project_info(3, "New"),
+            ]
+            queued, results = prm._plan_rows(rows, progress, journal=journal)
+            journal.close()
+
+            progress = prm.Journal.load(journal.path)
+
+        self.assertEqual(
+            [(index, resume_from) for index, _, resume_from in queued],
+            [(2, ("work_and_assignments", "https://planview/grid")), (3, None)],
+        )
+
+        [finished, stranded] = sorted(results, key=lambda result: result["index"])
+        self.assertTrue(finished["ok"] and finished["skipped"])
+        self.assertFalse(stranded["ok"])
+        self.assertIn("new_work_page1", stranded["error"])
+
+        # stranded rows are journaled as failed so --failed-from picks them up
+        self.assertTrue(progress["Stranded"]["failed"])
+        self.assertFalse(progress["Reopenable"]["failed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
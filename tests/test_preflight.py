@@ -0,0 +1,77 @@
+"""preflight_picklists against fresh and stale picklist snapshots"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prm  # noqa: E402
+
+
+def project_info(index=0, bi_service_name="Reporting", bi_team_name="Analytics"):
+    return prm.ProjectInfo(
+        index=index,
+        description=f"PRM test row {index}",
+        bi_service_name=bi_service_name,
+        bi_assignment_owner_name="1001",
+        bi_team_name=bi_team_name,
+        resource="Ada Lovelace",
+        bi_swim_lane_name="1",
+        executive_sponsor_name="Sponsor",
+        bi_business_owner_name="Owner",
+        bi_domain_name="Domain",
+        requestor_name="Requestor",
+        bi_liaison_name="1",
+        work_description_text="What the work is",
+        business_need_text="Why it is needed",
+    )
+
+
+class PreflightPicklistsTest(unittest.TestCase):
+
+    def test_fresh_snapshot(self):
+        picklists = prm.PicklistCache()
+        picklists.put("bi_service_name", ["Reporting", "Data Engineering"])
+        picklists.put("bi_team", ["Analytics", "Platform"])
+
+        rows = [project_info(0), project_info(1, bi_service_name="Reportng"), project_info(2, bi_team_name="Nobody")]
+        passed, rejected = prm.preflight_picklists(rows, picklists)
+
+        self.assertEqual(passed, rows[:1])
+        self.assertEqual(rejected[1], "bi_service_name 'Reportng' is not an option, did you mean 'Reporting'?")
+        self.assertEqual(rejected[2], "bi_team 'Nobody' is not an option")
+
+    def test_stale_snapshot(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "picklists.json")
+            taken = datetime.now().timestamp()
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "bi_service_name": {"values": ["Reporting"], "taken": taken - 7200},
+                        "bi_team": {"values": ["Analytics"], "taken": taken},
+                    },
+                    f,
+                )
+
+            picklists = prm.PicklistCache(path, ttl=3600)
+
+        rows = [project_info(0, bi_service_name="Reportng"), project_info(1, bi_team_name="Analytic")]
+        passed, rejected = prm.preflight_picklists(rows, picklists)
+
+        # the stale service names are not checked, the fresh teams are
+        self.assertEqual(passed, rows[:1])
+        self.assertEqual(rejected, {1: "bi_team 'Analytic' is not an option, did you mean 'Analytics'?"})
+
+    def test_no_snapshot(self):
+        rows = [project_info(0, bi_service_name="Reportng")]
+
+        self.assertEqual(prm.preflight_picklists(rows, prm.PicklistCache()), (rows, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""parse_project_book on good and broken ProjectBook rows"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prm  # noqa: E402
+
+
+def project_book(*descriptions):
+    rows = [
+        {
+            "Description": description,
+            "BIServiceName": "Reporting",
+            "BIAssignmentOwner": "Ada Lovelace (1001)",
+            "BITeam": "Analytics",
+            "BISwimLanes": "Lane (1)",
+            "ExecutiveSponsor": "Sponsor",
+            "BIBusinessOwner": "Owner",
+            "BIDomain": "Domain",
+            "Requestor": "Requestor",
+            "BILiaison": "Liaison (1)",
+            "WorkDescription": "What the work is",
+            "BusinessNeed": "Why it is needed",
+        }
+        for description in descriptions
+    ]
+    return pd.DataFrame(rows)
+
+
+class ParseProjectBookTest(unittest.TestCase):
+
+    def test_parses_rows(self):
+        project_infos, invalid = prm.parse_project_book(project_book("Dashboards", "Extracts"), "January", 2026)
+
+        self.assertEqual(invalid, {})
+        self.assertEqual([project_info.index for project_info in project_infos], [0, 1])
+        [first, _] = project_infos
+        self.assertEqual(first.description, "January 2026 Dashboards")
+        self.assertEqual(first.resource, "Ada Lovelace")
+        self.assertEqual(first.bi_assignment_owner_name, "1001")
+        self.assertEqual(first.bi_swim_lane_name, "1")
+        self.assertEqual(first.bi_liaison_name, "1")
+        self.assertEqual(first.bi_team_name, "Analytics")
+
+    def test_collects_every_problem(self):
+        df = project_book("Dashboards", "Extracts", "Extracts")
+        df.loc[0, "BITeam"] = None
+        df.loc[0, "BISwimLanes"] = "Lane 1"
+        df.loc[1, "BIServiceName"] = "  "
+
+        project_infos, invalid = prm.parse_project_book(df, "January", 2026)
+
+        self.assertEqual(project_infos, [])
+        self.assertIn("BITeam is blank", invalid[0])
+        self.assertIn("BISwimLanes is not 'Name (value)'", invalid[0])
+        self.assertIn("BIServiceName is blank", invalid[1])
+        self.assertIn("Description is repeated", invalid[1])
+        self.assertIn("Description is repeated", invalid[2])
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            prm.parse_project_book(project_book("Dashboards").drop(columns="BITeam"), "January", 2026)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""read_project_book's local snapshots of the workbook"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prm  # noqa: E402
+
+
+class ReadProjectBookTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "ProjectBook.xlsx")
+        self.cache_dir = os.path.join(self.folder.name, "cache")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_book(self, *descriptions, mtime=None):
+        pd.DataFrame({"Description": list(descriptions)}).to_excel(self.path, index=False)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def read(self):
+        return list(prm.read_project_book(self.path, cache_dir=self.cache_dir)["Description"])
+
+    def test_reuses_snapshot(self):
+        self.write_book("Dashboards")
+        self.assertEqual(self.read(), ["Dashboards"])
+
+        with mock.patch.object(prm.pd, "read_excel", side_effect=AssertionError("workbook parsed again")):
+            self.assertEqual(self.read(), ["Dashboards"])
+
+    def test_reuses_snapshot_of_touched_workbook(self):
+        self.write_book("Dashboards", mtime=1_700_000_000)
+        self.read()
+
+        # same bytes, newer mtime: hashed, not parsed
+        os.utime(self.path, (1_700_000_100, 1_700_000_100))
+        with mock.patch.object(prm.pd, "read_excel", side_effect=AssertionError("workbook parsed again")):
+            self.assertEqual(self.read(), ["Dashboards"])
+
+    def test_rereads_changed_workbook(self):
+        self.write_book("Dashboards", mtime=1_700_000_000)
+        self.read()
+
+        self.write_book("Dashboards", "Extracts", mtime=1_700_000_100)
+        self.assertEqual(self.read(), ["Dashboards", "Extracts"])
+
+        # and the new snapshot is the one reused from then on
+        with mock.patch.object(prm.pd, "read_excel", side_effect=AssertionError("workbook parsed again")):
+            self.assertEqual(self.read(), ["Dashboards", "Extracts"])
+
+    def test_rereads_when_snapshot_is_gone(self):
+        self.write_book("Dashboards")
+        self.read()
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+        self.assertEqual(self.read(), ["Dashboards"])
+
+    def test_no_cache_dir(self):
+        self.write_book("Dashboards")
+
+        self.assertEqual(list(prm.read_project_book(self.path, cache_dir=None)["Description"]), ["Dashboards"])
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
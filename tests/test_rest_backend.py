@@ -0,0 +1,106 @@
+"""RestBackend against planview_stub, including answers Planview should never give"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import planview_stub  # noqa: E402
+import prm  # noqa: E402
+
+
+def project_info(description="PRM test row", resource="Ada Lovelace"):
+    return prm.ProjectInfo(
+        index=0,
+        description=description,
+        bi_service_name="Reporting",
+        bi_assignment_owner_name="1001",
+        bi_team_name="Analytics",
+        resource=resource,
+        bi_swim_lane_name="1",
+        executive_sponsor_name="Sponsor",
+        bi_business_owner_name="Owner",
+        bi_domain_name="Domain",
+        requestor_name="Requestor",
+        bi_liaison_name="1",
+        work_description_text="What the work is",
+        business_need_text="Why it is needed",
+    )
+
+
+class RestBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = planview_stub.make_server(port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.client = prm.PlanviewClient(f"http://127.0.0.1:{self.server.server_address[1]}", pool_size=1)
+        self.backend = prm.RestBackend(self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_creates_work_item(self):
+        self.backend.process_row("01/15/2026", project_info())
+
+        [work] = self.server.state.work.values()
+        self.assertEqual(work["description"], "PRM test row")
+        self.assertEqual(work["allocations"], [planview_stub.resource_id("Ada Lovelace")])
+        self.assertEqual(self.client.logins, 1)
+
+    def test_resumes_journaled_work_item(self):
+        # a run that stopped right after creating the work item
+        work_id = prm.create_work_item(self.client, "01/15/2026", project_info())
+        with tempfile.TemporaryDirectory() as folder:
+            journal = prm.Journal(os.path.join(folder, "journal.jsonl"))
+            journal.record(0, "PRM test row", "new_work_page1", work_id=work_id)
+            journal.close()
+            progress = prm.Journal.load(journal.path)
+
+        queued, results = prm._plan_rows([project_info()], progress)
+        self.assertEqual(results, [])
+        [(index, row, resume_from)] = queued
+        self.assertEqual(resume_from, ("work_id", work_id))
+
+        self.backend.process_row("01/15/2026", row, index, resume_from=resume_from)
+
+        [work] = self.server.state.work.values()
+        self.assertEqual(work["allocations"], [planview_stub.resource_id("Ada Lovelace")])
+
+    def test_client_error(self):
+        self.server.state.api_fault = (403, '{"error": "forbidden"}', "application/json")
+
+        with self.assertRaises(prm.PlanviewApiError) as raised:
+            self.backend.process_row("01/15/2026", project_info())
+        self.assertEqual(raised.exception.status, 403)
+
+    def test_redirect(self):
+        # what a host without the API does: send the caller to the log-in page
+        self.server.state.api_fault = (302, "", "text/html; charset=utf-8", {"Location": "/login"})
+
+        with self.assertRaises(prm.PlanviewApiError) as raised:
+            self.backend.process_row("01/15/2026", project_info())
+        self.assertEqual(raised.exception.status, 302)
+        self.assertEqual(self.server.state.work, {})
+
+    def test_html_answer(self):
+        self.server.state.api_fault = (200, "<html><body>Sign in</body></html>", "text/html; charset=utf-8")
+
+        with self.assertRaises(prm.PlanviewApiError) as raised:
+            self.backend.process_row("01/15/2026", project_info())
+        self.assertEqual(raised.exception.status, 200)
+
+    def test_undecodable_json(self):
+        self.server.state.api_fault = (200, "{not json", "application/json")
+
+        with self.assertRaises(prm.PlanviewApiError):
+            self.backend.process_row("01/15/2026", project_info())
+
+
+if __name__ == "__main__":
+    unittest.main()
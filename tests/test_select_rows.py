@@ -0,0 +1,54 @@
+"""parse_row_spec and select_rows, as used by --rows, --match and --failed-from"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prm  # noqa: E402
+
+
+class ParseRowSpecTest(unittest.TestCase):
+
+    def test_rows_and_ranges(self):
+        self.assertEqual(prm.parse_row_spec("3"), {3})
+        self.assertEqual(prm.parse_row_spec("3-5"), {3, 4, 5})
+        self.assertEqual(prm.parse_row_spec(" 3-5, 9 ,4"), {3, 4, 5, 9})
+        self.assertEqual(prm.parse_row_spec("7-7"), {7})
+
+    def test_bad_specs(self):
+        for spec in ("", "a", "3-", "-3", "3-x", "5-3", "1,,2"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                prm.parse_row_spec(spec)
+
+
+class SelectRowsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({"Description": ["Sales dashboard", "Finance extract", "Sales extract", None]})
+
+    def test_everything_by_default(self):
+        self.assertEqual(prm.select_rows(self.df, "January", 2026), {0, 1, 2, 3})
+
+    def test_rows(self):
+        self.assertEqual(prm.select_rows(self.df, "January", 2026, rows=prm.parse_row_spec("1-2,8")), {1, 2})
+
+    def test_match(self):
+        self.assertEqual(prm.select_rows(self.df, "January", 2026, match="^sales"), {0, 2})
+
+    def test_failed(self):
+        failed = {"January 2026 Finance extract", "December 2025 Sales extract"}
+
+        self.assertEqual(prm.select_rows(self.df, "January", 2026, failed=failed), {1})
+
+    def test_every_criterion_has_to_hold(self):
+        selected = prm.select_rows(self.df, "January", 2026, rows={0, 1, 3}, match="extract")
+
+        self.assertEqual(selected, {1})
+
+
+if __name__ == "__main__":
+    unittest.main()